@@ -0,0 +1,56 @@
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from dogs.models import Category, Dog, Parent
+from reviews.models import Review
+
+
+class ApiTest(TestCase):
+    """JSON API: выбор полей, курсорная пагинация и условные запросы по ETag и Last-Modified."""
+
+    def setUp(self):
+        cache.clear()
+        self.category = Category.objects.create(name='Овчарка', description='-')
+        self.dogs = [Dog.objects.create(name=f'Собака {i}', category=self.category) for i in range(5)]
+        Dog.objects.create(name='Скрытая', category=self.category, is_active=False)
+        Parent.objects.create(dog=self.dogs[0], name='Мать', category=self.category)
+        Review.objects.create(title='Отлично', slug='otlichno', content='-', dog=self.dogs[0])
+
+    def test_fields_and_cursor(self):
+        response = self.client.get(reverse('api:dogs'), {'fields': 'id,name', 'per_page': 2})
+        data = response.json()
+        self.assertEqual(data['count'], 5)
+        self.assertEqual(data['results'], [{'id': dog.pk, 'name': dog.name} for dog in self.dogs[:2]])
+
+        data = self.client.get(reverse('api:dogs') + data['next']).json()
+        self.assertEqual([row['name'] for row in data['results']], ['Собака 2', 'Собака 3'])
+        self.assertIsNotNone(data['previous'])
+
+        response = self.client.get(reverse('api:dogs'), {'fields': 'id,owner'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_detail_and_nested(self):
+        dog = self.client.get(reverse('api:dog', args=[self.dogs[0].pk])).json()
+        self.assertEqual((dog['category_name'], dog['review_count']), ('Овчарка', 1))
+        parents = self.client.get(reverse('api:dog_parents', args=[self.dogs[0].pk])).json()
+        self.assertEqual([row['name'] for row in parents['results']], ['Мать'])
+        hidden = Dog.objects.get(is_active=False)
+        self.assertEqual(self.client.get(reverse('api:dog', args=[hidden.pk])).status_code, 404)
+
+    def test_conditional_get(self):
+        url = reverse('api:reviews')
+        response = self.client.get(url)
+        etag, last_modified = response['ETag'], response['Last-Modified']
+        self.assertFalse(etag.startswith('W/'))  # Сильный ETag
+
+        with self.assertNumQueries(0):  # 304 отдается по версиям из кеша без обращения к базе
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+
+        with self.captureOnCommitCallbacks(execute=True):  # Версия модели меняется после фиксации транзакции
+            Review.objects.create(title='Хорошо', slug='horosho', content='-', dog=self.dogs[1])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['count'], 2)
@@ -0,0 +1,18 @@
+from django.urls import path
+
+from api.apps import ApiConfig
+from api.views import CategoryListApiView, CategoryDetailApiView, DogListApiView, DogDetailApiView, \
+    DogParentListApiView, ReviewListApiView, ReviewDetailApiView
+
+# Устанавливаем имя пространства имен для маршрутов приложения 'api'
+app_name = ApiConfig.name
+
+urlpatterns = [
+    path('categories/', CategoryListApiView.as_view(), name='categories'),  # Породы
+    path('categories/<int:pk>/', CategoryDetailApiView.as_view(), name='category'),  # Порода по ID
+    path('dogs/', DogListApiView.as_view(), name='dogs'),  # Активные собаки, фильтр ?category=
+    path('dogs/<int:pk>/', DogDetailApiView.as_view(), name='dog'),  # Собака по ID
+    path('dogs/<int:pk>/parents/', DogParentListApiView.as_view(), name='dog_parents'),  # Родители собаки
+    path('reviews/', ReviewListApiView.as_view(), name='reviews'),  # Опубликованные отзывы, фильтр ?dog=
+    path('reviews/<int:pk>/', ReviewDetailApiView.as_view(), name='review'),  # Отзыв по ID
+]
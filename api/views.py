@@ -0,0 +1,241 @@
+import hashlib
+from datetime import datetime, timezone
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import Http404, JsonResponse
+from django.utils.cache import patch_cache_control
+from django.views import View
+from django.views.decorators.http import condition
+
+from dogs.caching import get_models_state
+from dogs.models import Category, Dog, Parent
+from dogs.pagination import paginate_keyset, set_page_queries
+from dogs.utils import QueryBudgetMixin
+from reviews.models import Review
+
+API_VERSION = 'v1'  # Входит в ETag: после изменения формата ответов старые ETag не совпадут
+
+
+class ApiError(Exception):
+    """Некорректный запрос к API (неизвестное поле или неверный фильтр): ответ 400 с текстом ошибки."""
+
+
+def media_url(name):
+    """Возвращает URL загруженного фото собаки или None, если фото нет."""
+    return Dog._meta.get_field('photo').storage.url(name) if name else None
+
+
+class ApiView(QueryBudgetMixin, View):
+    """
+    Базовое представление JSON API только для чтения.
+
+    Строки выбираются через values() без создания объектов моделей, поле ответа -> путь ORM
+    задается в fields, клиент может запросить часть полей (?fields=id,name). Ответ получает
+    сильный ETag и Last-Modified из версий моделей version_models (dogs.caching), поэтому
+    повторный запрос с If-None-Match или If-Modified-Since получает 304 без обращения к базе.
+
+    Атрибуты:
+        queryset (QuerySet): Объекты, доступные через API.
+        fields (dict): Поле ответа -> путь ORM для values().
+        converters (dict): Поле ответа -> функция преобразования значения (например, имя файла в URL).
+        filters (dict): GET-параметр -> поиск ORM по целому числу.
+        version_models (tuple): Модели, от данных которых зависит ответ.
+    """
+    queryset = None
+    fields = {}
+    converters = {}
+    filters = {}
+    version_models = ()
+    http_method_names = ['get', 'head', 'options']
+
+    def dispatch(self, request, *args, **kwargs):
+        view = condition(etag_func=self.get_etag, last_modified_func=self.get_last_modified)(super().dispatch)
+        try:
+            response = view(request, *args, **kwargs)
+        except ApiError as error:
+            response = JsonResponse({'error': str(error)}, status=400)
+        except Http404 as error:
+            response = JsonResponse({'error': str(error) or 'Объект не найден'}, status=404)
+        patch_cache_control(response, public=True, no_cache=True)  # Хранить, но проверять ETag каждый раз
+        return response
+
+    def get_models_state(self):
+        """Версии и время изменения моделей ответа (одно обращение к кешу на запрос)."""
+        if not hasattr(self, '_models_state'):
+            self._models_state = get_models_state(self.version_models)
+        return self._models_state
+
+    def get_etag(self, request, *args, **kwargs):
+        """Сильный ETag: хеш адреса запроса с параметрами и версий моделей."""
+        versions, _ = self.get_models_state()
+        payload = f'{API_VERSION}:{request.get_full_path()}:{versions}'
+        return hashlib.sha1(payload.encode()).hexdigest()
+
+    def get_last_modified(self, request, *args, **kwargs):
+        """Время последнего изменения данных ответа."""
+        _, modified = self.get_models_state()
+        return datetime.fromtimestamp(modified, tz=timezone.utc)
+
+    def get_fields(self):
+        """
+        Возвращает поля ответа из параметра ?fields= (по умолчанию все).
+
+        Raises:
+            ApiError: Запрошено неизвестное поле.
+        """
+        requested = [name for name in self.request.GET.get('fields', '').split(',') if name]
+        unknown = [name for name in requested if name not in self.fields]
+        if unknown:
+            raise ApiError(f'Неизвестные поля: {", ".join(unknown)}. Доступны: {", ".join(self.fields)}')
+        return requested or list(self.fields)
+
+    def get_queryset(self):
+        """
+        Возвращает доступные объекты с фильтрами из GET-параметров.
+
+        Raises:
+            ApiError: Значение фильтра не является целым числом.
+        """
+        queryset = self.queryset.all()
+        for param, lookup in self.filters.items():
+            value = self.request.GET.get(param)
+            if value is None:
+                continue
+            if not value.isdigit():
+                raise ApiError(f'Параметр {param} должен быть целым числом')
+            queryset = queryset.filter(**{lookup: int(value)})
+        return queryset
+
+    def serialize(self, rows, fields):
+        """Преобразует строки values() в словари с полями ответа."""
+        converters = [(name, self.fields[name], self.converters.get(name)) for name in fields]
+        return [
+            {name: convert(row[path]) if convert else row[path] for name, path, convert in converters}
+            for row in rows
+        ]
+
+    @staticmethod
+    def render(data):
+        """Ответ JSON с датами в ISO 8601 и кириллицей без экранирования."""
+        return JsonResponse(data, encoder=DjangoJSONEncoder, json_dumps_params={'ensure_ascii': False})
+
+
+class ApiListView(ApiView):
+    """
+    Список объектов с курсорной пагинацией (dogs.pagination.paginate_keyset).
+
+    Ответ: {"count": ..., "next": "?cursor=...", "previous": ..., "results": [...]}.
+
+    Атрибуты:
+        ordering (str): Поле сортировки (с '-' для убывания), pk добавляется автоматически.
+        per_page (int): Количество объектов на странице по умолчанию.
+        max_per_page (int): Наибольшее значение параметра ?per_page=.
+    """
+    ordering = 'pk'
+    per_page = 20
+    max_per_page = 100
+    query_budget = 2  # Страница и COUNT(*) (кешируется до изменения версий моделей)
+
+    def get_per_page(self):
+        """Возвращает размер страницы из параметра ?per_page=, не больше max_per_page."""
+        value = self.request.GET.get('per_page', '')
+        return min(int(value), self.max_per_page) if value.isdigit() and int(value) > 0 else self.per_page
+
+    def get(self, request, *args, **kwargs):
+        fields = self.get_fields()
+        model = self.queryset.model
+        paths = {self.fields[name] for name in fields} | {self.ordering.lstrip('-'), model._meta.pk.attname}
+        paths.discard('pk')
+        versions, _ = self.get_models_state()
+        page = paginate_keyset(self.get_queryset().values(*paths), request.GET.get('cursor'),
+                               self.get_per_page(), self.ordering, '.'.join(map(str, versions)))
+        set_page_queries(page, request)
+        return self.render({
+            'count': page.count,
+            'next': f'?{page.next_query}' if page.next_query else None,
+            'previous': f'?{page.previous_query}' if page.previous_query else None,
+            'results': self.serialize(page.object_list, fields),
+        })
+
+
+class ApiDetailView(ApiView):
+    """Один объект по pk."""
+    query_budget = 1
+
+    def get(self, request, pk, *args, **kwargs):
+        fields = self.get_fields()
+        row = self.get_queryset().filter(pk=pk).values(*{self.fields[name] for name in fields}).first()
+        if row is None:
+            raise Http404('Объект не найден')
+        return self.render(self.serialize([row], fields)[0])
+
+
+class CategoryMixin:
+    """Породы с количеством активных собак."""
+    queryset = Category.objects.all()
+    fields = {'id': 'id', 'name': 'name', 'description': 'description', 'dog_count': 'active_dog_count'}
+    version_models = ('dogs.Category', 'dogs.Dog')  # Счетчики меняются вместе с собаками
+
+
+class DogMixin:
+    """Активные собаки; в ответе порода и количество активных отзывов (счетчики меняются вместе с отзывами)."""
+    queryset = Dog.active.all()
+    fields = {
+        'id': 'id', 'name': 'name', 'category': 'category_id', 'category_name': 'category__name',
+        'birth_date': 'birth_date', 'photo': 'photo', 'review_count': 'active_review_count',
+    }
+    converters = {'photo': media_url}
+    filters = {'category': 'category_id'}
+    version_models = ('dogs.Dog', 'dogs.Category', 'reviews.Review')
+
+
+class ParentMixin:
+    """Родители активных собак."""
+    queryset = Parent.objects.filter(dog__is_active=True)
+    fields = {
+        'id': 'id', 'dog': 'dog_id', 'parent_dog': 'parent_dog_id', 'name': 'name', 'category': 'category_id',
+        'category_name': 'category__name', 'birth_date': 'birth_date',
+    }
+    version_models = ('dogs.Parent', 'dogs.Dog', 'dogs.Category')
+
+
+class ReviewMixin:
+    """Опубликованные отзывы о собаках."""
+    queryset = Review.published.all()
+    fields = {
+        'id': 'id', 'slug': 'slug', 'title': 'title', 'content': 'content', 'created': 'created',
+        'dog': 'dog_id', 'dog_name': 'dog__name',
+    }
+    filters = {'dog': 'dog_id'}
+    version_models = ('reviews.Review', 'dogs.Dog')
+
+
+class CategoryListApiView(CategoryMixin, ApiListView):
+    ordering = 'name'
+
+
+class CategoryDetailApiView(CategoryMixin, ApiDetailView):
+    pass
+
+
+class DogListApiView(DogMixin, ApiListView):
+    ordering = 'name'  # Частичный индекс dog_active_name_idx
+
+
+class DogDetailApiView(DogMixin, ApiDetailView):
+    pass
+
+
+class DogParentListApiView(ParentMixin, ApiListView):
+    """Родители одной собаки: /dogs/<pk>/parents/."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(dog_id=self.kwargs['pk'])
+
+
+class ReviewListApiView(ReviewMixin, ApiListView):
+    ordering = '-created'  # Частичный индекс review_published_idx
+
+
+class ReviewDetailApiView(ReviewMixin, ApiDetailView):
+    pass
@@ -12,5 +12,8 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+os.environ.setdefault('ASYNC_VIEWS', 'True')  # Асинхронные представления для чтения (settings.ASYNC_VIEWS)
+# Под ASGI соединения Django не переиспользуются между запросами: их переиспользует пул ODBC (config.db)
+os.environ.setdefault('DB_CONN_MAX_AGE', '0')
 
 application = get_asgi_application()
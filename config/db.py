@@ -0,0 +1,174 @@
+import os
+import sqlite3
+from pathlib import Path
+
+# Профили базы данных (переменная DB_PROFILE): рабочий SQL Server и локальная SQLite для разработки,
+# тестов и замеров без SQL Server. Команда ccdb создает базу выбранного профиля (create_database)
+DB_PROFILES = ('mssql', 'sqlite')
+DB_PROFILE_ALIASES = {'local': 'sqlite'}  # DB_PROFILE=local - то же, что sqlite
+MSSQL_DRIVER = 'ODBC Driver 17 for SQL Server'
+
+
+def _env_int(name, default):
+    """Читает целое число из переменной окружения."""
+    return int(os.getenv(name) or default)
+
+
+def get_profile():
+    """
+    Возвращает имя профиля базы данных из DB_PROFILE.
+
+    Returns:
+        str: Профиль из DB_PROFILES, по умолчанию 'mssql'.
+
+    Raises:
+        ValueError: Неизвестный профиль.
+    """
+    profile = (os.getenv('DB_PROFILE') or 'mssql').strip().lower()
+    profile = DB_PROFILE_ALIASES.get(profile, profile)
+    if profile not in DB_PROFILES:
+        raise ValueError(f'Неизвестный профиль базы данных DB_PROFILE={profile}, допустимы: {", ".join(DB_PROFILES)}')
+    return profile
+
+
+def _connection_settings(default_max_age):
+    """
+    Общие настройки постоянных соединений Django.
+
+    Соединение потока переиспользуется между запросами до DB_CONN_MAX_AGE секунд (максимальное
+    время жизни), перед повторным использованием проверяется (CONN_HEALTH_CHECKS), так что
+    разорванное сервером соединение не приводит к ошибке запроса, а открывается заново.
+
+    Args:
+        default_max_age (int): Время жизни соединения по умолчанию, сек.
+
+    Returns:
+        dict: CONN_MAX_AGE и CONN_HEALTH_CHECKS.
+    """
+    return {
+        'CONN_MAX_AGE': _env_int('DB_CONN_MAX_AGE', default_max_age),
+        'CONN_HEALTH_CHECKS': os.getenv('DB_CONN_HEALTH_CHECKS', 'True') == 'True',
+    }
+
+
+def mssql_database():
+    """
+    Настройки рабочей базы SQL Server (mssql-django) из переменных MS_SQL_*.
+
+    Соединение Django живет DB_CONN_MAX_AGE секунд и проверяется перед запросом. Кроме того,
+    включен пул соединений ODBC (pyodbc.pooling): соединение, закрытое Django (в конце срока
+    жизни или после каждого запроса под ASGI с DB_CONN_MAX_AGE=0), возвращается в пул диспетчера
+    драйверов и следующий connect не выполняет вход на сервер заново. Для unixODBC пул включается
+    строкой Pooling=Yes в odbcinst.ini, время жизни соединения в пуле - CPTimeout драйвера.
+
+    Returns:
+        dict: Настройки базы для DATABASES['default'].
+    """
+    try:
+        import pyodbc
+    except ImportError:  # Драйвер не установлен - ошибка появится при первом подключении
+        pass
+    else:
+        pyodbc.pooling = True  # Должно быть установлено до первого подключения
+
+    return {
+        'ENGINE': 'mssql',
+        'NAME': os.getenv('MS_SQL_DATABASE'),
+        'USER': os.getenv('MS_SQL_USER'),
+        'PASSWORD': os.getenv('MS_SQL_KEY'),
+        'HOST': os.getenv('MS_SQL_SERVER'),
+        'PORT': '',
+        'OPTIONS': {
+            'driver': MSSQL_DRIVER,
+            'connection_timeout': _env_int('DB_CONNECT_TIMEOUT', 10),  # Ожидание входа на сервер, сек.
+            'connection_retries': _env_int('DB_CONNECT_RETRIES', 3),
+            'connection_retry_backoff_time': _env_int('DB_CONNECT_RETRY_BACKOFF', 1),
+        },
+        **_connection_settings(300),
+    }
+
+
+def sqlite_database(base_dir):
+    """
+    Настройки локальной базы SQLite для разработки, тестов и замеров без SQL Server.
+
+    Журнал WAL позволяет читать базу параллельно с записью, а BEGIN IMMEDIATE с ожиданием
+    блокировки до 20 секунд - нескольким потокам сервера писать без ошибок "database is locked".
+
+    Args:
+        base_dir (Path): Каталог проекта.
+
+    Returns:
+        dict: Настройки базы для DATABASES['default'].
+    """
+    return {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': os.getenv('DB_SQLITE_PATH') or str(Path(base_dir) / 'db.sqlite3'),
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+            'init_command': 'PRAGMA journal_mode=WAL; PRAGMA synchronous=NORMAL;',
+        },
+        **_connection_settings(0),  # Подключение к файлу дешевое
+    }
+
+
+def get_databases(base_dir, profile=None):
+    """
+    Возвращает настройку DATABASES для профиля.
+
+    Args:
+        base_dir (Path): Каталог проекта.
+        profile (str | None): Профиль из DB_PROFILES, None - из переменной DB_PROFILE.
+
+    Returns:
+        dict: Значение настройки DATABASES.
+    """
+    profile = profile or get_profile()
+    default = mssql_database() if profile == 'mssql' else sqlite_database(base_dir)
+    return {'default': default}
+
+
+def create_database(database):
+    """
+    Создает базу данных по ее настройкам из DATABASES.
+
+    Для SQL Server подключается к базе master и выполняет CREATE DATABASE, для SQLite
+    создает файл базы (и его каталог), если его еще нет.
+
+    Args:
+        database (dict): Настройки базы, например settings.DATABASES['default'].
+
+    Returns:
+        bool: True - база создана, False - уже существовала.
+
+    Raises:
+        ValueError: Движок базы не поддерживается.
+    """
+    engine = database['ENGINE']
+    if engine == 'django.db.backends.sqlite3':
+        path = Path(database['NAME'])
+        if path.exists():
+            return False
+        path.parent.mkdir(parents=True, exist_ok=True)
+        sqlite3.connect(path).close()
+        return True
+
+    if engine == 'mssql':
+        import pyodbc
+
+        options = database.get('OPTIONS', {})
+        connection_string = (
+            f'DRIVER={{{options.get("driver", MSSQL_DRIVER)}}};SERVER={database["HOST"]};DATABASE=master;'
+            f'UID={database["USER"]};PWD={database["PASSWORD"]}'
+        )
+        connection = pyodbc.connect(connection_string, autocommit=True, timeout=options.get('connection_timeout', 0))
+        try:
+            if connection.execute('SELECT DB_ID(?)', database['NAME']).fetchval() is not None:
+                return False
+            connection.execute(f'CREATE DATABASE [{database["NAME"]}]')
+        finally:
+            connection.close()
+        return True
+
+    raise ValueError(f'Создание базы для движка {engine} не поддерживается')
@@ -13,6 +13,8 @@ import os
 from pathlib import Path
 from dotenv import load_dotenv
 
+from config.db import get_databases, get_profile
+
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
 
@@ -40,12 +42,15 @@ INSTALLED_APPS = [
     # добаленные приложения
     'users',
     'dogs',
-    'reviews'
+    'reviews',
+    'search',
+    'api',
 
 ]
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'config.staticfiles.StaticFilesMiddleware',  # Статика из STATIC_ROOT со сжатыми копиями
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -75,24 +80,12 @@ TEMPLATES = [
 WSGI_APPLICATION = 'config.wsgi.application'
 
 load_dotenv()
-USER = os.getenv('MS_SQL_USER')
-PASSWORD = os.getenv('MS_SQL_KEY')
-HOST = os.getenv('MS_SQL_SERVER')
-DATABASE = os.getenv('MS_SQL_DATABASE')
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'mssql',
-        'NAME': DATABASE,
-        'USER': USER,
-        'PASSWORD': PASSWORD,
-        'HOST': HOST,
-        'PORT': '',
-        'OPTIONS': {
-            'driver': 'ODBC Driver 17 for SQL Server'
-        }
-    }
-}
+# Профиль базы данных (config.db): DB_PROFILE=mssql - рабочий SQL Server из переменных MS_SQL_*,
+# DB_PROFILE=sqlite (или local) - локальная база SQLite без SQL Server.
+# Соединения SQL Server постоянные (DB_CONN_MAX_AGE) с проверкой перед использованием и пулом ODBC
+DB_PROFILE = get_profile()
+DATABASES = get_databases(BASE_DIR, DB_PROFILE)
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -130,6 +123,17 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = (
     BASE_DIR / 'static',
 )
+STATIC_ROOT = BASE_DIR / 'staticfiles'  # Сюда collectstatic собирает файлы с хешами и .gz/.br копии
+STATIC_MAX_AGE = int(os.getenv('STATIC_MAX_AGE', 60))  # Cache-Control для файлов без хеша в имени, сек.
+
+STORAGES = {
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+    'staticfiles': {
+        'BACKEND': 'config.staticfiles.CompressedManifestStaticFilesStorage',
+    },
+}
 
 """django.views.static.serve()
 + static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
@@ -145,26 +149,65 @@ MEDIA_ROOT = (
 Например, если ваш MEDIA_URL определен как /media/, вы можете сделать это,
 добавив следующий фрагмент к вашему ROOT_URLCONF: 
 + static(settings.STATIC_URL, document_root=settings.MEDIA_ROOT)"""
+# Ширины уменьшенных копий Dog.photo и User.avatar (карточки 300px и они же для экранов 2x)
+IMAGE_VARIANT_WIDTHS = (300, 600)
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.0/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 AUTH_USER_MODEL = 'users.User'
+# Пользователь сессии и его права берутся из кеша с версией пользователя (users.backends)
+AUTHENTICATION_BACKENDS = [
+    'users.backends.CachedModelBackend',
+    # Сессии, созданные до CachedModelBackend, хранят путь ModelBackend: без него в списке пользователи
+    # выйдут из системы. Можно убрать через SESSION_COOKIE_AGE после развертывания (до этого неверный
+    # пароль при входе проверяется обоими бэкендами)
+    'django.contrib.auth.backends.ModelBackend',
+]
+# Сессия читается из кеша, а записывается и в кеш, и в базу данных: при потере кеша пользователь
+# не выходит из системы
+SESSION_ENGINE = 'django.contrib.sessions.backends.cached_db'
 LOGIN_REDIRECT_URL = 'dogs:index'  # '/'
 
 LOGIN_URL = '/user/'
 
-# CACHE_ENABLED = os.getenv('CACHE_ENABLED') == 'True'
-# if CACHE_ENABLED:
-#     CACHES = {
-#         'default': {
-#             "BACKEND": "django.core.cache.backends.redis.RedisCache",
-#             "LOCATION": os.getenv("CACHE_LOCATION")
-#         }
-#     }
-
-
-EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+CACHE_ENABLED = os.getenv('CACHE_ENABLED', 'True') == 'True'  # Кеш справочника пород (dogs.services)
+CACHE_LOCATION = os.getenv('CACHE_LOCATION')
+if CACHE_LOCATION:  # Общий для всех процессов Redis, иначе кеш в памяти процесса (locmem)
+    CACHES = {
+        'default': {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": CACHE_LOCATION
+        }
+    }
+CATEGORIES_CACHE_TIMEOUT = int(os.getenv('CATEGORIES_CACHE_TIMEOUT', 60 * 60 * 24))  # Справочник пород в кеше, сек.
+CATEGORIES_L1_TIMEOUT = int(os.getenv('CATEGORIES_L1_TIMEOUT', 5))  # Копия в памяти процесса без сверки версии, сек.
+CATEGORY_COUNTS_TIMEOUT = int(os.getenv('CATEGORY_COUNTS_TIMEOUT', 60))  # Количество собак по породам в кеше, сек.
+
+# Превышение бюджета SQL-запросов представлением (dogs.utils.query_budget) вызывает
+# исключение QueryBudgetExceeded, иначе только пишется предупреждение в лог
+QUERY_BUDGET_STRICT = DEBUG
+
+# Сколько секунд кешируется общее количество строк в списках с курсорной пагинацией
+PAGINATION_COUNT_TIMEOUT = int(os.getenv('PAGINATION_COUNT_TIMEOUT', 300))
+# С какого числа строк админка берет количество объектов из статистики базы вместо COUNT(*)
+ADMIN_ESTIMATED_COUNT_THRESHOLD = int(os.getenv('ADMIN_ESTIMATED_COUNT_THRESHOLD', 10000))
+
+# Асинхронные варианты представлений для чтения (главная, породы, собаки, отзывы, профиль).
+# Включаются при запуске через ASGI (config.asgi), под WSGI работают синхронные представления
+ASYNC_VIEWS = os.getenv('ASYNC_VIEWS', 'False') == 'True'
+
+# Просмотры собак копятся в общем кеше (Redis) и записываются в базу пачками:
+# при достижении порога или командой flush_dog_views (по расписанию). Без CACHE_LOCATION
+# кеш в памяти процесса не виден команде и теряет счетчики, поэтому просмотры пишутся в базу сразу
+DOG_VIEWS_WRITE_BEHIND = os.getenv('DOG_VIEWS_WRITE_BEHIND', str(bool(CACHE_LOCATION))) == 'True'
+DOG_VIEWS_FLUSH_THRESHOLD = int(os.getenv('DOG_VIEWS_FLUSH_THRESHOLD', 10))
+
+# Для тестов и локальной разработки можно указать
+# django.core.mail.backends.locmem.EmailBackend или django.core.mail.backends.filebased.EmailBackend
+EMAIL_BACKEND = os.getenv('EMAIL_BACKEND', 'django.core.mail.backends.smtp.EmailBackend')
+EMAIL_FILE_PATH = os.getenv('EMAIL_FILE_PATH', BASE_DIR / 'sent_emails')  # Для filebased.EmailBackend
 EMAIL_HOST = 'smtp.yandex.com'
 EMAIL_PORT = 465
 EMAIL_HOST_USER = 'hasanoffniyaz@yandex.ru'
@@ -175,3 +218,10 @@ EMAIL_USE_SSL = True
 EMAIL_SERVER = EMAIL_HOST_USER
 DEFAULT_FROM_EMAIL = EMAIL_HOST_USER
 EMAIL_ADMIN = EMAIL_HOST_USER
+
+# Очередь писем (outbox), которую отправляет команда send_outbox
+EMAIL_OUTBOX_BATCH_SIZE = int(os.getenv('EMAIL_OUTBOX_BATCH_SIZE', 50))  # Писем за одно SMTP-соединение
+EMAIL_OUTBOX_MAX_ATTEMPTS = int(os.getenv('EMAIL_OUTBOX_MAX_ATTEMPTS', 5))  # Попыток до статуса failed
+EMAIL_OUTBOX_RETRY_DELAY = int(os.getenv('EMAIL_OUTBOX_RETRY_DELAY', 60))  # Начальная задержка повтора, сек.
+# Сколько секунд письмо принадлежит забравшему его обработчику: после этого его отправит другой
+EMAIL_OUTBOX_LEASE = int(os.getenv('EMAIL_OUTBOX_LEASE', 300))
@@ -0,0 +1,211 @@
+import gzip
+import mimetypes
+import os
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage, staticfiles_storage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # Brotli не установлен - отдаются только gzip-копии
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = ('.css', '.js', '.map', '.svg', '.json', '.txt', '.html')
+# Расширение сжатой копии -> значение Content-Encoding, в порядке предпочтения
+ENCODINGS = (('.br', 'br'), ('.gz', 'gzip'))
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+
+def accepted_encodings(header):
+    """
+    Разбирает заголовок Accept-Encoding с учетом q-значений.
+
+    Кодировки с q=0 клиент явно отклоняет и в результат не попадают; '*' с q>0
+    добавляет кодировки из ENCODINGS, не перечисленные в заголовке отдельно.
+
+    Args:
+        header (str): Значение Accept-Encoding, например 'gzip;q=1.0, br;q=0'.
+
+    Returns:
+        set: Принимаемые клиентом кодировки в нижнем регистре.
+    """
+    qualities = {}
+    for item in header.split(','):
+        coding, *params = item.split(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            key, _, value = param.partition('=')
+            if key.strip().lower() == 'q':
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0  # Некорректное значение - кодировку не используем
+        qualities[coding] = quality
+
+    accepted = {coding for coding, quality in qualities.items() if quality > 0}
+    if '*' in accepted:
+        accepted.update(coding for _, coding in ENCODINGS if coding not in qualities)
+    return accepted
+
+
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """
+    Хранилище статики с хешем содержимого в именах файлов и заранее сжатыми копиями.
+
+    collectstatic сохраняет 'css/bootstrap.min.css' как 'css/bootstrap.min.<хеш>.css',
+    а {% static %} подставляет имя из манифеста. Рядом с каждым текстовым файлом
+    записываются копии .gz и .br (если установлен Brotli), которые отдает
+    StaticFilesMiddleware, не сжимая файл на каждый запрос.
+    """
+
+    def stored_name(self, name):
+        """Пока collectstatic не запускался (разработка, тесты), возвращает исходное имя."""
+        if not self.hashed_files:
+            return name
+        return super().stored_name(name)
+
+    def post_process(self, paths, dry_run=False, **options):
+        """Сжимает файлы после того, как ManifestStaticFilesStorage записал хешированные копии."""
+        yield from super().post_process(paths, dry_run, **options)
+        if dry_run:
+            return
+
+        for name in list(paths) + list(self.hashed_files.values()):
+            if name.endswith(COMPRESSIBLE_EXTENSIONS) and self.exists(name):
+                self.compress(name)
+
+    def compress(self, name):
+        """
+        Записывает сжатые копии файла, если они меньше оригинала.
+
+        Args:
+            name (str): Имя файла в хранилище.
+        """
+        with self.open(name) as file:
+            content = file.read()
+
+        compressed = {'.gz': gzip.compress(content, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            compressed['.br'] = brotli.compress(content, mode=brotli.MODE_TEXT)
+
+        for extension, data in compressed.items():
+            path = self.path(name + extension)
+            if len(data) < len(content):
+                with open(path, 'wb') as file:
+                    file.write(data)
+            elif os.path.exists(path):
+                os.remove(path)  # Устаревшая копия от предыдущей сборки
+
+
+class StaticFilesMiddleware:
+    """
+    Отдает собранную статику из STATIC_ROOT без обращения к представлениям.
+
+    Если клиент принимает br или gzip и для файла есть сжатая копия, отдается она с
+    заголовками Content-Encoding и Vary. Файлы с хешем в имени (из манифеста)
+    отдаются с Cache-Control: immutable на год, остальные - с коротким STATIC_MAX_AGE.
+    При DEBUG статику по-прежнему отдает runserver.
+
+    Под ASGI работает асинхронно и не заставляет Django переводить всю цепочку
+    middleware и асинхронные представления в поток (sync_to_async).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = '/' + settings.STATIC_URL.lstrip('/')
+        self._hashed_names = None
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        found = self.find(request)
+        if found is None:
+            return self.get_response(request)
+        return self.serve(request, *found)
+
+    async def __acall__(self, request):
+        """Асинхронный вариант __call__(): файл отдается FileResponse, читаемым сервером по частям."""
+        found = self.find(request)
+        if found is None:
+            return await self.get_response(request)
+        return self.serve(request, *found)
+
+    def find(self, request):
+        """
+        Ищет файл статики, соответствующий запросу.
+
+        Args:
+            request (HttpRequest): Запрос.
+
+        Returns:
+            tuple | None: (имя относительно STATIC_ROOT, полный путь) или None, если запрос не к статике.
+        """
+        if settings.DEBUG or not settings.STATIC_ROOT or not request.path.startswith(self.prefix):
+            return None
+        if request.method not in ('GET', 'HEAD'):
+            return None
+
+        name = request.path[len(self.prefix):]
+        try:
+            path = safe_join(settings.STATIC_ROOT, name)
+        except SuspiciousFileOperation:  # Попытка выйти за пределы STATIC_ROOT
+            return None
+        if not os.path.isfile(path):
+            return None
+        return name, path
+
+    @property
+    def hashed_names(self):
+        """Имена файлов с хешем содержимого из манифеста collectstatic."""
+        if self._hashed_names is None:
+            self._hashed_names = set(getattr(staticfiles_storage, 'hashed_files', {}).values())
+        return self._hashed_names
+
+    def serve(self, request, name, path):
+        """
+        Формирует ответ с файлом статики.
+
+        Args:
+            request (HttpRequest): Запрос.
+            name (str): Имя файла относительно STATIC_ROOT.
+            path (str): Полный путь к файлу.
+
+        Returns:
+            HttpResponse: Файл, его сжатая копия или 304 Not Modified.
+        """
+        stat = os.stat(path)
+        if not was_modified_since(request.META.get('HTTP_IF_MODIFIED_SINCE'), stat.st_mtime):
+            response = HttpResponseNotModified()
+        else:
+            content_type = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+            accepted = accepted_encodings(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+            encoding = None
+            for extension, candidate in ENCODINGS:
+                if candidate in accepted and os.path.isfile(path + extension):
+                    path, encoding = path + extension, candidate
+                    break
+
+            response = FileResponse(open(path, 'rb'), content_type=content_type)
+            if encoding:
+                response.headers['Content-Encoding'] = encoding
+            response.headers['Last-Modified'] = http_date(stat.st_mtime)
+
+        response.headers['Vary'] = 'Accept-Encoding'
+        if name in self.hashed_names:
+            response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL
+        else:
+            response.headers['Cache-Control'] = f'public, max-age={settings.STATIC_MAX_AGE}'
+        return response
@@ -0,0 +1,79 @@
+import gzip
+import shutil
+import tempfile
+from unittest import mock
+
+from django.core.files.base import ContentFile
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, override_settings
+
+from config.staticfiles import (
+    IMMUTABLE_CACHE_CONTROL, CompressedManifestStaticFilesStorage, StaticFilesMiddleware, accepted_encodings,
+)
+
+CSS = b'.card { margin: 0 auto; padding: 1rem; }\n' * 50
+
+
+class AcceptedEncodingsTest(SimpleTestCase):
+    """Кодировки с q=0 клиент отклоняет, '*' добавляет не перечисленные кодировки."""
+
+    def test_quality_values(self):
+        self.assertEqual(accepted_encodings('gzip, deflate, br'), {'gzip', 'deflate', 'br'})
+        self.assertEqual(accepted_encodings('gzip;q=0, br;q=0.5'), {'br'})
+        self.assertEqual(accepted_encodings('BR; Q=0.0, gzip;q=1.0'), {'gzip'})
+        self.assertEqual(accepted_encodings('br;q=abc'), set())
+        self.assertEqual(accepted_encodings(''), set())
+
+    def test_wildcard(self):
+        self.assertEqual(accepted_encodings('*'), {'*', 'br', 'gzip'})
+        self.assertEqual(accepted_encodings('br;q=0, *'), {'*', 'gzip'})
+        self.assertEqual(accepted_encodings('*;q=0'), set())
+
+
+class StaticFilesTest(SimpleTestCase):
+    """collectstatic сохраняет сжатые копии, а StaticFilesMiddleware отдает их с нужными заголовками."""
+
+    def setUp(self):
+        static_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, static_root)
+        settings_override = override_settings(STATIC_ROOT=static_root, STATIC_URL='/static/', DEBUG=False)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.storage = CompressedManifestStaticFilesStorage(location=static_root)
+        for name, content in (('css/site.css', CSS), ('robots.txt', b'x')):
+            self.storage.save(name, ContentFile(content))
+        fake_brotli = mock.Mock(MODE_TEXT=1, compress=lambda content, mode: b'br:' + content[:10])
+        with mock.patch('config.staticfiles.brotli', fake_brotli):
+            list(self.storage.post_process({name: (self.storage, name) for name in ('css/site.css', 'robots.txt')}))
+        self.hashed = self.storage.hashed_files['css/site.css']
+        self.middleware = StaticFilesMiddleware(lambda request: HttpResponse('app'))
+
+    def get(self, name, accept_encoding=''):
+        return self.middleware(RequestFactory().get(f'/static/{name}', HTTP_ACCEPT_ENCODING=accept_encoding))
+
+    def test_post_process_compresses(self):
+        with self.storage.open(self.hashed + '.gz') as file:
+            self.assertEqual(gzip.decompress(file.read()), CSS)
+        self.assertTrue(self.storage.exists(self.hashed + '.br'))
+        self.assertTrue(self.storage.exists('css/site.css.gz'))
+        self.assertFalse(self.storage.exists('robots.txt.gz'))  # Сжатая копия не меньше оригинала
+
+    def test_serves_preferred_encoding(self):
+        for accept_encoding, encoding in (('gzip, br', 'br'), ('gzip, br;q=0', 'gzip'), ('gzip;q=0', None)):
+            with self.subTest(accept_encoding):
+                response = self.get(self.hashed, accept_encoding)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.headers.get('Content-Encoding'), encoding)
+                self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+                self.assertEqual(response.headers['Content-Type'], 'text/css')
+                if encoding is None:
+                    self.assertEqual(b''.join(response.streaming_content), CSS)
+
+    def test_cache_control(self):
+        self.assertEqual(self.get(self.hashed)['Cache-Control'], IMMUTABLE_CACHE_CONTROL)
+        self.assertEqual(self.get('css/site.css')['Cache-Control'], 'public, max-age=60')
+
+    def test_passes_other_requests(self):
+        self.assertEqual(self.get('css/missing.css').content, b'app')
+        self.assertEqual(self.get('../config/settings.py').content, b'app')
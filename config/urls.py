@@ -27,4 +27,5 @@ urlpatterns = [
     path('', include('dogs.urls', namespace='dogs')),  # Включение маршрутов приложения 'dogs'
     path('users/', include('users.urls', namespace='users')),  # Включение маршрутов приложения 'users'
     path('reviews/', include('reviews.urls', namespace='reviews')),  # Включение маршрутов приложения 'reviews'
+    path('api/v1/', include('api.urls', namespace='api')),  # JSON API только для чтения, версия 1
 ] + static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)  # Обработка статических файлов для медиа-контента
@@ -1,5 +1,88 @@
 from django.contrib import admin
-from dogs.models import Dog, Category
+from django.contrib.admin.widgets import AutocompleteSelect
+
+from dogs.exports import make_export_action
+from dogs.models import Dog, Category, Parent
+from dogs.moderation import bulk_delete, make_admin_action
+from dogs.pagination import EstimatedCountPaginator
+
+
+class AutocompleteFilter(admin.RelatedFieldListFilter):
+    """
+    Фильтр списка по внешнему ключу с поиском вместо списка всех связанных объектов.
+
+    RelatedFieldListFilter выводит ссылку на каждую собаку или пользователя, а этот фильтр -
+    поле с автодополнением, получающее варианты AJAX-запросами к представлению
+    autocomplete админки (нужны search_fields у админки связанной модели).
+    """
+
+    template = 'dogs/admin/autocomplete_filter.html'
+
+    def __init__(self, field, request, params, model, model_admin, field_path):
+        self.model_admin = model_admin
+        self.widget_html = ''
+        super().__init__(field, request, params, model, model_admin, field_path)
+
+    def field_choices(self, field, request, model_admin):
+        """Не загружает связанные объекты: варианты приходят из autocomplete."""
+        return []
+
+    def has_output(self):
+        return True
+
+    def choices(self, changelist):
+        """Ссылка "Все" и поле поиска, при выборе значения которого страница открывается с фильтром."""
+        base_query = changelist.get_query_string(remove=[self.lookup_kwarg, self.lookup_kwarg_isnull])
+        widget = self.field.formfield(widget=AutocompleteSelect(self.field, self.model_admin.admin_site)).widget
+        self.widget_html = widget.render(
+            self.lookup_kwarg, self.lookup_val[-1] if self.lookup_val else None,
+            attrs={
+                'data-url': f'{base_query}&{self.lookup_kwarg}=',
+                'onchange': 'window.location = this.dataset.url + encodeURIComponent(this.value)',
+                'style': 'width: 100%',
+            },
+        )
+        yield {
+            'selected': not self.lookup_val and not self.lookup_val_isnull,
+            'query_string': base_query,
+            'display': 'Все',
+        }
+
+
+class ScalableAdminMixin:
+    """
+    Настройки списка админки для больших таблиц.
+
+    Общее количество строк не считается (show_full_result_count) или берется из
+    статистики базы и кеша (EstimatedCountPaginator), а на страницу списка
+    подключаются скрипты поля с автодополнением для AutocompleteFilter.
+    """
+
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+    @property
+    def media(self):
+        return super().media + AutocompleteSelect(None, self.admin_site).media
+
+
+class ModerationAdminMixin:
+    """
+    Массовая модерация в админке теми же запросами, что и формы на сайте.
+
+    Активация и деактивация выполняются одним UPDATE, а стандартное действие
+    "Удалить выбранные" после подтверждения удаляет объекты через bulk_delete,
+    изменяя счетчики родителей групповыми UPDATE вместо UPDATE на каждый объект.
+    """
+
+    actions = (
+        make_admin_action('activate', 'Активировать выбранные'),
+        make_admin_action('deactivate', 'Деактивировать выбранные'),
+    )
+
+    def delete_queryset(self, request, queryset):
+        """Удаляет выбранные объекты с проверкой прав сразу на весь набор."""
+        bulk_delete(queryset.model, request.user, queryset.values_list('pk', flat=True))
 
 
 # Регистрация модели Category в админке с настройками отображения
@@ -7,11 +90,26 @@ from dogs.models import Dog, Category
 class CategoryAdmin(admin.ModelAdmin):  # Поля, которые будут отображаться в списке категорий
     list_display = ('pk', 'name')  # Упорядочивание категорий по первичному ключу
     ordering = ('pk',)
+    search_fields = ('name',)  # Поиск для полей и фильтров с автодополнением
+
+
+class ParentInline(admin.TabularInline):
+    """Родители собаки на странице собаки: порода выбирается поиском, а не списком всех пород."""
+    model = Parent
+    extra = 0
+    autocomplete_fields = ('category', 'parent_dog')
+    fk_name = 'dog'  # У родителя две ссылки на Dog: собака-ребенок и сам родитель в питомнике
 
 
 # Регистрация модели Dog в админке с настройками отображения
 @admin.register(Dog)
-class DogAdmin(admin.ModelAdmin):  # Поля, которые будут отображаться в списке собак
-    list_display = ('name', 'category')  # Фильтрация по категории в списке собак
-    list_filter = ('category',)  # Упорядочивание собак по имени
-    ordering = ('name',)
+class DogAdmin(ModerationAdminMixin, ScalableAdminMixin, admin.ModelAdmin):  # Поля, которые будут отображаться
+    # в списке собак
+    list_display = ('name', 'category', 'owner', 'is_active')  # Фильтрация по породе, владельцу и активности
+    list_filter = (('category', AutocompleteFilter), ('owner', AutocompleteFilter), 'is_active')
+    list_select_related = ('category', 'owner')  # Порода и владелец загружаются одним запросом со списком
+    search_fields = ('name',)
+    autocomplete_fields = ('category', 'owner')  # Поиск вместо <select> со всеми породами и пользователями
+    inlines = (ParentInline,)
+    actions = ModerationAdminMixin.actions + (make_export_action('dogs', 'csv'), make_export_action('dogs', 'jsonl'))
+    ordering = ('name',)  # Упорядочивание собак по имени
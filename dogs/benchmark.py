@@ -0,0 +1,288 @@
+import statistics
+import time
+import tracemalloc
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from django.urls import URLPattern, reverse
+
+from dogs.counters import recount_counters
+from dogs.models import Category, Dog, Parent
+from dogs.pedigree import rebuild_pedigree
+from dogs.utils import QueryCounter
+from reviews.models import Review
+from reviews.utils import slug_generator
+from search.services import rebuild_index
+from users.models import User
+
+# Объемы данных для замеров: --scale команды bench
+SCALES = {
+    'small': {'users': 1_000, 'categories': 20, 'dogs': 10_000, 'reviews': 10_000},
+    'medium': {'users': 10_000, 'categories': 50, 'dogs': 100_000, 'reviews': 100_000},
+    'large': {'users': 100_000, 'categories': 100, 'dogs': 1_000_000, 'reviews': 1_000_000},
+}
+SEED_EMAIL = 'bench{number}@bench.local'
+SEED_PASSWORD = 'bench'
+DOG_NAMES = ('Альфа', 'Барон', 'Вега', 'Гром', 'Дина', 'Ерш', 'Жучка', 'Зевс', 'Ирма', 'Кай', 'Лайма', 'Марс')
+PARENT_EVERY = 4  # Родители-собаки питомника есть у каждой PARENT_EVERY-й собаки
+
+URL_MODULES = ('dogs.urls', 'reviews.urls', 'users.urls')
+# Маршруты, которые не запрашиваются: изменяют данные или состояние входа, либо принимают только POST
+SKIPPED_ROUTES = {
+    'dogs:toggle_activity_dog': 'изменяет данные',
+    'dogs:bulk_moderation_dogs': 'только POST',
+    'reviews:toggle_activity_review': 'изменяет данные',
+    'reviews:bulk_moderation_reviews': 'только POST',
+    'users:logout_user': 'завершает сеанс',
+    'users:user_generate_new_password': 'изменяет пароль и отправляет письмо',
+}
+# Строка запроса поисковых страниц
+ROUTE_QUERIES = {
+    'dogs:search_categories': 'q=Порода',
+    'dogs:search_dogs': 'q=Барон',
+    'reviews:search_reviews': 'q=Отзыв',
+    'users:search_users': 'q=Bench',
+}
+
+
+def _dog_name(number):
+    """Кличка собаки номер number: повторяющиеся слова дают поиску много совпадений."""
+    return f'{DOG_NAMES[number % len(DOG_NAMES)]} {number}'
+
+
+def _bulk_create(model, objects, batch_size):
+    """Создает объекты из генератора пачками по batch_size, не держа их все в памяти."""
+    batch = []
+    for obj in objects:
+        batch.append(obj)
+        if len(batch) == batch_size:
+            model.objects.bulk_create(batch, batch_size)
+            batch = []
+    model.objects.bulk_create(batch, batch_size)
+
+
+def seed(users, categories, dogs, reviews, batch_size=5000):
+    """
+    Заполняет базу данными для замеров, дополняя уже созданные до нужного объема.
+
+    Объекты создаются bulk_create пачками без сигналов, поэтому после заполнения один раз
+    пересчитываются счетчики, перестраиваются родословная и поисковый индекс. Каждая
+    PARENT_EVERY-я собака получает двух родителей из собак питомника, созданных раньше нее.
+
+    Args:
+        users (int): Пользователей.
+        categories (int): Пород.
+        dogs (int): Собак.
+        reviews (int): Отзывов.
+        batch_size (int): Строк в одном INSERT.
+
+    Returns:
+        dict: Модель -> количество созданных объектов.
+    """
+    created = {}
+    password = make_password(SEED_PASSWORD)  # Хеш пароля вычисляется один раз для всех пользователей
+
+    existing = User.objects.filter(email__endswith='@bench.local').count()
+    _bulk_create(User, (
+        User(email=SEED_EMAIL.format(number=number), password=password, first_name=f'Bench {number}')
+        for number in range(existing, users)
+    ), batch_size)
+    created['users'] = max(users - existing, 0)
+
+    existing = Category.objects.count()
+    _bulk_create(Category, (
+        Category(name=f'Порода {number}', description=f'Описание породы {number}')
+        for number in range(existing, categories)
+    ), batch_size)
+    created['categories'] = max(categories - existing, 0)
+
+    user_pks = list(User.objects.order_by('pk').values_list('pk', flat=True))
+    category_pks = list(Category.objects.order_by('pk').values_list('pk', flat=True))
+    existing = Dog.objects.count()
+    _bulk_create(Dog, (
+        Dog(name=_dog_name(number), category_id=category_pks[number % len(category_pks)],
+            owner_id=user_pks[number % len(user_pks)], birth_date=date(2010, 1, 1) + timedelta(days=number % 5000),
+            is_active=number % 10 != 0)  # Каждая десятая собака неактивна
+        for number in range(existing, dogs)
+    ), batch_size)
+    created['dogs'] = max(dogs - existing, 0)
+
+    dog_rows = list(Dog.objects.order_by('pk').values_list('pk', 'category_id'))
+    _bulk_create(Parent, (
+        Parent(dog_id=dog_rows[number][0], parent_dog_id=dog_rows[parent][0], name=_dog_name(parent),
+               category_id=dog_rows[parent][1])
+        for number in range(existing, dogs) if number % PARENT_EVERY == 0 and number >= 2
+        for parent in (number // 2 - 1, number // 2)
+    ), batch_size)
+
+    existing = Review.objects.count()
+    _bulk_create(Review, (
+        Review(title=f'Отзыв {number}', slug=slug_generator(), content=f'Отзыв о собаке {number}',
+               dog_id=dog_rows[number % len(dog_rows)][0], autor_id=user_pks[number % len(user_pks)],
+               sign_of_review=number % 10 != 0)
+        for number in range(existing, reviews)
+    ), batch_size)
+    created['reviews'] = max(reviews - existing, 0)
+
+    if any(created.values()):
+        with transaction.atomic():
+            recount_counters()
+            rebuild_pedigree()
+        rebuild_index(batch_size)
+    return created
+
+
+def get_route_kwargs(samples):
+    """
+    Возвращает аргументы маршрутов по имени аргумента: pk собаки, пользователя или породы, слаг отзыва.
+
+    Args:
+        samples (dict): Объекты для адресов: dog, category, review, user.
+
+    Returns:
+        dict: (пространство имен или полное имя маршрута, имя аргумента) -> значение.
+    """
+    return {
+        ('dogs', 'pk'): samples['dog'].pk,
+        ('dogs:category_dogs', 'pk'): samples['category'].pk,
+        ('dogs:export', 'name'): 'dogs',
+        ('dogs:export', 'file_format'): 'csv',
+        ('reviews', 'slug'): samples['review'].slug,
+        ('users', 'pk'): samples['user'].pk,
+    }
+
+
+def get_routes(samples):
+    """
+    Собирает адреса всех именованных маршрутов dogs, reviews и users.
+
+    Args:
+        samples (dict): Объекты для адресов: dog, category, review, user.
+
+    Returns:
+        tuple: (имя маршрута -> адрес, имя маршрута -> причина пропуска).
+    """
+    route_kwargs = get_route_kwargs(samples)
+    routes, skipped = {}, {}
+    for module_name in URL_MODULES:
+        module = import_module(module_name)
+        for pattern in module.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = f'{module.app_name}:{pattern.name}'
+            if name in SKIPPED_ROUTES:
+                skipped[name] = SKIPPED_ROUTES[name]
+                continue
+            kwargs = {}
+            for argument in pattern.pattern.converters:
+                value = route_kwargs.get((name, argument), route_kwargs.get((module.app_name, argument)))
+                if value is None:
+                    break
+                kwargs[argument] = value
+            else:
+                url = reverse(name, kwargs=kwargs)
+                routes[name] = f'{url}?{ROUTE_QUERIES[name]}' if name in ROUTE_QUERIES else url
+                continue
+            skipped[name] = 'нет значения аргумента маршрута'
+    return routes, skipped
+
+
+def _fetch(client, url):
+    """Выполняет запрос и читает ответ целиком (потоковый тоже). Возвращает код ответа и размер в байтах."""
+    response = client.get(url)
+    if response.streaming:
+        size = sum(len(chunk) for chunk in response.streaming_content)
+    else:
+        size = len(response.content)
+    response.close()
+    return response.status_code, size
+
+
+def _percentile(sorted_values, percent):
+    """Возвращает перцентиль отсортированного списка (ближайший ранг)."""
+    index = max(0, min(len(sorted_values) - 1, round(percent / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def measure_route(client, url, iterations=20, warmup=2):
+    """
+    Замеряет один адрес.
+
+    После warmup запросов (прогрев кешей) адрес запрашивается iterations раз. Пиковая память
+    Python (tracemalloc) замеряется отдельным запросом: трассировка сильно замедляет запросы
+    и исказила бы время ответа.
+
+    Args:
+        client (Client): Тестовый клиент с выполненным входом.
+        url (str): Адрес.
+        iterations (int): Замеряемых запросов.
+        warmup (int): Запросов прогрева.
+
+    Returns:
+        dict: status, p50/p95/p99 в мс, queries - SQL-запросов на запрос, bytes - размер ответа,
+        peak_memory_kb - пиковое выделение памяти за запрос.
+    """
+    for _ in range(warmup):
+        _fetch(client, url)
+
+    latencies, queries = [], []
+    for _ in range(iterations):
+        with QueryCounter() as counter:
+            started = time.perf_counter()
+            status, size = _fetch(client, url)
+            latencies.append((time.perf_counter() - started) * 1000)
+        queries.append(counter.count)
+
+    tracemalloc.start()
+    try:
+        _fetch(client, url)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        'status': status,
+        'p50_ms': round(_percentile(latencies, 50), 3),
+        'p95_ms': round(_percentile(latencies, 95), 3),
+        'p99_ms': round(_percentile(latencies, 99), 3),
+        'mean_ms': round(statistics.fmean(latencies), 3),
+        'queries': max(queries),
+        'bytes': size,
+        'peak_memory_kb': round(peak / 1024, 1),
+    }
+
+
+def compare_with_baseline(results, baseline, threshold=0.2, min_delta_ms=1.0):
+    """
+    Сравнивает замеры с сохраненным базовым отчетом.
+
+    Регрессия - рост p95 больше чем на threshold (и не меньше min_delta_ms, чтобы
+    не реагировать на шум быстрых страниц), любой рост числа SQL-запросов, рост пиковой
+    памяти больше чем на threshold или изменение кода ответа.
+
+    Args:
+        results (dict): Отчет bench: routes - замеры по маршрутам.
+        baseline (dict): Базовый отчет того же формата.
+        threshold (float): Допустимый относительный рост.
+        min_delta_ms (float): Рост p95, меньше которого регрессия не фиксируется, мс.
+
+    Returns:
+        list: Описания регрессий, пустой список - регрессий нет.
+    """
+    regressions = []
+    for name, current in results['routes'].items():
+        base = baseline.get('routes', {}).get(name)
+        if base is None:
+            continue
+        if current['status'] != base['status']:
+            regressions.append(f'{name}: код ответа {base["status"]} -> {current["status"]}')
+        if current['p95_ms'] > base['p95_ms'] * (1 + threshold) and current['p95_ms'] - base['p95_ms'] >= min_delta_ms:
+            regressions.append(f'{name}: p95 {base["p95_ms"]} -> {current["p95_ms"]} мс')
+        if current['queries'] > base['queries']:
+            regressions.append(f'{name}: SQL-запросов {base["queries"]} -> {current["queries"]}')
+        if current['peak_memory_kb'] > base['peak_memory_kb'] * (1 + threshold):
+            regressions.append(f'{name}: пиковая память {base["peak_memory_kb"]} -> {current["peak_memory_kb"]} КБ')
+    return regressions
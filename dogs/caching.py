@@ -0,0 +1,331 @@
+import hashlib
+import time
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from asgiref.sync import sync_to_async
+from django.core.cache import DEFAULT_CACHE_ALIAS, cache, caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+from django.http import HttpResponse
+from django.template.loader import render_to_string
+from django.utils.cache import patch_vary_headers
+
+MODEL_VERSION_KEY = 'version:{label}'  # Версия всех объектов модели
+MODEL_MODIFIED_KEY = 'modified:{label}'  # Время последнего изменения объектов модели, нс
+OBJECT_VERSION_KEY = 'version:{label}:{pk}'  # Версия одного объекта
+FRAGMENT_KEY = 'fragment:{template}:{label}:{pk}:{versions}:{viewer}'
+PAGE_KEY = 'page:{path}:{versions}'
+FRAGMENT_TIMEOUT = 60 * 60 * 24
+
+# Карточки, кешируемые тегом {% cached_cards %}: от чего зависит содержимое карточки.
+# owner - поле владельца: кнопки "Изменить" видит только владелец (None - карточка одинакова для всех);
+# models - модели, любое изменение которых меняет карточку (MediaFile - появление уменьшенных копий фото);
+# related - связанные объекты (поле внешнего ключа, модель), выводимые в карточке;
+# fields - поля, меняющиеся UPDATE без сигналов (счетчики): их значения входят в ключ;
+# image - поле изображения: признаки его уменьшенных копий загружаются для всей страницы сразу.
+CARDS = {
+    'dogs.Dog': {
+        'owner': 'owner_id', 'models': ('dogs.Category', 'dogs.MediaFile'), 'related': (),
+        'fields': ('active_review_count',), 'image': 'photo',
+    },
+    'reviews.Review': {
+        'owner': 'autor_id', 'models': ('dogs.Category',), 'related': (('dog_id', 'dogs.Dog'),), 'fields': (),
+        'image': None,
+    },
+    'users.User': {'owner': None, 'models': ('dogs.MediaFile',), 'related': (), 'fields': (), 'image': 'avatar'},
+}
+
+
+def cache_is_process_local():
+    """
+    Возвращает True, если кеш по умолчанию виден только текущему процессу (locmem или dummy).
+
+    Такой кеш не общий для процессов сервера и команд, вытесняет записи по MAX_ENTRIES
+    и теряется при перезапуске, поэтому в нем нельзя копить данные для записи в базу.
+    """
+    return isinstance(caches[DEFAULT_CACHE_ALIAS], (LocMemCache, DummyCache))
+
+
+def _get_versions(keys):
+    """
+    Получает версии по ключам одним обращением к кешу, создавая недостающие.
+
+    Новая версия - текущее время в наносекундах, а не 1: если версия была вытеснена
+    из кеша, фрагменты, закешированные со старым номером, не станут снова актуальными.
+
+    Args:
+        keys (Iterable[str]): Ключи версий.
+
+    Returns:
+        dict: Ключ -> версия.
+    """
+    keys = list(dict.fromkeys(keys))
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            initial = time.time_ns()
+            versions[key] = initial if cache.add(key, initial, None) else cache.get(key, initial)
+    return versions
+
+
+async def _aget_versions(keys):
+    """Асинхронный вариант _get_versions() для асинхронных представлений."""
+    keys = list(dict.fromkeys(keys))
+    versions = await cache.aget_many(keys)
+    for key in keys:
+        if key not in versions:
+            initial = time.time_ns()
+            versions[key] = initial if await cache.aadd(key, initial, None) else await cache.aget(key, initial)
+    return versions
+
+
+def get_model_version(label):
+    """
+    Возвращает версию модели, увеличивающуюся при любом изменении ее объектов.
+
+    Args:
+        label (str): Метка модели, например 'dogs.Dog'.
+
+    Returns:
+        int: Версия модели.
+    """
+    key = MODEL_VERSION_KEY.format(label=label.lower())
+    return _get_versions([key])[key]
+
+
+async def aget_model_version(label):
+    """Асинхронный вариант get_model_version()."""
+    key = MODEL_VERSION_KEY.format(label=label.lower())
+    return (await _aget_versions([key]))[key]
+
+
+def get_object_version(label, pk, models=()):
+    """
+    Возвращает версию объекта вместе с версиями моделей models одним обращением к кешу.
+
+    Args:
+        label (str): Метка модели объекта, например 'users.User'.
+        pk (int | str): Первичный ключ объекта.
+        models (Iterable[str]): Метки моделей, изменение которых тоже меняет результат.
+
+    Returns:
+        str: Версии через точку - часть ключа кеша.
+    """
+    keys = [OBJECT_VERSION_KEY.format(label=label.lower(), pk=pk)]
+    keys += [MODEL_VERSION_KEY.format(label=model.lower()) for model in models]
+    versions = _get_versions(keys)
+    return '.'.join(str(versions[key]) for key in keys)
+
+
+def get_models_state(labels):
+    """
+    Возвращает версии и время последнего изменения нескольких моделей одним обращением к кешу.
+
+    Используется для заголовков ETag и Last-Modified: ответ, собранный из данных моделей,
+    не изменился, пока не изменились их версии.
+
+    Args:
+        labels (Iterable[str]): Метки моделей.
+
+    Returns:
+        tuple: (список версий в порядке labels, время последнего изменения в секундах).
+    """
+    labels = [label.lower() for label in labels]
+    version_keys = [MODEL_VERSION_KEY.format(label=label) for label in labels]
+    modified_keys = [MODEL_MODIFIED_KEY.format(label=label) for label in labels]
+    values = _get_versions(version_keys + modified_keys)
+    modified = max((values[key] for key in modified_keys), default=0)
+    return [values[key] for key in version_keys], modified / 1e9
+
+
+def _bump(key):
+    """Увеличивает версию по ключу."""
+    try:
+        cache.incr(key)
+    except ValueError:  # Версии в кеше нет - начинаем новую последовательность
+        cache.set(key, time.time_ns(), None)
+
+
+def bump_model_version(label):
+    """Сбрасывает все кеши, зависящие от модели (страницы, фрагменты, ETag), и запоминает время изменения."""
+    _bump(MODEL_VERSION_KEY.format(label=label.lower()))
+    cache.set(MODEL_MODIFIED_KEY.format(label=label.lower()), time.time_ns(), None)
+
+
+def bump_object_version(instance):
+    """Сбрасывает кеши, зависящие от объекта, и версию его модели."""
+    label = instance._meta.label_lower
+    _bump(OBJECT_VERSION_KEY.format(label=label, pk=instance.pk))
+    bump_model_version(label)
+
+
+def forget_object_versions(model, pks):
+    """
+    Сбрасывает версии многих объектов одним обращением к кешу (для массовых изменений без сигналов).
+
+    Удаленная версия при следующем чтении создается заново с новым значением (_get_versions).
+
+    Args:
+        model (type): Класс модели.
+        pks (Iterable): Первичные ключи измененных объектов.
+    """
+    label = model._meta.label_lower
+    cache.delete_many([OBJECT_VERSION_KEY.format(label=label, pk=pk) for pk in pks])
+    bump_model_version(label)
+
+
+def viewer_role(user):
+    """
+    Возвращает роль пользователя для ключа кеша: от нее зависит содержимое страниц и карточек.
+
+    Args:
+        user (User | AnonymousUser | None): Пользователь из запроса.
+
+    Returns:
+        str: 'anonymous', 'superuser', 'staff' или 'user'.
+    """
+    if user is None or not user.is_authenticated:
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    if user.is_staff:
+        return 'staff'
+    return 'user'
+
+
+def render_cards(objects, template_name, user):
+    """
+    Выводит карточки объектов, беря неизмененные из кеша.
+
+    Ключ карточки содержит версию объекта, связанных объектов и моделей из CARDS,
+    роль пользователя и признак владельца, поэтому кеш не нужно чистить вручную:
+    после изменения объекта его карточка просто ищется по новому ключу. На весь
+    список приходится два чтения из кеша (версии и карточки) и одна запись пропущенных;
+    признаки уменьшенных копий фото для пропущенных карточек загружаются одним запросом.
+
+    Args:
+        objects (Iterable[Model]): Объекты одной модели из CARDS.
+        template_name (str): Шаблон карточки, получающий object и user.
+        user (User | AnonymousUser): Текущий пользователь.
+
+    Returns:
+        str: HTML всех карточек подряд.
+    """
+    objects = list(objects)
+    if not objects:
+        return ''
+    label = objects[0]._meta.label_lower
+    card = CARDS[objects[0]._meta.label]
+    role = viewer_role(user)
+
+    def object_keys(obj):
+        keys = [OBJECT_VERSION_KEY.format(label=label, pk=obj.pk)]
+        keys += [OBJECT_VERSION_KEY.format(label=related.lower(), pk=getattr(obj, field))
+                 for field, related in card['related']]
+        return keys
+
+    model_keys = [MODEL_VERSION_KEY.format(label=model.lower()) for model in card['models']]
+    versions = _get_versions(model_keys + [key for obj in objects for key in object_keys(obj)])
+    model_versions = [versions[key] for key in model_keys]
+
+    fragment_keys = {}
+    for obj in objects:
+        if card['owner'] is None:
+            viewer = 'all'
+        else:
+            is_owner = role != 'anonymous' and getattr(obj, card['owner']) == user.pk
+            viewer = f'{role}-{"owner" if is_owner else "guest"}'
+        object_versions = model_versions + [versions[key] for key in object_keys(obj)]
+        object_versions += [getattr(obj, field) for field in card['fields']]
+        fragment_keys[obj.pk] = FRAGMENT_KEY.format(
+            template=template_name, label=label, pk=obj.pk, viewer=viewer,
+            versions='.'.join(str(version) for version in object_versions)
+        )
+
+    fragments = cache.get_many(fragment_keys.values())
+    if card['image']:
+        from dogs.images import prefetch_variants  # dogs.images импортирует этот модуль
+        prefetch_variants(getattr(obj, card['image']) for obj in objects if fragment_keys[obj.pk] not in fragments)
+    missing = {}
+    html = []
+    for obj in objects:
+        key = fragment_keys[obj.pk]
+        if key not in fragments:
+            missing[key] = render_to_string(template_name, {'object': obj, 'user': user})
+        html.append(fragments.get(key) or missing[key])
+    if missing:
+        cache.set_many(missing, FRAGMENT_TIMEOUT)
+    return ''.join(html)
+
+
+def cache_page_for_anonymous(timeout, models=()):
+    """
+    Декоратор кеширования страницы целиком только для анонимных пользователей.
+
+    В отличие от cache_page, не отдает авторизованному пользователю страницу, закешированную
+    для анонимного (и наоборот): меню base.html зависит от пользователя и содержит CSRF-токен
+    формы выхода, поэтому страницы авторизованных пользователей не кешируются целиком,
+    а собираются из кешированных карточек (render_cards). Ключ страницы содержит версии
+    моделей models, поэтому изменение данных сразу сбрасывает кеш. Браузерам ответ не
+    разрешается кешировать дольше, чем требует Vary: Cookie. Асинхронное представление
+    получает асинхронную обертку с теми же правилами.
+
+    Args:
+        timeout (int): Время жизни страницы в кеше, сек.
+        models (tuple): Метки моделей, данные которых выводит страница.
+
+    Returns:
+        function: Декоратор представления.
+    """
+    def page_key(request, versions):
+        versions = '.'.join(str(version) for version in versions)
+        return PAGE_KEY.format(path=hashlib.md5(request.get_full_path().encode()).hexdigest(), versions=versions)
+
+    def cacheable(response):
+        return response.status_code == 200 and not response.cookies and not response.streaming
+
+    def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                if (request.method not in ('GET', 'HEAD') or (await request.auser()).is_authenticated
+                        or 'messages' in request.COOKIES):
+                    return await view_func(request, *args, **kwargs)
+
+                key = page_key(request, [await aget_model_version(label) for label in models])
+                cached = await cache.aget(key)
+                if cached is not None:
+                    content, content_type = cached
+                    response = HttpResponse(content, content_type=content_type)
+                else:
+                    response = await view_func(request, *args, **kwargs)
+                    if hasattr(response, 'render') and callable(response.render):
+                        await sync_to_async(response.render)()  # Шаблон может обращаться к базе
+                    if cacheable(response):
+                        await cache.aset(key, (response.content, response.headers['Content-Type']), timeout)
+                patch_vary_headers(response, ('Cookie',))
+                return response
+            return async_wrapper
+
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            if (request.method not in ('GET', 'HEAD') or request.user.is_authenticated
+                    or 'messages' in request.COOKIES):
+                return view_func(request, *args, **kwargs)
+
+            key = page_key(request, [get_model_version(label) for label in models])
+            cached = cache.get(key)
+            if cached is not None:
+                content, content_type = cached
+                response = HttpResponse(content, content_type=content_type)
+            else:
+                response = view_func(request, *args, **kwargs)
+                if hasattr(response, 'render') and callable(response.render):
+                    response.render()
+                if cacheable(response):
+                    cache.set(key, (response.content, response.headers['Content-Type']), timeout)
+            patch_vary_headers(response, ('Cookie',))
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,162 @@
+import threading
+from contextlib import contextmanager
+
+from django.apps import apps
+from django.db.models import Count, F, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+# Денормализованные счетчики: дочерняя модель -> (поле внешнего ключа на родителя, поле активности,
+# счетчик всех дочерних объектов у родителя, счетчик активных дочерних объектов у родителя)
+COUNTERS = {
+    'dogs.Dog': ('category_id', 'is_active', 'dog_count', 'active_dog_count'),
+    'reviews.Review': ('dog_id', 'sign_of_review', 'review_count', 'active_review_count'),
+}
+_suspended = threading.local()
+
+
+@contextmanager
+def counters_suspended():
+    """
+    Отключает поштучное изменение счетчиков в сигналах на время массовой операции.
+
+    Используется, когда счетчики уже изменены групповыми UPDATE (apply_bulk_delete),
+    а queryset.delete() все равно отправляет post_delete для каждого объекта.
+    """
+    previous = getattr(_suspended, 'active', False)
+    _suspended.active = True
+    try:
+        yield
+    finally:
+        _suspended.active = previous
+
+
+def counters_are_suspended():
+    """Возвращает True внутри counters_suspended()."""
+    return getattr(_suspended, 'active', False)
+
+
+def get_counter_state(instance):
+    """
+    Возвращает состояние объекта, от которого зависят счетчики родителя.
+
+    Args:
+        instance (Model): Объект дочерней модели из COUNTERS.
+
+    Returns:
+        tuple | None: (pk родителя, признак активности) или None, если поля не загружены.
+    """
+    parent_field, flag_field, _, _ = COUNTERS[instance._meta.label]
+    if parent_field not in instance.__dict__ or flag_field not in instance.__dict__:
+        return None  # Объект загружен через only()/defer() без нужных полей
+    return instance.__dict__[parent_field], bool(instance.__dict__[flag_field])
+
+
+def apply_counter_change(model, old_state, new_state):
+    """
+    Изменяет счетчики родителей атомарными UPDATE ... SET count = count + delta.
+
+    Args:
+        model (type): Дочерняя модель из COUNTERS.
+        old_state (tuple | None): Состояние до изменения (None - объект создан).
+        new_state (tuple | None): Состояние после изменения (None - объект удален).
+
+    Returns:
+        set: pk родителей, счетчики которых изменились.
+    """
+    parent_field, _, total_field, active_field = COUNTERS[model._meta.label]
+    parent_model = model._meta.get_field(parent_field.removesuffix('_id')).related_model
+
+    deltas = {}
+    for state, sign in ((old_state, -1), (new_state, 1)):
+        if state is not None and state[0] is not None:
+            total, active = deltas.get(state[0], (0, 0))
+            deltas[state[0]] = (total + sign, active + sign * state[1])
+
+    changed = set()
+    for parent_pk, (total, active) in deltas.items():
+        if total or active:
+            parent_model.objects.filter(pk=parent_pk).update(
+                **{total_field: F(total_field) + total, active_field: F(active_field) + active}
+            )
+            changed.add(parent_pk)
+    return changed
+
+
+def apply_bulk_flag_change(model, pks, active):
+    """
+    Пересчитывает счетчики активных объектов после массового изменения признака активности.
+
+    Для queryset.update() сигналы не отправляются, поэтому счетчики нужно изменить отдельно:
+    для каждого родителя одним UPDATE на число объектов, у которых признак действительно изменился.
+    Вызывается до update() внутри той же транзакции.
+
+    Args:
+        model (type): Дочерняя модель из COUNTERS.
+        pks (Iterable): pk изменяемых объектов.
+        active (bool): Новое значение признака активности.
+
+    Returns:
+        set: pk родителей, счетчики которых изменились.
+    """
+    parent_field, flag_field, _, active_field = COUNTERS[model._meta.label]
+    parent_model = model._meta.get_field(parent_field.removesuffix('_id')).related_model
+    rows = model.objects.filter(pk__in=pks).exclude(**{flag_field: active}) \
+        .values(parent_field).annotate(changed=Count('pk'))
+    for row in rows:
+        delta = row['changed'] if active else -row['changed']
+        parent_model.objects.filter(pk=row[parent_field]).update(**{active_field: F(active_field) + delta})
+    return {row[parent_field] for row in rows}
+
+
+def apply_bulk_delete(model, pks):
+    """
+    Уменьшает счетчики родителей перед массовым удалением объектов.
+
+    Для каждого родителя выполняется один UPDATE на число удаляемых объектов и число
+    активных среди них. Вызывается до delete() внутри той же транзакции и вместе с
+    counters_suspended(), чтобы сигналы post_delete не уменьшили счетчики второй раз.
+
+    Args:
+        model (type): Дочерняя модель из COUNTERS.
+        pks (Iterable): pk удаляемых объектов.
+
+    Returns:
+        set: pk родителей, счетчики которых изменились.
+    """
+    parent_field, flag_field, total_field, active_field = COUNTERS[model._meta.label]
+    parent_model = model._meta.get_field(parent_field.removesuffix('_id')).related_model
+    rows = model.objects.filter(pk__in=pks).exclude(**{f'{parent_field}__isnull': True}).order_by() \
+        .values(parent_field).annotate(total=Count('pk'), active=Count('pk', filter=Q(**{flag_field: True})))
+    for row in rows:
+        parent_model.objects.filter(pk=row[parent_field]).update(
+            **{total_field: F(total_field) - row['total'], active_field: F(active_field) - row['active']}
+        )
+    return {row[parent_field] for row in rows}
+
+
+def recount_counters():
+    """
+    Пересчитывает все денормализованные счетчики по фактическим данным.
+
+    Для каждого счетчика выполняется один UPDATE с подзапросом COUNT, поэтому команда
+    работает на стороне базы без загрузки строк в память.
+
+    Returns:
+        dict: Метка родительской модели -> количество строк, счетчики которых расходились.
+    """
+    fixed = {}
+    for label, (parent_field, flag_field, total_field, active_field) in COUNTERS.items():
+        model = apps.get_model(label)
+        parent_model = model._meta.get_field(parent_field.removesuffix('_id')).related_model
+
+        def count(condition=Q()):
+            subquery = model.objects.filter(condition, **{parent_field: OuterRef('pk')}) \
+                .order_by().values(parent_field).annotate(count=Count('pk')).values('count')
+            return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+        expected = {total_field: count(), active_field: count(Q(**{flag_field: True}))}
+        drift = parent_model.objects.annotate(**{f'expected_{name}': value for name, value in expected.items()}) \
+            .exclude(**{name: F(f'expected_{name}') for name in expected}).count()
+        parent_model.objects.update(**expected)
+        fixed[parent_model._meta.label] = drift
+    return fixed
@@ -0,0 +1,155 @@
+import csv
+from datetime import date
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+
+from dogs.models import Dog
+from reviews.models import Review
+from users.models import User
+
+# Выгрузки для сотрудников: имя -> модель, связанные объекты (select_related) и столбцы (заголовок, путь к значению).
+# Путь 'category.name' читается по цепочке атрибутов, пустое звено дает пустое значение.
+EXPORTS = {
+    'dogs': {
+        'model': Dog,
+        'related': ('category', 'owner'),
+        'columns': (
+            ('id', 'pk'), ('кличка', 'name'), ('порода', 'category.name'), ('дата рождения', 'birth_date'),
+            ('активна', 'is_active'), ('владелец', 'owner.email'), ('просмотры', 'views'),
+            ('отзывы', 'review_count'),
+        ),
+    },
+    'reviews': {
+        'model': Review,
+        'related': ('dog__category', 'autor'),
+        'columns': (
+            ('id', 'pk'), ('заголовок', 'title'), ('текст', 'content'), ('создан', 'created'),
+            ('активный', 'sign_of_review'), ('собака', 'dog.name'), ('порода', 'dog.category.name'),
+            ('автор', 'autor.email'),
+        ),
+    },
+    'breeders': {
+        'model': User,
+        'related': (),
+        'columns': (
+            ('id', 'pk'), ('email', 'email'), ('имя', 'first_name'), ('фамилия', 'last_name'),
+            ('телефон', 'phone'), ('telegram', 'telegram'), ('роль', 'role'), ('активен', 'is_active'),
+        ),
+    },
+}
+EXPORT_FORMATS = ('csv', 'jsonl')
+EXPORT_CHUNK_SIZE = 2000  # Строк, читаемых из базы за раз (iterator)
+EXPORT_BUFFER_SIZE = 1 << 16  # Примерный размер куска ответа, символов
+
+
+class _Echo:
+    """Псевдофайл для csv.writer: writerow() возвращает строку вместо записи."""
+
+    def write(self, value):
+        return value
+
+
+def _resolve(obj, path):
+    """Возвращает значение по цепочке атрибутов 'dog.category.name' или None, если звено пустое."""
+    for attr in path.split('.'):
+        obj = getattr(obj, attr)
+        if obj is None:
+            return None
+    return obj
+
+
+def get_export_queryset(name, queryset=None):
+    """
+    Возвращает запрос выгрузки со связанными объектами в одном SELECT.
+
+    Args:
+        name (str): Имя выгрузки из EXPORTS.
+        queryset (QuerySet | None): Отобранные объекты (действие админки) или None - все объекты.
+
+    Returns:
+        QuerySet: Запрос, упорядоченный по pk.
+    """
+    export = EXPORTS[name]
+    if queryset is None:
+        queryset = export['model']._default_manager.all()
+    return queryset.select_related(*export['related']).order_by('pk')
+
+
+def iter_export(name, file_format, queryset=None):
+    """
+    Выдает выгрузку по кускам для StreamingHttpResponse.
+
+    Заголовок выдается до первого запроса к базе, поэтому первый байт ответа приходит сразу.
+    Строки читаются iterator() пачками по EXPORT_CHUNK_SIZE без кеша QuerySet и отдаются
+    кусками примерно по EXPORT_BUFFER_SIZE символов: память не зависит от числа строк.
+
+    Args:
+        name (str): Имя выгрузки из EXPORTS.
+        file_format (str): Формат из EXPORT_FORMATS.
+        queryset (QuerySet | None): Отобранные объекты или None - все объекты.
+
+    Yields:
+        str: Кусок файла выгрузки.
+    """
+    columns = EXPORTS[name]['columns']
+    if file_format == 'csv':
+        writer = csv.writer(_Echo())
+        yield '\ufeff' + writer.writerow([title for title, _ in columns])  # BOM: Excel откроет кириллицу
+
+        def render(values):
+            return writer.writerow(['' if value is None else value for value in values])
+    else:
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        titles = [title for title, _ in columns]
+
+        def render(values):
+            return encoder.encode(dict(zip(titles, values))) + '\n'
+
+    buffer, size = [], 0
+    threshold = EXPORT_BUFFER_SIZE if file_format == 'csv' else 0  # Первая строка JSONL отдается сразу
+    for obj in get_export_queryset(name, queryset).iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        line = render([_resolve(obj, path) for _, path in columns])
+        buffer.append(line)
+        size += len(line)
+        if size >= threshold:
+            yield ''.join(buffer)
+            buffer, size, threshold = [], 0, EXPORT_BUFFER_SIZE
+    if buffer:
+        yield ''.join(buffer)
+
+
+def export_response(name, file_format, queryset=None):
+    """
+    Возвращает потоковый ответ с файлом выгрузки.
+
+    Args:
+        name (str): Имя выгрузки из EXPORTS.
+        file_format (str): Формат из EXPORT_FORMATS.
+        queryset (QuerySet | None): Отобранные объекты или None - все объекты.
+
+    Returns:
+        StreamingHttpResponse: Файл '<имя>-<дата>.<формат>' во вложении.
+    """
+    content_type = 'text/csv; charset=utf-8' if file_format == 'csv' else 'application/x-ndjson; charset=utf-8'
+    response = StreamingHttpResponse(iter_export(name, file_format, queryset), content_type=content_type)
+    response['Content-Disposition'] = f'attachment; filename="{name}-{date.today().isoformat()}.{file_format}"'
+    return response
+
+
+def make_export_action(name, file_format):
+    """
+    Создает действие админки, выгружающее выбранные объекты.
+
+    Args:
+        name (str): Имя выгрузки из EXPORTS.
+        file_format (str): Формат из EXPORT_FORMATS.
+
+    Returns:
+        function: Действие для ModelAdmin.actions.
+    """
+    def admin_action(modeladmin, request, queryset):
+        return export_response(name, file_format, queryset)
+    admin_action.__name__ = f'export_{file_format}'
+    admin_action.short_description = f'Выгрузить выбранные в {file_format.upper()}'
+    return admin_action
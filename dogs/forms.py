@@ -1,17 +1,50 @@
 import datetime
 
 from django import forms
-from dogs.models import Dog, Parent
+from django.db import transaction
+from django.forms import BaseInlineFormSet, inlineformset_factory
+
+from dogs.caching import bump_model_version
+from dogs.models import Ancestry, Dog, Parent
+from dogs.pedigree import rebuild_pedigree
+from dogs.services import get_categories_cache, get_category_choices
 from users.forms import StyleFormMixin
 
 
+# Поле выбора породы, проверяющее значение по кешированному справочнику, а не запросом к базе.
+# Версия справочника сверяется с общим кешем при каждой проверке, поэтому порода, удаленная
+# в другом процессе, не проходит проверку по копии L1 этого процесса
+class CategoryChoiceField(forms.ModelChoiceField):
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        categories = {str(category.pk): category for category in get_categories_cache(fresh=True)}
+        category = categories.get(str(value))
+        if category is None:
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return category
+
+
+# Миксин форм с полем category: варианты и проверка породы берутся из кешированного справочника
+class CachedCategoryFormMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields['category'].choices = get_category_choices()
+
+    def _get_validation_exclusions(self):
+        exclude = super()._get_validation_exclusions()
+        exclude.add('category')  # Порода уже проверена CategoryChoiceField, повторный запрос EXISTS не нужен
+        return exclude
+
+
 # Форма для модели Dog, наследующая функциональность от StyleFormMixin
-class DogForm(StyleFormMixin, forms.ModelForm):
+class DogForm(CachedCategoryFormMixin, StyleFormMixin, forms.ModelForm):
     class Meta:
         # Указываем модель, для которой создается форма
         model = Dog
         # Исключаем поля owner, is_active и views из формы
         exclude = ('owner', 'is_active', 'views')
+        field_classes = {'category': CategoryChoiceField}
 
     # Метод для валидации даты рождения собаки
     def clean_birth_date(self):
@@ -40,8 +73,135 @@ class DogAdminForm(StyleFormMixin, forms.ModelForm):
 
 
 # Форма для модели Parent, наследующая функциональность от StyleFormMixin
-class ParentForm(StyleFormMixin, forms.ModelForm):
+class ParentForm(CachedCategoryFormMixin, StyleFormMixin, forms.ModelForm):
     class Meta:
         model = Parent
         # Указываем все поля модели для формы
         fields = '__all__'
+        field_classes = {'category': CategoryChoiceField}
+        # Номер собаки питомника вместо <select> со всеми собаками
+        widgets = {'parent_dog': forms.NumberInput(attrs={'placeholder': 'ID собаки питомника'})}
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # Для собаки питомника кличка и порода берутся из ее карточки
+        self.fields['name'].required = False
+        self.fields['category'].required = False
+
+    # Метод заполняет данные родителя из собаки питомника или требует их заполнить
+    def clean(self):
+        cleaned_data = super().clean()
+        parent_dog = cleaned_data.get('parent_dog')
+        for field in ('name', 'category', 'birth_date'):
+            if parent_dog and not cleaned_data.get(field):
+                cleaned_data[field] = getattr(parent_dog, field)
+            elif not cleaned_data.get(field) and field != 'birth_date' and field not in self.errors:
+                self.add_error(field, forms.ValidationError(self.fields[field].error_messages['required'],
+                                                            code='required'))
+        return cleaned_data
+
+
+# Поле id формы родителя: находит родителя среди уже загруженных набором форм, без запроса на каждую форму
+class ExistingParentField(forms.ModelChoiceField):
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        try:
+            parent = self.formset._existing_object(Parent._meta.pk.to_python(value))
+        except forms.ValidationError:
+            parent = None
+        if parent is None:
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return parent
+
+
+# Поле собаки питомника формы родителя: собаки всех форм набора загружаются одним запросом
+class LinkedDogField(forms.ModelChoiceField):
+    def __init__(self, formset, *args, **kwargs):
+        self.formset = formset
+        super().__init__(*args, **kwargs)
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return None
+        dog = self.formset.get_linked_dogs().get(str(value))
+        if dog is None:
+            raise forms.ValidationError(self.error_messages['invalid_choice'], code='invalid_choice')
+        return dog
+
+
+# Набор форм родителей с массовым сохранением (bulk_create/bulk_update/один DELETE)
+class BaseParentFormSet(BaseInlineFormSet):
+    _linked_dogs = None
+
+    def add_fields(self, form, index):
+        super().add_fields(form, index)
+        pk_field = form.fields['id']
+        form.fields['id'] = ExistingParentField(
+            self, pk_field.queryset, initial=pk_field.initial, required=False, widget=pk_field.widget
+        )
+        dog_field = form.fields['parent_dog']
+        form.fields['parent_dog'] = LinkedDogField(
+            self, dog_field.queryset, required=False, widget=dog_field.widget, label=dog_field.label
+        )
+
+    def get_linked_dogs(self):
+        """
+        Загружает одним запросом собак питомника, указанных родителями во всех формах набора.
+
+        Returns:
+            dict: Строковый pk -> собака с породой.
+        """
+        if self._linked_dogs is None:
+            values = (self.data.get(self.add_prefix(i) + '-parent_dog', '') for i in range(self.total_form_count()))
+            pks = {int(value) for value in values if str(value).isdigit()}
+            dogs = Dog.objects.filter(pk__in=pks).select_related('category') if pks else ()
+            self._linked_dogs = {str(dog.pk): dog for dog in dogs}
+        return self._linked_dogs
+
+    # Метод проверяет, что собака не становится своим предком
+    def clean(self):
+        super().clean()
+        linked = {form.cleaned_data['parent_dog'].pk for form in self.forms
+                  if form.cleaned_data.get('parent_dog') and not self._should_delete_form(form)}
+        if not linked or self.instance.pk is None:
+            return
+        if self.instance.pk in linked or \
+                Ancestry.objects.filter(ancestor=self.instance, descendant_id__in=linked).exists():
+            raise forms.ValidationError('Собака не может быть своим предком')
+
+    def save_bulk(self):
+        """
+        Сохраняет изменения родителей тремя запросами вместо запроса на каждую форму.
+
+        Должен вызываться внутри транзакции вместе с сохранением собаки.
+
+        Returns:
+            list: Созданные и измененные родители.
+        """
+        self.save(commit=False)  # Только собирает new_objects, changed_objects и deleted_objects
+
+        if self.deleted_objects:
+            Parent.objects.filter(pk__in=[parent.pk for parent in self.deleted_objects]).delete()
+        if self.new_objects:
+            Parent.objects.bulk_create(self.new_objects)
+        if self.changed_objects:
+            fields = sorted({field for _, changed in self.changed_objects for field in changed})
+            Parent.objects.bulk_update([parent for parent, _ in self.changed_objects], fields)
+        if self.deleted_objects or self.new_objects or self.changed_objects:
+            # Массовые запросы не отправляют сигналы, сбрасывающие версию родителей (ETag API)
+            transaction.on_commit(lambda: bump_model_version('dogs.Parent'))
+        # и перестраивающие родословную (удаление отправляет post_delete - см. dogs.signals)
+        if any(parent.parent_dog_id for parent in self.new_objects) \
+                or any('parent_dog' in changed for _, changed in self.changed_objects):
+            rebuild_pedigree([self.instance.pk])
+
+        return self.new_objects + [parent for parent, _ in self.changed_objects]
+
+
+# Класс набора форм создается один раз при импорте модуля, а не на каждый запрос
+ParentFormset = inlineformset_factory(Dog, Parent, form=ParentForm, formset=BaseParentFormSet, fk_name='dog', extra=1)
@@ -0,0 +1,225 @@
+import os
+from io import BytesIO
+
+import logging
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from PIL import Image, ImageOps
+
+from dogs.caching import FRAGMENT_TIMEOUT, bump_model_version
+from dogs.models import MediaFile
+from dogs.storage import media_storage
+
+logger = logging.getLogger(__name__)
+
+VARIANTS_DIR = 'variants'  # Подкаталог для уменьшенных копий рядом с оригиналами
+VARIANTS_READY_KEY = 'variants:{name}'  # Признак MediaFile.has_variants файла в кеше
+VARIANT_FORMATS = {
+    'webp': ('WEBP', {'quality': 80, 'method': 6}),
+    'jpeg': ('JPEG', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+
+
+def variant_name(name, width, extension):
+    """
+    Возвращает имя файла уменьшенной копии изображения.
+
+    Например, для 'dogs/rex.jpg', 320 и 'webp' вернет 'dogs/variants/rex_320.webp'.
+
+    Args:
+        name (str): Имя оригинала в хранилище.
+        width (int): Ширина копии.
+        extension (str): Формат копии ('webp' или 'jpeg').
+
+    Returns:
+        str: Имя копии в хранилище.
+    """
+    directory, filename = os.path.split(name)
+    stem = os.path.splitext(filename)[0]
+    return f'{directory}/{VARIANTS_DIR}/{stem}_{width}.{extension}'
+
+
+def generate_variants(name, storage=None, overwrite=False):
+    """
+    Создает уменьшенные копии изображения во всех форматах VARIANT_FORMATS.
+
+    Копии создаются для каждой ширины из IMAGE_VARIANT_WIDTHS; изображение не увеличивается,
+    если оригинал уже меньше нужной ширины. Копии всегда записываются в default_storage
+    под именем, производным от имени оригинала, даже если оригинал лежит в другом хранилище.
+
+    Args:
+        name (str): Имя оригинала в хранилище.
+        storage (Storage | None): Хранилище оригинала, по умолчанию default_storage.
+        overwrite (bool): Пересоздавать уже существующие копии.
+
+    Returns:
+        list: Имена созданных копий.
+    """
+    created = []
+    with (storage or default_storage).open(name) as file:
+        image = ImageOps.exif_transpose(Image.open(file))
+        image = image.convert('RGB')  # JPEG и единообразный WebP без альфа-канала
+
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        resized = image.copy()
+        resized.thumbnail((width, image.height))  # Ограничение только по ширине, без увеличения
+        for extension, (image_format, options) in VARIANT_FORMATS.items():
+            target = variant_name(name, width, extension)
+            if default_storage.exists(target):
+                if not overwrite:
+                    continue
+                default_storage.delete(target)
+            buffer = BytesIO()
+            resized.save(buffer, image_format, **options)
+            created.append(default_storage.save(target, ContentFile(buffer.getvalue())))
+
+    return created
+
+
+def delete_variants(name):
+    """Удаляет все уменьшенные копии изображения и признак их наличия в кеше."""
+    for width in settings.IMAGE_VARIANT_WIDTHS:
+        for extension in VARIANT_FORMATS:
+            default_storage.delete(variant_name(name, width, extension))
+    cache.delete(VARIANTS_READY_KEY.format(name=name))
+
+
+def mark_variants_ready(names):
+    """
+    Отмечает, что копии файлов созданы (MediaFile.has_variants), и сбрасывает карточки с ними.
+
+    Карточки собак и пользователей зависят от версии модели MediaFile (dogs.caching.CARDS),
+    поэтому после смены версии они выводятся заново уже с копиями.
+
+    Args:
+        names (list): Имена оригиналов в хранилище.
+    """
+    if not names:
+        return
+    MediaFile.objects.filter(name__in=names).update(has_variants=True)
+    cache.delete_many([VARIANTS_READY_KEY.format(name=name) for name in names])
+    bump_model_version('dogs.MediaFile')
+
+
+def generate_pending_variants(batch_size=20):
+    """
+    Создает копии файлов, загруженных после последнего запуска (MediaFile.has_variants = False).
+
+    Загрузка фото не ждет обработки изображения: копии создает команда
+    generate_image_variants --pending (по расписанию или с --loop), а до этого шаблоны
+    выводят оригинал. Файл, который не удалось обработать, отмечается has_variants = None,
+    чтобы не блокировать очередь, и выводится оригиналом.
+
+    Args:
+        batch_size (int): Сколько файлов обработать за вызов.
+
+    Returns:
+        int: Количество обработанных файлов.
+    """
+    pending = MediaFile.objects.filter(has_variants=False).order_by('pk')
+    names = list(pending.values_list('name', flat=True)[:batch_size])
+    ready = []
+    for name in names:
+        try:
+            generate_variants(name, media_storage, overwrite=True)
+        except Exception:
+            logger.exception('Не удалось создать копии %s', name)
+            continue
+        ready.append(name)
+    mark_variants_ready(ready)
+    failed = set(names) - set(ready)
+    if failed:
+        MediaFile.objects.filter(name__in=failed).update(has_variants=None)  # Не повторяется, выводится оригинал
+    return len(names)
+
+
+def has_variants(name):
+    """
+    Возвращает True, если копии изображения созданы.
+
+    Признак берется из кеша, а при его отсутствии - из MediaFile, без обращений к хранилищу.
+    Файлы, не учтенные в MediaFile, выводятся оригиналом.
+
+    Args:
+        name (str): Имя оригинала в хранилище.
+
+    Returns:
+        bool: Копии созданы.
+    """
+    key = VARIANTS_READY_KEY.format(name=name)
+    ready = cache.get(key)
+    if ready is None:
+        ready = MediaFile.objects.filter(name=name, has_variants=True).exists()
+        cache.set(key, ready, FRAGMENT_TIMEOUT)
+    return ready
+
+
+def prefetch_variants(files):
+    """
+    Получает признаки наличия копий для всех изображений страницы сразу.
+
+    Признаки читаются из кеша одним get_many, а отсутствующие - одним запросом к MediaFile,
+    и запоминаются в самих файлах (FieldFile) для фильтров dogs_media, user_media и media_srcset.
+    Без этого каждая карточка с фото при холодном кеше выполняла бы свой запрос.
+
+    Args:
+        files (Iterable[FieldFile]): Изображения объектов страницы (пустые пропускаются).
+    """
+    files = [file for file in files if file]
+    if not files:
+        return
+    keys = {file.name: VARIANTS_READY_KEY.format(name=file.name) for file in files}
+    cached = cache.get_many(keys.values())
+    flags = {name: cached[key] for name, key in keys.items() if key in cached}
+    missing = [name for name in keys if name not in flags]
+    if missing:
+        ready = set(MediaFile.objects.filter(name__in=missing, has_variants=True).values_list('name', flat=True))
+        missed_flags = {name: name in ready for name in missing}
+        cache.set_many({keys[name]: flag for name, flag in missed_flags.items()}, FRAGMENT_TIMEOUT)
+        flags.update(missed_flags)
+    for file in files:
+        file.has_variants = flags[file.name]
+
+
+def variant_url(name, width, extension='jpeg', ready=None):
+    """
+    Возвращает URL уменьшенной копии или None, если копии еще не созданы.
+
+    Имя копии производно от имени оригинала (variant_name), поэтому наличие файла
+    в хранилище не проверяется.
+
+    Args:
+        name (str): Имя оригинала в хранилище.
+        width (int): Ширина копии.
+        extension (str): Формат копии.
+        ready (bool | None): Признак из prefetch_variants(); None - узнать через has_variants().
+
+    Returns:
+        str | None: URL копии.
+    """
+    if width not in settings.IMAGE_VARIANT_WIDTHS:
+        return None
+    if not (has_variants(name) if ready is None else ready):
+        return None
+    return default_storage.url(variant_name(name, width, extension))
+
+
+def variant_srcset(name, extension='jpeg', ready=None):
+    """
+    Возвращает значение атрибута srcset из копий изображения.
+
+    Args:
+        name (str): Имя оригинала в хранилище.
+        extension (str): Формат копий.
+        ready (bool | None): Признак из prefetch_variants(); None - узнать через has_variants().
+
+    Returns:
+        str: Строка вида 'url_320 320w, url_640 640w' (пустая, если копий нет).
+    """
+    if not (has_variants(name) if ready is None else ready):
+        return ''
+    return ', '.join(f'{default_storage.url(variant_name(name, width, extension))} {width}w'
+                     for width in settings.IMAGE_VARIANT_WIDTHS)
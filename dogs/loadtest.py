@@ -0,0 +1,202 @@
+import http.cookiejar
+import random
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+# Сценарии нагрузки и их доля в смеси по умолчанию (--mix команды loadtest)
+SCENARIOS = {'browse': 40, 'search': 15, 'detail': 30, 'post_review': 10, 'toggle': 5}
+SEARCH_WORDS = ('Альфа', 'Барон', 'Вега', 'Гром', 'Дина', 'Ерш', 'Порода', 'Отзыв')
+HOT_SHARE = 0.8  # Доля просмотров, приходящихся на "популярных" собак: конкуренция за счетчик просмотров
+# Границы корзин гистограммы времени ответа, мс (последняя корзина - все, что дольше)
+HISTOGRAM_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000)
+REQUEST_TIMEOUT = 30  # Ожидание ответа сервера, сек.
+
+
+class _NoRedirect(urllib.request.HTTPRedirectHandler):
+    """Не следует за перенаправлением: 302 после POST и переключения - ответ сценария, а не новый запрос."""
+
+    def redirect_request(self, *args, **kwargs):
+        return None
+
+
+class VirtualUser:
+    """
+    Виртуальный пользователь: сеанс с cookie и выбор следующего запроса по смеси сценариев.
+
+    Использует только стандартную библиотеку, поэтому работает и в отдельном процессе клиента.
+
+    Атрибуты:
+        base_url (str): Адрес сервера, например 'http://127.0.0.1:8000'.
+        plan (dict): Адреса и данные для запросов (make_plan).
+        session (dict): Cookie sessionid и csrftoken пользователя и pk его собак.
+    """
+
+    def __init__(self, base_url, plan, session, seed=None):
+        self.base_url = base_url
+        self.plan = plan
+        self.session = session
+        self.random = random.Random(seed)
+        jar = http.cookiejar.CookieJar()
+        self.opener = urllib.request.build_opener(urllib.request.HTTPCookieProcessor(jar), _NoRedirect())
+        host = urllib.parse.urlsplit(base_url).hostname
+        for name in ('sessionid', 'csrftoken'):
+            jar.set_cookie(http.cookiejar.Cookie(
+                0, name, session[name], None, False, host, False, False, '/', True, False, None, False, None, None, {}
+            ))
+
+    def request(self, path, data=None):
+        """
+        Выполняет запрос и читает ответ целиком.
+
+        Returns:
+            int: Код ответа (0 - ошибка соединения или таймаут).
+        """
+        headers = {'X-CSRFToken': self.session['csrftoken'], 'Referer': self.base_url + '/'}
+        body = urllib.parse.urlencode(data).encode() if data is not None else None
+        request = urllib.request.Request(self.base_url + path, data=body, headers=headers)
+        try:
+            with self.opener.open(request, timeout=REQUEST_TIMEOUT) as response:
+                response.read()
+                return response.status
+        except urllib.error.HTTPError as ex:  # 3xx без перенаправления, 4xx и 5xx
+            ex.read()
+            return ex.code
+        except (urllib.error.URLError, OSError):
+            return 0
+
+    def pick_dog(self):
+        """pk собаки для просмотра: чаще всего одна из популярных."""
+        plan = self.plan
+        pool = plan['hot_dogs'] if self.random.random() < HOT_SHARE else plan['dogs']
+        return self.random.choice(pool)
+
+    def run_scenario(self, name):
+        """
+        Выполняет один сценарий.
+
+        Returns:
+            bool: True - сценарий выполнен успешно (все ответы с кодом меньше 400).
+        """
+        urls, choice = self.plan['urls'], self.random.choice
+        if name == 'browse':
+            statuses = [self.request(urls['index']), self.request(choice((urls['dogs'], urls['reviews'])))]
+        elif name == 'search':
+            statuses = [self.request(f'{choice((urls["search_dogs"], urls["search_reviews"]))}'
+                                     f'?q={urllib.parse.quote(choice(SEARCH_WORDS))}')]
+        elif name == 'detail':
+            statuses = [self.request(urls['detail_dog'].format(pk=self.pick_dog()))]
+        elif name == 'post_review':
+            number = self.random.randrange(10 ** 9)
+            statuses = [self.request(urls['create_review'], {
+                'dog': self.pick_dog(), 'title': f'Нагрузка {number}', 'content': f'Отзыв под нагрузкой {number}',
+            })]
+        elif name == 'toggle':
+            statuses = [self.request(urls['toggle_dog'].format(pk=choice(self.session['dogs'])), {})]  # POST с CSRF
+        else:
+            raise ValueError(f'Неизвестный сценарий: {name}')
+        return all(0 < status < 400 for status in statuses)
+
+
+def run_virtual_users(base_url, plan, sessions, mix, deadline, seed=0):
+    """
+    Выполняет сценарии от имени виртуальных пользователей до момента deadline.
+
+    Каждый пользователь работает в своем потоке и выбирает сценарий случайно с весами mix.
+    Функция использует только стандартную библиотеку и может выполняться в отдельном процессе.
+
+    Args:
+        base_url (str): Адрес сервера.
+        plan (dict): Адреса и данные для запросов (make_plan).
+        sessions (list): Сеансы пользователей (make_sessions).
+        mix (dict): Сценарий -> вес.
+        deadline (float): Время окончания по time.time().
+        seed (int): Начальное значение случайных чисел.
+
+    Returns:
+        list: Замеры (сценарий, время сек., успешно).
+    """
+    names, weights = list(mix), list(mix.values())
+    samples, lock = [], threading.Lock()
+
+    def work(index):
+        user = VirtualUser(base_url, plan, sessions[index], seed * 100_003 + index)
+        local = []
+        while time.time() < deadline:
+            name = user.random.choices(names, weights)[0]
+            started = time.perf_counter()
+            ok = user.run_scenario(name)
+            local.append((name, time.perf_counter() - started, ok))
+        with lock:
+            samples.extend(local)
+
+    with ThreadPoolExecutor(max_workers=len(sessions)) as executor:
+        list(executor.map(work, range(len(sessions))))
+    return samples
+
+
+def summarize(samples, elapsed):
+    """
+    Сводит замеры по сценариям.
+
+    Args:
+        samples (list): Замеры (сценарий, время сек., успешно).
+        elapsed (float): Длительность нагрузки, сек.
+
+    Returns:
+        dict: Сценарий (и 'total') -> count, throughput (в секунду), error_rate, p50/p95/p99 в мс
+        и histogram - количество ответов по корзинам HISTOGRAM_BUCKETS ('<=N мс' и '>N мс').
+    """
+    by_scenario = {}
+    for name, latency, ok in samples:
+        by_scenario.setdefault(name, []).append((latency * 1000, ok))
+    by_scenario['total'] = [(latency * 1000, ok) for _, latency, ok in samples]
+
+    report = {}
+    for name, rows in by_scenario.items():
+        if not rows:
+            continue
+        latencies = sorted(latency for latency, _ in rows)
+        errors = sum(not ok for _, ok in rows)
+
+        def percentile(percent):
+            return round(latencies[max(0, min(len(latencies) - 1, round(percent / 100 * len(latencies)) - 1))], 2)
+
+        histogram = {f'<={bucket}ms': 0 for bucket in HISTOGRAM_BUCKETS}
+        histogram[f'>{HISTOGRAM_BUCKETS[-1]}ms'] = 0
+        for latency in latencies:
+            bucket = next((bucket for bucket in HISTOGRAM_BUCKETS if latency <= bucket), None)
+            histogram[f'<={bucket}ms' if bucket is not None else f'>{HISTOGRAM_BUCKETS[-1]}ms'] += 1
+        report[name] = {
+            'count': len(rows),
+            'throughput': round(len(rows) / elapsed, 2),
+            'error_rate': round(errors / len(rows), 4),
+            'p50_ms': percentile(50), 'p95_ms': percentile(95), 'p99_ms': percentile(99),
+            'histogram': histogram,
+        }
+    return report
+
+
+def parse_mix(value):
+    """
+    Разбирает смесь сценариев из строки 'browse=40,detail=30'.
+
+    Returns:
+        dict: Сценарий -> вес.
+
+    Raises:
+        ValueError: Неизвестный сценарий или неверный вес.
+    """
+    mix = {}
+    for part in value.split(','):
+        name, _, weight = part.partition('=')
+        name = name.strip()
+        if name not in SCENARIOS:
+            raise ValueError(f'Неизвестный сценарий: {name}, допустимы: {", ".join(SCENARIOS)}')
+        mix[name] = float(weight)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError('Нужен хотя бы один сценарий с положительным весом')
+    return mix
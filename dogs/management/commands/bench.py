@@ -0,0 +1,114 @@
+import json
+import sys
+
+from django.core.management import BaseCommand, CommandError
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+
+from dogs.benchmark import SCALES, compare_with_baseline, get_routes, measure_route, seed
+from dogs.models import Category, Dog
+from reviews.models import Review
+from users.models import User, UserRoles
+
+BENCH_SETTINGS = {
+    'DEBUG': False,
+    'ALLOWED_HOSTS': ['testserver'],
+    'QUERY_BUDGET_STRICT': False,
+    # Отдельный кеш процесса: замер не читает и не портит кеш рабочего сервера (Redis)
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'bench'}},
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+}
+
+
+class Command(BaseCommand):
+    """
+    Замеряет все именованные маршруты dogs, reviews и users на заполненной базе.
+
+    Замер идет в отдельной тестовой базе (как у manage.py test): она создается, заполняется
+    объемом --scale (или --users/--categories/--dogs/--reviews) и удаляется после замера;
+    с --keepdb база с данными сохраняется и при следующем запуске только дополняется.
+    Каждый маршрут запрашивается тестовым клиентом от имени суперпользователя, по каждому
+    выводятся p50/p95/p99, число SQL-запросов, размер ответа и пиковая память в JSON.
+    С --baseline отчет сравнивается с сохраненным и команда завершается ошибкой при регрессиях.
+    """
+
+    help = 'Замеряет время ответа, SQL-запросы и память всех маршрутов на заполненной базе'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Объем данных')
+        for name in ('users', 'categories', 'dogs', 'reviews'):
+            parser.add_argument(f'--{name}', type=int, help=f'Количество ({name}) вместо значения из --scale')
+        parser.add_argument('--iterations', type=int, default=20, help='Замеряемых запросов на маршрут')
+        parser.add_argument('--warmup', type=int, default=2, help='Запросов прогрева на маршрут')
+        parser.add_argument('--routes', nargs='+', help='Замерить только эти маршруты (dogs:list_dogs ...)')
+        parser.add_argument('--batch-size', type=int, default=5000, help='Строк в одном INSERT при заполнении')
+        parser.add_argument('--keepdb', action='store_true', help='Сохранить тестовую базу с данными')
+        parser.add_argument('--output', help='Файл для отчета JSON (по умолчанию стандартный вывод)')
+        parser.add_argument('--baseline', help='Базовый отчет для сравнения')
+        parser.add_argument('--threshold', type=float, default=0.2, help='Допустимый рост p95 и памяти (0.2 = 20%%)')
+
+    def handle(self, *args, **options):
+        volumes = {name: options[name] if options[name] is not None else value
+                   for name, value in SCALES[options['scale']].items()}
+        if min(volumes['users'], volumes['categories'], volumes['dogs'], volumes['reviews']) < 1:
+            raise CommandError('Нужны хотя бы один пользователь, порода, собака и отзыв')
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as file:
+                baseline = json.load(file)
+
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'])
+        try:
+            with override_settings(**BENCH_SETTINGS):
+                report = self.run(volumes, options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
+
+        if baseline is not None:
+            regressions = compare_with_baseline(report, baseline, options['threshold'])
+            if regressions:
+                raise CommandError('Регрессии относительно базового отчета:\n' + '\n'.join(regressions))
+            print('Регрессий относительно базового отчета нет', file=sys.stderr)
+
+    def run(self, volumes, options):
+        """Заполняет базу и замеряет маршруты. Возвращает отчет."""
+        created = seed(batch_size=options['batch_size'], **volumes)
+        user, _ = User.objects.get_or_create(email='bench-admin@bench.local', defaults={
+            'role': UserRoles.ADMIN, 'is_staff': True, 'is_superuser': True,
+        })
+        samples = {
+            'dog': Dog.active.order_by('pk').first(),
+            'category': Category.objects.order_by('pk').first(),
+            'review': Review.published.order_by('pk').first(),
+            'user': User.objects.order_by('pk').first(),
+        }
+        routes, skipped = get_routes(samples)
+        if options['routes']:
+            unknown = set(options['routes']) - set(routes) - set(skipped)
+            if unknown:
+                raise CommandError(f'Неизвестные маршруты: {", ".join(sorted(unknown))}')
+            routes = {name: url for name, url in routes.items() if name in options['routes']}
+
+        client = Client()
+        client.force_login(user)
+        results = {}
+        for name, url in routes.items():
+            results[name] = {'url': url, **measure_route(client, url, options['iterations'], options['warmup'])}
+            print(f'{name}: p50 {results[name]["p50_ms"]} мс', file=sys.stderr)
+
+        return {
+            'dataset': {
+                'users': User.objects.count(), 'categories': Category.objects.count(),
+                'dogs': Dog.objects.count(), 'reviews': Review.objects.count(), 'created': created,
+            },
+            'iterations': options['iterations'],
+            'routes': results,
+            'skipped': skipped,
+        }
@@ -0,0 +1,173 @@
+import asyncio
+import json
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management import BaseCommand, CommandError
+from django.test import AsyncClient, Client, override_settings
+from django.urls import reverse
+
+from dogs.models import Category, Dog
+from dogs.utils import use_async_views
+from reviews.models import Review
+from users.models import User
+
+
+def get_bench_urls():
+    """
+    Возвращает адреса страниц для чтения, у которых есть асинхронный вариант.
+
+    Returns:
+        list: Адреса главной, пород, списков и страниц собаки, отзыва и пользователя (если есть данные).
+    """
+    urls = [reverse('dogs:index'), reverse('dogs:categories'), reverse('dogs:list_dogs'),
+            reverse('reviews:list_reviews')]
+    dog_pk = Dog.active.values_list('pk', flat=True).first()
+    if dog_pk:
+        urls.append(reverse('dogs:detail_dog', args=[dog_pk]))
+    slug = Review.published.values_list('slug', flat=True).first()
+    if slug:
+        urls.append(reverse('reviews:detail_review', args=[slug]))
+    user_pk = User.objects.filter(is_active=True).values_list('pk', flat=True).first()
+    if user_pk:
+        urls.append(reverse('users:profile_user_view', args=[user_pk]))
+    return urls
+
+
+def summarize(latencies, errors, elapsed, threads):
+    """
+    Сводит результаты прогона.
+
+    Args:
+        latencies (list): Время ответов, сек.
+        errors (int): Количество ответов с кодом 400 и выше.
+        elapsed (float): Длительность прогона, сек.
+        threads (int): Наибольшее число потоков процесса во время прогона.
+
+    Returns:
+        dict: Запросов в секунду, p50/p95/p99 в мс, ошибки и потоки.
+    """
+    quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else latencies * 99
+    return {
+        'requests': len(latencies),
+        'rps': round(len(latencies) / elapsed, 1),
+        'p50_ms': round(quantiles[49] * 1000, 2),
+        'p95_ms': round(quantiles[94] * 1000, 2),
+        'p99_ms': round(quantiles[98] * 1000, 2),
+        'errors': errors,
+        'peak_threads': threads,
+    }
+
+
+class ThreadPeak:
+    """Контекстный менеджер, замеряющий наибольшее число потоков процесса."""
+
+    def __init__(self):
+        self.peak = threading.active_count()
+        self._done = threading.Event()
+
+    def _watch(self):
+        while not self._done.wait(0.005):
+            self.peak = max(self.peak, threading.active_count())
+
+    def __enter__(self):
+        self._watcher = threading.Thread(target=self._watch, daemon=True)
+        self._watcher.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._done.set()
+        self._watcher.join()
+        self.peak -= 1  # Сам поток замера не считается
+
+
+class Command(BaseCommand):
+    """
+    Сравнивает синхронный (WSGI) и асинхронный (ASGI) путь запросов к страницам для чтения.
+
+    Одни и те же адреса запрашиваются --requests раз с --concurrency одновременными запросами:
+    синхронные представления через тестовый клиент WSGI в пуле потоков, асинхронные через
+    AsyncClient (ASGIHandler) в одном цикле событий. Для каждого пути выводятся запросы
+    в секунду, p50/p95/p99 и наибольшее число потоков процесса. Запускается на рабочей базе
+    с данными; страницы запрашиваются от имени --email (по умолчанию первого активного пользователя).
+    """
+
+    help = 'Сравнивает синхронные и асинхронные представления для чтения под нагрузкой'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--requests', type=int, default=200, help='Запросов на каждый путь')
+        parser.add_argument('--concurrency', type=int, default=20, help='Одновременных запросов')
+        parser.add_argument('--email', help='Пользователь, от имени которого запрашиваются страницы')
+        parser.add_argument('--json', action='store_true', help='Вывести результат в JSON')
+
+    def handle(self, *args, **options):
+        users = User.objects.filter(is_active=True)
+        user = users.filter(email=options['email']).first() if options['email'] else users.order_by('pk').first()
+        if user is None:
+            raise CommandError('Нет активного пользователя для входа: создайте его или укажите --email')
+        if not Category.objects.exists():
+            raise CommandError('В базе нет данных для страниц: заполните ее перед замером')
+
+        login = Client()
+        login.force_login(user)
+        cookies = login.cookies
+        total, concurrency = options['requests'], options['concurrency']
+
+        with override_settings(ALLOWED_HOSTS=['testserver'], QUERY_BUDGET_STRICT=False):
+            try:
+                use_async_views(False)
+                urls = get_bench_urls()
+                results = {'wsgi': self.run_sync(urls, cookies, total, concurrency)}
+                use_async_views(True)
+                results['asgi'] = asyncio.run(self.run_async(urls, cookies, total, concurrency))
+            finally:
+                use_async_views(False)
+
+        if options['json']:
+            self.stdout.write(json.dumps({'urls': urls, 'concurrency': concurrency, **results}, indent=2))
+            return
+        self.stdout.write(f'Страниц: {len(urls)}, запросов: {total}, одновременно: {concurrency}')
+        for name, result in results.items():
+            self.stdout.write(
+                f'{name}: {result["rps"]} запр/с, p50 {result["p50_ms"]} мс, p95 {result["p95_ms"]} мс, '
+                f'p99 {result["p99_ms"]} мс, ошибок {result["errors"]}, потоков {result["peak_threads"]}'
+            )
+
+    def run_sync(self, urls, cookies, total, concurrency):
+        """Запрашивает страницы синхронными представлениями из пула потоков."""
+        local = threading.local()
+
+        def fetch(index):
+            if not hasattr(local, 'client'):
+                local.client = Client(raise_request_exception=False)
+                local.client.cookies = cookies
+            started = time.perf_counter()
+            response = local.client.get(urls[index % len(urls)])
+            return time.perf_counter() - started, response.status_code >= 400
+
+        with ThreadPeak() as threads:
+            started = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                samples = list(executor.map(fetch, range(total)))
+            elapsed = time.perf_counter() - started
+        return summarize([latency for latency, _ in samples], sum(error for _, error in samples), elapsed, threads.peak)
+
+    async def run_async(self, urls, cookies, total, concurrency):
+        """Запрашивает страницы асинхронными представлениями из одного цикла событий."""
+        client = AsyncClient(raise_request_exception=False)
+        client.cookies = cookies
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def fetch(index):
+            async with semaphore:
+                started = time.perf_counter()
+                response = await client.get(urls[index % len(urls)])
+                return time.perf_counter() - started, response.status_code >= 400
+
+        with ThreadPeak() as threads:
+            started = time.perf_counter()
+            samples = await asyncio.gather(*(fetch(index) for index in range(total)))
+            elapsed = time.perf_counter() - started
+        return summarize([latency for latency, _ in samples], sum(error for _, error in samples), elapsed, threads.peak)
@@ -0,0 +1,105 @@
+import os
+import shutil
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.files import File
+from django.core.management import BaseCommand
+from django.db import transaction
+from django.db.models import Count
+
+from dogs.images import delete_variants, generate_variants, mark_variants_ready
+from dogs.models import Dog, MediaFile
+from dogs.storage import content_addressed_name, content_hash
+from users.models import User
+
+# Каталог внутри MEDIA_ROOT -> (модель, поле изображения)
+MEDIA_DIRECTORIES = {
+    'dogs': (Dog, 'photo'),
+    'users': (User, 'avatar'),
+}
+
+
+class Command(BaseCommand):
+    """
+    Переносит уже загруженные фото и аватары в хранилище по хешу содержимого.
+
+    Каждый файл из MEDIA_ROOT/dogs и MEDIA_ROOT/users переименовывается в
+    <каталог>/<xx>/<sha256>.<расширение>; байт-в-байт одинаковые файлы (например,
+    GERMAN_OVCHARKA.jpg и GERMAN_OVCHARKA_m1MtlFD.jpg) сводятся к одному. Ссылки в
+    Dog.photo и User.avatar обновляются, счетчики ссылок MediaFile пересчитываются.
+    """
+
+    help = 'Удаляет дубликаты фото и аватаров, перенося их в хранилище по хешу содержимого'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--dry-run', action='store_true', help='Только показать, что будет сделано')
+
+    def handle(self, *args, **options):
+        targets = defaultdict(list)  # Новое имя -> старые имена с тем же содержимым
+        saved_bytes = 0
+
+        for directory in MEDIA_DIRECTORIES:
+            path = os.path.join(settings.MEDIA_ROOT, directory)
+            if not os.path.isdir(path):
+                continue
+            for filename in sorted(os.listdir(path)):
+                source = os.path.join(path, filename)
+                if not os.path.isfile(source):
+                    continue  # Подкаталоги: уже перенесенные файлы и уменьшенные копии
+                with open(source, 'rb') as file:
+                    digest = content_hash(File(file))
+                new_name = content_addressed_name(directory, digest, os.path.splitext(filename)[1])
+                if targets[new_name] or os.path.exists(os.path.join(settings.MEDIA_ROOT, new_name)):
+                    saved_bytes += os.path.getsize(source)
+                    print(f'{directory}/{filename}: дубликат {new_name}')
+                targets[new_name].append(f'{directory}/{filename}')
+
+        if options['dry_run']:
+            print(f'Файлов: {sum(map(len, targets.values()))}, уникальных: {len(targets)}, '
+                  f'освободится байт: {saved_bytes}')
+            return
+
+        for new_name, old_names in targets.items():  # Сначала копии под хешем, оригиналы пока на месте
+            target = os.path.join(settings.MEDIA_ROOT, new_name)
+            if not os.path.exists(target):
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                shutil.copy2(os.path.join(settings.MEDIA_ROOT, old_names[0]), target)
+
+        with transaction.atomic():
+            for directory, (model, field) in MEDIA_DIRECTORIES.items():
+                for new_name, old_names in targets.items():
+                    if new_name.startswith(f'{directory}/'):
+                        model.objects.filter(**{f'{field}__in': old_names}).update(**{field: new_name})
+            self.recount()
+
+        for new_name, old_names in targets.items():  # Ссылки обновлены - старые файлы больше не нужны
+            for old_name in old_names:
+                os.remove(os.path.join(settings.MEDIA_ROOT, old_name))
+                delete_variants(old_name)
+            generate_variants(new_name)
+        mark_variants_ready(list(targets))
+
+        print(f'Файлов: {sum(map(len, targets.values()))}, уникальных: {len(targets)}, '
+              f'освобождено байт: {saved_bytes}')
+
+    @staticmethod
+    def recount():
+        """Пересчитывает счетчики ссылок MediaFile по фактическим значениям Dog.photo и User.avatar."""
+        counts = defaultdict(int)
+        for model, field in MEDIA_DIRECTORIES.values():
+            rows = model.objects.exclude(**{field: ''}).exclude(**{f'{field}__isnull': True}) \
+                .values(field).annotate(references=Count('pk'))
+            for row in rows:
+                counts[row[field]] += row['references']
+
+        MediaFile.objects.exclude(name__in=counts).delete()
+        existing = set(MediaFile.objects.values_list('name', flat=True))
+        MediaFile.objects.bulk_create(
+            [MediaFile(name=name, refcount=count, size=os.path.getsize(os.path.join(settings.MEDIA_ROOT, name))
+                       if os.path.exists(os.path.join(settings.MEDIA_ROOT, name)) else 0)
+             for name, count in counts.items() if name not in existing]
+        )
+        for name, count in counts.items():
+            if name in existing:
+                MediaFile.objects.filter(name=name).update(refcount=count)
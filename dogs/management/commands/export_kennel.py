@@ -0,0 +1,53 @@
+import itertools
+import os
+import sys
+import time
+
+from django.core.management import BaseCommand, CommandError
+
+from dogs.transfer import FORMATS, KENNEL_MODELS, get_kennel_model, iter_export_records, write_records
+
+
+class Command(BaseCommand):
+    """
+    Потоковый экспорт данных питомника в JSON-массив (формат dumpdata), JSON Lines или CSV.
+
+    Строки читаются из базы итератором пачками по --batch-size и сразу пишутся в файл,
+    поэтому расход памяти не зависит от размера таблиц. Модели выгружаются в порядке
+    зависимостей, и файл можно загрузить обратно командой import_kennel или loaddata.
+    """
+
+    help = 'Экспортирует данные питомника в JSON, JSONL или CSV'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл для экспорта, '-' - стандартный вывод")
+        parser.add_argument('--format', choices=FORMATS, help='Формат файла (по умолчанию по расширению)')
+        parser.add_argument('--models', nargs='+', default=list(KENNEL_MODELS),
+                            help='Модели для экспорта (для CSV - одна модель)')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество строк, читаемых за раз')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in FORMATS:
+            raise CommandError(f'Укажите --format: {", ".join(FORMATS)}')
+        try:
+            models = [get_kennel_model(label) for label in options['models']]
+        except ValueError as ex:
+            raise CommandError(ex)
+        if file_format == 'csv' and len(models) != 1:
+            raise CommandError('В CSV-файл выгружается одна модель: укажите --models <модель>')
+        models.sort(key=lambda model: KENNEL_MODELS.index(model._meta.label_lower))
+
+        started = time.monotonic()
+        records = itertools.chain.from_iterable(iter_export_records(model, options['batch_size']) for model in models)
+        file = sys.stdout if path == '-' else open(path, 'w', encoding='utf-8', newline='')
+        try:
+            count = write_records(records, file, file_format, models[0])
+        finally:
+            if file is not sys.stdout:
+                file.close()
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        print(f'Выгружено строк: {count}, {count / elapsed:.0f} строк/с',
+              file=sys.stderr if path == '-' else sys.stdout)
@@ -0,0 +1,24 @@
+from django.core.management import BaseCommand, CommandError
+
+from dogs.caching import cache_is_process_local
+from dogs.services import flush_dog_views
+
+
+class Command(BaseCommand):
+    """
+    Записывает накопленные в кеше просмотры собак в базу данных.
+
+    Предназначена для запуска по расписанию (cron), чтобы просмотры собак,
+    не набравшие порога DOG_VIEWS_FLUSH_THRESHOLD, тоже попадали в базу.
+    С кешем в памяти процесса (без CACHE_LOCATION) команда завершается ошибкой:
+    она запускается отдельным процессом и не видит счетчики процессов сервера.
+    """
+
+    help = 'Записывает накопленные в кеше просмотры собак в базу данных'
+
+    def handle(self, *args, **options):
+        if cache_is_process_local():
+            raise CommandError('Кеш в памяти процесса: счетчики просмотров процессов сервера команде не видны. '
+                               'Укажите общий кеш в CACHE_LOCATION (Redis)')
+        flushed = flush_dog_views()
+        print(f'Записано просмотров: {flushed}')
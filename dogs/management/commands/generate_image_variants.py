@@ -0,0 +1,95 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from django.conf import settings
+from django.core.management import BaseCommand
+
+from dogs.images import VARIANTS_DIR, generate_pending_variants, generate_variants, mark_variants_ready
+
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
+
+
+def _generate(name, overwrite):
+    """Создает копии одного изображения в дочернем процессе."""
+    import django
+    django.setup()  # Дочерний процесс (spawn) должен сам инициализировать Django
+    return name, generate_variants(name, overwrite=overwrite)
+
+
+def find_images(directory):
+    """
+    Находит изображения в каталоге MEDIA_ROOT/directory и всех его подкаталогах.
+
+    Хранилище по хешу содержимого (dogs.storage) раскладывает файлы по подкаталогам
+    'dogs/ab/...', поэтому каталог обходится рекурсивно; каталоги копий (VARIANTS_DIR) пропускаются.
+
+    Args:
+        directory (str): Каталог внутри MEDIA_ROOT.
+
+    Returns:
+        list: Имена изображений в хранилище, например 'dogs/ab/abcdef....jpg'.
+    """
+    root = os.path.join(settings.MEDIA_ROOT, directory)
+    names = []
+    for path, subdirectories, filenames in os.walk(root):
+        subdirectories[:] = sorted(name for name in subdirectories if name != VARIANTS_DIR)
+        relative = os.path.relpath(path, settings.MEDIA_ROOT).replace(os.sep, '/')
+        names += [f'{relative}/{filename}' for filename in sorted(filenames)
+                  if filename.lower().endswith(IMAGE_EXTENSIONS)]
+    return names
+
+
+class Command(BaseCommand):
+    """
+    Создает уменьшенные копии для уже загруженных фото собак и аватаров.
+
+    Изображения из MEDIA_ROOT/dogs и MEDIA_ROOT/users (со всеми подкаталогами) обрабатываются параллельно
+    в пуле процессов; уже созданные копии пропускаются (если не указан --overwrite).
+
+    С --pending создает копии только новых загрузок (MediaFile.has_variants = False) и завершается,
+    а с --loop работает постоянно и опрашивает очередь каждые --interval секунд. Загрузка фото
+    не создает копии сама, поэтому команду с --pending нужно запускать по расписанию или с --loop.
+    """
+
+    help = 'Создает уменьшенные копии изображений в media/dogs и media/users'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workers', type=int, default=os.cpu_count(), help='Количество процессов')
+        parser.add_argument('--overwrite', action='store_true', help='Пересоздать существующие копии')
+        parser.add_argument('directories', nargs='*', default=['dogs', 'users'], help='Каталоги внутри MEDIA_ROOT')
+        parser.add_argument('--pending', action='store_true', help='Обработать только новые загрузки')
+        parser.add_argument('--loop', action='store_true', help='С --pending: работать постоянно')
+        parser.add_argument('--interval', type=float, default=5, help='Пауза между опросами очереди, сек.')
+
+    def handle(self, *args, **options):
+        if options['pending']:
+            while True:
+                processed = generate_pending_variants()
+                if processed:
+                    print(f'Обработано изображений: {processed}')
+                elif not options['loop']:
+                    return
+                else:
+                    time.sleep(options['interval'])  # Очередь пуста - ждем новых загрузок
+
+        names = []
+        for directory in options['directories']:
+            names += find_images(directory)
+
+        created = errors = 0
+        ready = []
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {executor.submit(_generate, name, options['overwrite']): name for name in names}
+            for future in as_completed(futures):
+                try:
+                    name, variants = future.result()
+                except Exception as ex:
+                    errors += 1
+                    print(f'{futures[future]}: ошибка {ex!r}')
+                else:
+                    created += len(variants)
+                    ready.append(name)
+        mark_variants_ready(ready)  # Файлы, учтенные в MediaFile, шаблоны начнут выводить копиями
+
+        print(f'Изображений: {len(names)}, создано копий: {created}, ошибок: {errors}')
@@ -0,0 +1,55 @@
+import os
+import sys
+
+from django.core.management import BaseCommand, CommandError
+
+from dogs.transfer import FORMATS, KennelImporter, get_kennel_model, read_records
+
+
+class Command(BaseCommand):
+    """
+    Потоковый импорт данных питомника (пород, собак, родителей, отзывов, пользователей).
+
+    Понимает фикстуры dumpdata и файлы export_kennel: JSON-массив, JSON Lines и CSV
+    одной модели (--model). Файл читается по одной записи, строки записываются пачками
+    bulk_create/bulk_update, поэтому расход памяти не зависит от размера файла.
+    Фото и аватары не копируются: после переноса каталога media выполните dedupe_media.
+    """
+
+    help = 'Импортирует данные питомника из JSON, JSONL или CSV пачками'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Файл для импорта, '-' - стандартный ввод")
+        parser.add_argument('--format', choices=FORMATS, help='Формат файла (по умолчанию по расширению)')
+        parser.add_argument('--model', help='Модель строк CSV-файла, например dogs.dog')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество строк в пачке')
+        parser.add_argument('--no-index', action='store_true', help='Не обновлять поисковый индекс')
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or os.path.splitext(path)[1].lstrip('.').lower()
+        if file_format not in FORMATS:
+            raise CommandError(f'Укажите --format: {", ".join(FORMATS)}')
+        try:
+            model = get_kennel_model(options['model']) if options['model'] else None
+        except ValueError as ex:
+            raise CommandError(ex)
+        if file_format == 'csv' and model is None:
+            raise CommandError('Для CSV укажите --model')
+
+        importer = KennelImporter(options['batch_size'], index=not options['no_index'], progress=print)
+        file = sys.stdin if path == '-' else open(path, encoding='utf-8', newline='')
+        try:
+            for record in read_records(file, file_format, model):
+                importer.add(record)
+            stats = importer.finish()
+        except ValueError as ex:
+            raise CommandError(ex)
+        finally:
+            if file is not sys.stdin:
+                file.close()
+
+        for label, counts in stats.items():
+            print(f'{label}: создано {counts["created"]}, обновлено {counts["updated"]}, '
+                  f'пропущено {counts["skipped"]}, без необязательной ссылки {counts["detached"]}')
+        importer.report()
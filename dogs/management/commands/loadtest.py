@@ -0,0 +1,225 @@
+import json
+import multiprocessing
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management import BaseCommand, CommandError
+from django.core.servers.basehttp import ThreadedWSGIServer, WSGIRequestHandler
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import setup_databases, teardown_databases
+from django.urls import reverse
+
+from dogs.benchmark import SCALES, seed
+from dogs.loadtest import SCENARIOS, parse_mix, run_virtual_users, summarize
+from dogs.models import Dog
+from dogs.services import flush_dog_views
+from reviews.models import Review
+from users.models import OutgoingEmail, User
+
+PK_PLACEHOLDER = 987654321  # pk, заменяемый в адресе на {pk}
+LOADTEST_SETTINGS = {
+    'DEBUG': False,
+    'ALLOWED_HOSTS': ['127.0.0.1', 'testserver'],
+    'QUERY_BUDGET_STRICT': False,
+    # Отдельный кеш процесса: нагрузка не читает и не портит кеш рабочего сервера (Redis).
+    # Сервер работает в этом же процессе, поэтому с DOG_VIEWS_WRITE_BEHIND счетчики просмотров
+    # видны flush_dog_views; MAX_ENTRIES с запасом, чтобы страницы не вытесняли счетчики
+    'CACHES': {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'loadtest',
+                           'OPTIONS': {'MAX_ENTRIES': 1_000_000}}},
+    'EMAIL_BACKEND': 'django.core.mail.backends.locmem.EmailBackend',
+}
+
+
+class QuietRequestHandler(WSGIRequestHandler):
+    """Обработчик запросов, не печатающий строку на каждый запрос."""
+
+    def log_message(self, format, *args):
+        pass
+
+
+class LoadTestServer(ThreadedWSGIServer):
+    """Многопоточный WSGI-сервер Django (поток на соединение) с настраиваемой очередью подключений."""
+
+    request_queue_size = 128
+
+
+class Command(BaseCommand):
+    """
+    Нагрузочный тест: смесь сценариев против config.wsgi.application на локальном многопоточном сервере.
+
+    В отдельной тестовой базе (как у bench) создаются данные объема --scale, сервер Django
+    (ThreadedWSGIServer, поток на соединение) запускается на 127.0.0.1, и --vus виртуальных
+    пользователей в течение --duration секунд выполняют сценарии browse, search, detail,
+    post_review и toggle с весами --mix. Клиенты работают в потоках этого процесса или,
+    с --processes, в отдельных процессах, чтобы не делить GIL с сервером. Внешние сервисы
+    не нужны: кеш и почта подменяются на локальные.
+
+    Отчет JSON содержит по каждому сценарию пропускную способность, долю ошибок, p50/p95/p99
+    и гистограмму времени ответа, а также проверку согласованности: сколько просмотров
+    и отзывов записано в базу относительно успешных запросов и сколько писем о юбилейных
+    (каждом 20-м) просмотрах поставлено в очередь относительно ожидаемого. lost_views - успешные
+    просмотры, не дошедшие до базы (должно быть 0).
+    """
+
+    help = 'Нагрузочный тест WSGI-приложения смесью сценариев на локальном сервере'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--scale', choices=SCALES, default='small', help='Объем данных')
+        for name in ('users', 'categories', 'dogs', 'reviews'):
+            parser.add_argument(f'--{name}', type=int, help=f'Количество ({name}) вместо значения из --scale')
+        parser.add_argument('--vus', type=int, default=16, help='Виртуальных пользователей (одновременных клиентов)')
+        parser.add_argument('--duration', type=float, default=30, help='Длительность нагрузки, сек.')
+        parser.add_argument('--processes', type=int, default=0,
+                            help='Процессов клиентов (0 - клиенты в потоках этого процесса)')
+        parser.add_argument('--mix', default=','.join(f'{name}={weight}' for name, weight in SCENARIOS.items()),
+                            help='Веса сценариев: browse=40,search=15,detail=30,post_review=10,toggle=5')
+        parser.add_argument('--hot-dogs', type=int, default=10,
+                            help='Популярных собак, на которых приходится большая часть просмотров')
+        parser.add_argument('--port', type=int, default=0, help='Порт сервера (0 - любой свободный)')
+        parser.add_argument('--keepdb', action='store_true', help='Сохранить тестовую базу с данными')
+        parser.add_argument('--output', help='Файл для отчета JSON (по умолчанию стандартный вывод)')
+
+    def handle(self, *args, **options):
+        try:
+            mix = parse_mix(options['mix'])
+        except ValueError as ex:
+            raise CommandError(ex)
+        volumes = {name: options[name] if options[name] is not None else value
+                   for name, value in SCALES[options['scale']].items()}
+        if volumes['users'] < options['vus'] + 1 or volumes['dogs'] < volumes['users']:
+            raise CommandError('Нужно больше пользователей, чем --vus, и не меньше собак, чем пользователей')
+
+        # Тестовая база SQLite по умолчанию в памяти, а потокам сервера нужен общий файл
+        test_settings = connection.settings_dict['TEST']
+        database_file = None
+        if connection.vendor == 'sqlite' and not test_settings.get('NAME'):
+            database_file = tempfile.NamedTemporaryFile(prefix='loadtest-', suffix='.sqlite3', delete=False).name
+            test_settings['NAME'] = database_file
+
+        old_config = setup_databases(verbosity=0, interactive=False, keepdb=options['keepdb'] or bool(database_file))
+        try:
+            with override_settings(**LOADTEST_SETTINGS):
+                report = self.run(volumes, mix, options)
+        finally:
+            teardown_databases(old_config, verbosity=0, keepdb=options['keepdb'])
+            if database_file:
+                test_settings['NAME'] = None
+
+        content = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as file:
+                file.write(content)
+        else:
+            self.stdout.write(content)
+
+    def prepare(self, vus, hot_dogs):
+        """
+        Готовит сеансы виртуальных пользователей и адреса запросов.
+
+        Пользователи просматривают только чужих собак, поэтому каждый успешный просмотр
+        должен попасть в счетчик (просмотры владельца не считаются).
+
+        Returns:
+            tuple: (сеансы, план запросов).
+        """
+        users = list(User.objects.filter(email__endswith='@bench.local', dog__isnull=False)
+                     .distinct().order_by('pk')[:vus])
+        client = Client()
+        sessions = []
+        for user in users:
+            client.force_login(user)
+            client.get(reverse('dogs:index'))  # Страница с формой выхода выдает cookie csrftoken
+            sessions.append({
+                'sessionid': client.cookies['sessionid'].value,
+                'csrftoken': client.cookies['csrftoken'].value,
+                'dogs': list(Dog.objects.filter(owner=user).order_by('pk').values_list('pk', flat=True)[:20]),
+            })
+            client.cookies.clear()
+
+        dogs = list(Dog.active.exclude(owner__in=users).order_by('?').values_list('pk', flat=True)[:1000])
+        if not dogs:
+            raise CommandError('Нет активных собак других владельцев для сценария detail')
+
+        def pattern(name):
+            return reverse(name, args=[PK_PLACEHOLDER]).replace(str(PK_PLACEHOLDER), '{pk}')
+
+        plan = {
+            'urls': {
+                'index': reverse('dogs:index'), 'dogs': reverse('dogs:list_dogs'),
+                'reviews': reverse('reviews:list_reviews'), 'search_dogs': reverse('dogs:search_dogs'),
+                'search_reviews': reverse('reviews:search_reviews'), 'detail_dog': pattern('dogs:detail_dog'),
+                'create_review': reverse('reviews:create_review'), 'toggle_dog': pattern('dogs:toggle_activity_dog'),
+            },
+            'dogs': dogs,
+            'hot_dogs': dogs[:hot_dogs],
+        }
+        return sessions, plan
+
+    def get_state(self):
+        """Записанные просмотры, отзывы и письма о юбилейных просмотрах - для проверки согласованности."""
+        flush_dog_views()  # Просмотры из кеша записываются в базу
+        return {
+            'views': dict(Dog.objects.filter(views__gt=0).values_list('pk', 'views')),
+            'reviews': Review.objects.count(),
+            'emails': OutgoingEmail.objects.filter(subject__contains='просмотров').count(),
+        }
+
+    def run(self, volumes, mix, options):
+        """Заполняет базу, запускает сервер и нагрузку. Возвращает отчет."""
+        seed(**volumes)
+        sessions, plan = self.prepare(options['vus'], options['hot_dogs'])
+        before = self.get_state()
+
+        from config.wsgi import application  # Настоящее WSGI-приложение со всеми middleware
+
+        server = LoadTestServer(('127.0.0.1', options['port']), QuietRequestHandler)
+        server.set_app(application)
+        server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+        server_thread.start()
+        base_url = f'http://127.0.0.1:{server.server_address[1]}'
+        print(f'Сервер {base_url}, пользователей: {len(sessions)}, нагрузка {options["duration"]} с',
+              file=sys.stderr)
+
+        started = time.time()
+        deadline = started + options['duration']
+        try:
+            if options['processes']:
+                chunks = [sessions[index::options['processes']] for index in range(options['processes'])]
+                context = multiprocessing.get_context('spawn')  # fork процесса с потоками сервера небезопасен
+                with ProcessPoolExecutor(len(chunks), mp_context=context) as executor:
+                    futures = [executor.submit(run_virtual_users, base_url, plan, chunk, mix, deadline, index)
+                               for index, chunk in enumerate(chunks) if chunk]
+                    samples = [sample for future in futures for sample in future.result()]
+            else:
+                samples = run_virtual_users(base_url, plan, sessions, mix, deadline)
+            elapsed = time.time() - started
+        finally:
+            server.shutdown()
+            server.server_close()
+
+        after = self.get_state()
+        ok = {name: sum(1 for scenario, _, success in samples if scenario == name and success) for name in SCENARIOS}
+        views_before, views_after = before['views'], after['views']
+        views_recorded = sum(views_after.values()) - sum(views_before.values())
+        milestones = sum(views // 20 - views_before.get(pk, 0) // 20 for pk, views in views_after.items())
+        return {
+            'dataset': volumes,
+            'vus': len(sessions),
+            'processes': options['processes'],
+            'duration_s': round(elapsed, 2),
+            'mix': mix,
+            'scenarios': summarize(samples, elapsed),
+            'consistency': {
+                'detail_ok': ok['detail'],
+                'views_recorded': views_recorded,
+                'lost_views': ok['detail'] - views_recorded,
+                'post_review_ok': ok['post_review'],
+                'reviews_created': after['reviews'] - before['reviews'],
+                'milestone_emails': after['emails'] - before['emails'],
+                'milestones_expected': milestones,
+            },
+        }
@@ -0,0 +1,23 @@
+from django.core.management import BaseCommand
+
+from dogs.caching import bump_model_version
+from dogs.counters import recount_counters
+from dogs.services import invalidate_categories_cache
+
+
+class Command(BaseCommand):
+    """
+    Пересчитывает денормализованные счетчики пород и собак по фактическим данным.
+
+    Счетчики поддерживаются сигналами, но могут разойтись с данными после массовых
+    изменений в обход ORM (SQL вручную, загрузка фикстур с raw-сохранением).
+    """
+
+    help = 'Пересчитывает Category.dog_count/active_dog_count и Dog.review_count/active_review_count'
+
+    def handle(self, *args, **options):
+        fixed = recount_counters()
+        for label, drift in fixed.items():
+            print(f'{label}: исправлено строк {drift}')
+            bump_model_version(label)
+        invalidate_categories_cache()
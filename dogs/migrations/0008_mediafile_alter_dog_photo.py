@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:11
+
+import dogs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0007_dog_views'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MediaFile',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=255, unique=True, verbose_name='file')),
+                ('refcount', models.IntegerField(default=1, verbose_name='references')),
+                ('size', models.PositiveBigIntegerField(default=0, verbose_name='size')),
+            ],
+            options={
+                'verbose_name': 'media file',
+                'verbose_name_plural': 'media files',
+            },
+        ),
+        migrations.AlterField(
+            model_name='dog',
+            name='photo',
+            field=models.ImageField(blank=True, null=True, storage=dogs.storage.get_media_storage, upload_to='dogs/', verbose_name='image'),
+        ),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:20
+
+from django.db import migrations, models
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+
+def fill_counters(apps, schema_editor):
+    """Заполняет счетчики по уже существующим собакам и отзывам."""
+    Category = apps.get_model('dogs', 'Category')
+    Dog = apps.get_model('dogs', 'Dog')
+    Review = apps.get_model('reviews', 'Review')
+
+    def count(model, parent_field, condition=Q()):
+        subquery = model.objects.filter(condition, **{parent_field: OuterRef('pk')}) \
+            .order_by().values(parent_field).annotate(count=Count('pk')).values('count')
+        return Coalesce(Subquery(subquery, output_field=IntegerField()), Value(0))
+
+    Category.objects.update(
+        dog_count=count(Dog, 'category'), active_dog_count=count(Dog, 'category', Q(is_active=True))
+    )
+    Dog.objects.update(
+        review_count=count(Review, 'dog'), active_review_count=count(Review, 'dog', Q(sign_of_review=True))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0008_mediafile_alter_dog_photo'),
+        ('reviews', '0002_review_delete_reviews'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='category',
+            name='active_dog_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='active dogs'),
+        ),
+        migrations.AddField(
+            model_name='category',
+            name='dog_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='dogs'),
+        ),
+        migrations.AddField(
+            model_name='dog',
+            name='active_review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='активные отзывы'),
+        ),
+        migrations.AddField(
+            model_name='dog',
+            name='review_count',
+            field=models.IntegerField(default=0, editable=False, verbose_name='отзывы'),
+        ),
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0009_counters'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(condition=models.Q(('is_active', True)), fields=['name', 'id'], name='dog_active_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['name', 'id'], name='dog_inactive_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(condition=models.Q(('is_active', False)), fields=['owner', 'name', 'id'], name='dog_inactive_owner_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='dog',
+            index=models.Index(fields=['category', 'name', 'id'], name='dog_category_name_idx'),
+        ),
+    ]
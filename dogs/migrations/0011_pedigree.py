@@ -0,0 +1,34 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:37
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0010_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='parent',
+            name='parent_dog',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='offspring_links', to='dogs.dog', verbose_name='kennel dog'),
+        ),
+        migrations.CreateModel(
+            name='Ancestry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('depth', models.PositiveSmallIntegerField(verbose_name='generation')),
+                ('ancestor', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='descendant_links', to='dogs.dog')),
+                ('descendant', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='ancestor_links', to='dogs.dog')),
+            ],
+            options={
+                'verbose_name': 'ancestry',
+                'verbose_name_plural': 'ancestry',
+                'indexes': [models.Index(fields=['ancestor', 'depth'], name='ancestry_ancestor_idx')],
+                'constraints': [models.UniqueConstraint(fields=('descendant', 'depth', 'ancestor'), name='ancestry_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:01
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0011_pedigree'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PendingViews',
+            fields=[
+                ('dog', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='dogs.dog', verbose_name='dog')),
+            ],
+            options={
+                'verbose_name': 'pending views',
+                'verbose_name_plural': 'pending views',
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:07
+
+from django.db import migrations, models
+
+
+def mark_existing(apps, schema_editor):
+    """Копии уже загруженных файлов созданы при загрузке (раньше это делал сигнал post_save)."""
+    apps.get_model('dogs', 'MediaFile').objects.update(has_variants=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0012_pending_views'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='mediafile',
+            name='has_variants',
+            field=models.BooleanField(default=False, null=True, verbose_name='variants'),
+        ),
+        migrations.AddIndex(
+            model_name='mediafile',
+            index=models.Index(condition=models.Q(('has_variants', False)), fields=['id'], name='mediafile_no_variants_idx'),
+        ),
+        migrations.RunPython(mark_existing, migrations.RunPython.noop),
+    ]
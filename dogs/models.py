@@ -1,6 +1,7 @@
-from django.db import models
+from django.db import models, transaction
 from django.conf import settings
 
+from dogs.storage import get_media_storage
 from users.models import NULLABLE
 
 
@@ -11,6 +12,8 @@ class Category(models.Model):
     Атрибуты:
     - name: Название породы (CharField, макс. 100 символов).
     - description: Описание породы (CharField, макс. 1000 символов).
+    - dog_count: Количество собак породы (IntegerField), поддерживается сигналами dogs.signals.
+    - active_dog_count: Количество активных собак породы (IntegerField).
 
     Методы:
     - __str__(): Возвращает строковое представление названия породы.
@@ -21,6 +24,8 @@ class Category(models.Model):
     """
     name = models.CharField(max_length=100, verbose_name='breed')
     description = models.CharField(max_length=1000, verbose_name='descriptions')
+    dog_count = models.IntegerField(default=0, editable=False, verbose_name='dogs')
+    active_dog_count = models.IntegerField(default=0, editable=False, verbose_name='active dogs')
 
     def __str__(self):
         return f'{self.name}'
@@ -30,6 +35,13 @@ class Category(models.Model):
         verbose_name_plural = 'breeds'
 
 
+class ActiveDogManager(models.Manager):
+    """Менеджер активных собак (Dog.active): условие совпадает с частичными индексами dog_active_*."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(is_active=True)
+
+
 class Dog(models.Model):
     """
     Модель для собаки.
@@ -37,29 +49,41 @@ class Dog(models.Model):
     Атрибуты:
     - name: Имя собаки (CharField, макс. 250 символов).
     - category: Связь с моделью Category (ForeignKey), указывающая на породу собаки.
-    - photo: Фото собаки (ImageField), загружается в папку 'dogs/'.
+    - photo: Фото собаки (ImageField), загружается в папку 'dogs/' под хешем содержимого.
     - birth_date: Дата рождения собаки (DateField).
     - is_active: Статус активности собаки (BooleanField), по умолчанию True.
     - owner: Владелец собаки (ForeignKey), указывающий на пользователя.
     - views: Количество просмотров профиля собаки (IntegerField), по умолчанию 0.
+    - review_count: Количество отзывов о собаке (IntegerField), поддерживается сигналами dogs.signals.
+    - active_review_count: Количество активных отзывов о собаке (IntegerField).
+
+    Менеджеры:
+    - objects: Все собаки (менеджер по умолчанию).
+    - active: Только активные собаки (ActiveDogManager).
 
     Методы:
     - __str__(): Возвращает строковое представление имени собаки и её породы.
-    - views_count(): Увеличивает количество просмотров и сохраняет объект.
+    - save(): Сохраняет собаку в одной транзакции с изменением счетчиков породы.
 
     Метаданные:
     - verbose_name: Человекочитаемое имя модели в единственном числе.
     - verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+    - indexes: Индексы под фильтры и курсорную пагинацию списков собак (сортировка по имени и pk).
     """
     name = models.CharField(max_length=250, verbose_name='dog_name')
     category = models.ForeignKey(Category, on_delete=models.CASCADE, verbose_name='breed')
-    photo = models.ImageField(upload_to='dogs/', **NULLABLE, verbose_name='image')
+    photo = models.ImageField(upload_to='dogs/', storage=get_media_storage, **NULLABLE, verbose_name='image')
     birth_date = models.DateField(**NULLABLE, verbose_name='birth_date')
     is_active = models.BooleanField(default=True, verbose_name='Active')
 
     owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, **NULLABLE,
                               verbose_name="владелец")
     views = models.IntegerField(default=0, verbose_name='просмотры')
+    review_count = models.IntegerField(default=0, editable=False, verbose_name='отзывы')
+    active_review_count = models.IntegerField(default=0, editable=False, verbose_name='активные отзывы')
+
+    objects = models.Manager()  # Объявлен первым, чтобы остаться менеджером по умолчанию
+    active = ActiveDogManager()
 
     def __str__(self):
         return f'{self.name} ({self.category})'
@@ -67,11 +91,21 @@ class Dog(models.Model):
     class Meta:
         verbose_name = 'dog'  # понятное человеку имя модели
         verbose_name_plural = 'dogs'  # понятное человеку имя множественное число
-
-    def views_count(self):
-        """Увеличивает количество просмотров на 1 и сохраняет объект."""
-        self.views += 1
-        self.save()
+        indexes = [
+            # Список активных собак (DogListView, поиск): WHERE is_active ORDER BY name, id
+            models.Index(fields=['name', 'id'], condition=models.Q(is_active=True), name='dog_active_name_idx'),
+            # Неактивные собаки для модератора (DogDeactivateListView)
+            models.Index(fields=['name', 'id'], condition=models.Q(is_active=False), name='dog_inactive_name_idx'),
+            # Неактивные собаки владельца: WHERE owner_id = ? AND NOT is_active ORDER BY name, id
+            models.Index(fields=['owner', 'name', 'id'], condition=models.Q(is_active=False),
+                         name='dog_inactive_owner_name_idx'),
+            # Собаки породы (category_dogs): WHERE category_id = ? ORDER BY name, id
+            models.Index(fields=['category', 'name', 'id'], name='dog_category_name_idx'),
+        ]
+
+    def save(self, *args, **kwargs):
+        with transaction.atomic():  # Счетчики породы меняются в post_save в той же транзакции
+            super().save(*args, **kwargs)
 
 
 class Parent(models.Model):
@@ -80,6 +114,8 @@ class Parent(models.Model):
 
     Атрибуты:
     - dog: Связь с моделью Dog (ForeignKey), указывающая на собаку-ребенка.
+    - parent_dog: Собака питомника, которая является этим родителем (ForeignKey), необязательна.
+      По таким связям строится многопоколенная родословная (Ancestry).
     - name: Имя родителя (CharField, макс. 250 символов).
     - category: Связь с моделью Category (ForeignKey), указывающая на породу родителя.
     - birth_date: Дата рождения родителя (DateField).
@@ -92,6 +128,8 @@ class Parent(models.Model):
     - verbose_name_plural: Человекочитаемое имя модели во множественном числе.
     """
     dog = models.ForeignKey(Dog, on_delete=models.CASCADE)
+    parent_dog = models.ForeignKey(Dog, on_delete=models.SET_NULL, **NULLABLE, related_name='offspring_links',
+                                   verbose_name='kennel dog')
     name = models.CharField(max_length=250, verbose_name='dog_name')
     category = models.ForeignKey(Category, on_delete=models.CASCADE, verbose_name='breed')
     birth_date = models.DateField(**NULLABLE, verbose_name='birth_date')
@@ -102,3 +140,101 @@ class Parent(models.Model):
     class Meta:
         verbose_name = 'parent'
         verbose_name_plural = 'parents'
+
+
+class Ancestry(models.Model):
+    """
+    Таблица замыкания родословной: строка на каждую пару предок - потомок на каждом поколении.
+
+    Строится по связям Parent.parent_dog функцией dogs.pedigree.rebuild_pedigree и позволяет
+    получить предков или потомков на любую глубину одним запросом. Предок, встречающийся
+    в родословной на разных поколениях (инбридинг), дает несколько строк.
+
+    Атрибуты:
+    - ancestor: Предок (ForeignKey на Dog).
+    - descendant: Потомок (ForeignKey на Dog).
+    - depth: Поколение предка относительно потомка (PositiveSmallIntegerField), 1 - родитель.
+
+    Метаданные:
+    - constraints: Уникальность тройки потомок - поколение - предок, она же индекс поиска предков.
+    - indexes: Индекс поиска потомков.
+    """
+    # Индексы по одному полю не создаются: их покрывают составные индексы из Meta
+    ancestor = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='descendant_links', db_index=False)
+    descendant = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='ancestor_links', db_index=False)
+    depth = models.PositiveSmallIntegerField(verbose_name='generation')
+
+    def __str__(self):
+        return f'{self.ancestor_id} -> {self.descendant_id} ({self.depth})'
+
+    class Meta:
+        verbose_name = 'ancestry'
+        verbose_name_plural = 'ancestry'
+        constraints = [
+            models.UniqueConstraint(fields=['descendant', 'depth', 'ancestor'], name='ancestry_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['ancestor', 'depth'], name='ancestry_ancestor_idx'),
+        ]
+
+
+class MediaFile(models.Model):
+    """
+    Модель учета ссылок на файл в хранилище по хешу содержимого (dogs.storage).
+
+    Атрибуты:
+    - name: Имя файла в хранилище (CharField, уникальное).
+    - refcount: Количество объектов, ссылающихся на файл (PositiveIntegerField).
+    - size: Размер файла в байтах (PositiveBigIntegerField).
+    - has_variants: Уменьшенные копии созданы (BooleanField): шаблоны выводят их без проверки
+      наличия файлов в хранилище, а новые файлы (False) обрабатывает команда
+      generate_image_variants --pending. None - создать копии не удалось, выводится оригинал.
+
+    Методы:
+    - __str__(): Возвращает имя файла и количество ссылок.
+
+    Метаданные:
+    - verbose_name: Человекочитаемое имя модели в единственном числе.
+    - verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+    - indexes: Частичный индекс файлов, ожидающих создания копий.
+    """
+    name = models.CharField(max_length=255, unique=True, verbose_name='file')
+    refcount = models.IntegerField(default=1, verbose_name='references')
+    size = models.PositiveBigIntegerField(default=0, verbose_name='size')
+    has_variants = models.BooleanField(default=False, null=True, verbose_name='variants')
+
+    def __str__(self):
+        return f'{self.name} ({self.refcount})'
+
+    class Meta:
+        verbose_name = 'media file'
+        verbose_name_plural = 'media files'
+        indexes = [
+            models.Index(fields=['id'], condition=models.Q(has_variants=False), name='mediafile_no_variants_idx'),
+        ]
+
+
+class PendingViews(models.Model):
+    """
+    Собака, у которой в счетчике кеша есть еще не записанные в базу просмотры (dogs.services).
+
+    Строка добавляется при первом просмотре после записи в базу и удаляется командой
+    flush_dog_views, когда счетчик собаки обнулен. В отличие от множества в кеше,
+    строки добавляются и удаляются независимо, поэтому одновременные первые просмотры
+    разных собак не затирают друг друга.
+
+    Атрибуты:
+    - dog: Собака (OneToOneField, первичный ключ).
+
+    Метаданные:
+    - verbose_name: Человекочитаемое имя модели в единственном числе.
+    - verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+    """
+    dog = models.OneToOneField(Dog, on_delete=models.CASCADE, primary_key=True, related_name='+', verbose_name='dog')
+
+    def __str__(self):
+        return str(self.dog_id)
+
+    class Meta:
+        verbose_name = 'pending views'
+        verbose_name_plural = 'pending views'
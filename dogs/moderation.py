@@ -0,0 +1,215 @@
+from django.apps import apps
+from django.contrib import messages
+from django.db import transaction
+from django.http import HttpResponseBadRequest, JsonResponse
+from django.shortcuts import redirect
+
+from dogs.caching import forget_object_versions
+from dogs.counters import COUNTERS, apply_bulk_delete, apply_bulk_flag_change, counters_suspended
+from dogs.models import Parent
+from dogs.pedigree import rebuild_pedigree
+from users.models import UserRoles
+
+# Модели, которые модерируются массово: метка модели -> поле владельца и право на удаление.
+# Признак активности берется из COUNTERS.
+MODERATION = {
+    'dogs.Dog': {'owner': 'owner', 'delete_permission': 'dogs.delete_dog'},
+    'reviews.Review': {'owner': 'autor', 'delete_permission': 'reviews.delete_review'},
+}
+MODERATOR_ROLES = (UserRoles.ADMIN, UserRoles.MODERATOR)
+# Сколько pk передается в один IN (...): SQL Server принимает не больше 2100 параметров запроса
+MODERATION_CHUNK_SIZE = 1000
+ACTIONS = ('activate', 'deactivate', 'delete')
+
+
+def is_moderator(user):
+    """
+    Проверяет, может ли пользователь модерировать чужие объекты.
+
+    Args:
+        user (User): Пользователь.
+
+    Returns:
+        bool: True для суперпользователя, администратора и модератора.
+    """
+    return user.is_superuser or getattr(user, 'role', None) in MODERATOR_ROLES
+
+
+def _chunks(pks):
+    """Разбивает список pk на части по MODERATION_CHUNK_SIZE."""
+    for start in range(0, len(pks), MODERATION_CHUNK_SIZE):
+        yield pks[start:start + MODERATION_CHUNK_SIZE]
+
+
+def get_moderated_pks(model, user, pks):
+    """
+    Проверяет права пользователя сразу на весь набор объектов.
+
+    Модератор и администратор получают все существующие объекты из набора, обычный
+    пользователь - только свои. Проверка выполняется одним SELECT pk на каждую
+    тысячу объектов, а не загрузкой и проверкой каждой строки.
+
+    Args:
+        model (type): Модель из MODERATION.
+        user (User): Пользователь, выполняющий действие.
+        pks (Iterable): pk выбранных объектов.
+
+    Returns:
+        list: pk объектов, над которыми пользователь может выполнить действие.
+    """
+    owner_field = MODERATION[model._meta.label]['owner']
+    allowed = []
+    for chunk in _chunks(list(pks)):
+        queryset = model.objects.filter(pk__in=chunk)
+        if not is_moderator(user):
+            queryset = queryset.filter(**{owner_field: user})
+        allowed += queryset.values_list('pk', flat=True)
+    return allowed
+
+
+def _after_commit(model, pks):
+    """После фиксации сбрасывает кеши карточек измененных объектов (счетчики собак в кеш справочника не входят)."""
+    transaction.on_commit(lambda: forget_object_versions(model, pks))
+
+
+def bulk_set_active(model, user, pks, active):
+    """
+    Активирует или деактивирует набор объектов одним UPDATE на каждую тысячу объектов.
+
+    queryset.update() не отправляет сигналы, поэтому счетчики родителей изменяются
+    групповыми UPDATE (apply_bulk_flag_change), а кеши карточек сбрасываются одним
+    delete_many после фиксации транзакции.
+
+    Args:
+        model (type): Модель из MODERATION.
+        user (User): Пользователь, выполняющий действие.
+        pks (Iterable): pk выбранных объектов.
+        active (bool): Новое значение признака активности.
+
+    Returns:
+        dict: requested - выбрано объектов, changed - изменено, denied - недоступно пользователю или не найдено.
+    """
+    pks = list(dict.fromkeys(pks))
+    flag_field = COUNTERS[model._meta.label][1]
+    changed = 0
+    with transaction.atomic():
+        allowed = get_moderated_pks(model, user, pks)
+        for chunk in _chunks(allowed):
+            apply_bulk_flag_change(model, chunk, active)
+            changed += model.objects.filter(pk__in=chunk).exclude(**{flag_field: active}) \
+                .update(**{flag_field: active})
+        if changed:
+            _after_commit(model, allowed)
+    return {'requested': len(pks), 'changed': changed, 'denied': len(pks) - len(allowed)}
+
+
+def bulk_delete(model, user, pks):
+    """
+    Удаляет набор объектов, проверяя права сразу на весь набор.
+
+    Нужно право на удаление (как у DeleteView) и доступ к объектам (get_moderated_pks).
+    Счетчики родителей уменьшаются групповыми UPDATE до удаления, а поштучное изменение
+    счетчиков и родословной в сигналах на это время отключается: родословная потомков
+    удаленных собак перестраивается один раз после удаления.
+
+    Args:
+        model (type): Модель из MODERATION.
+        user (User): Пользователь, выполняющий действие.
+        pks (Iterable): pk выбранных объектов.
+
+    Returns:
+        dict: requested - выбрано объектов, changed - удалено, denied - недоступно пользователю или не найдено.
+    """
+    pks = list(dict.fromkeys(pks))
+    if not user.has_perm(MODERATION[model._meta.label]['delete_permission']):
+        return {'requested': len(pks), 'changed': 0, 'denied': len(pks)}
+
+    offspring = set()
+    with transaction.atomic():
+        allowed = get_moderated_pks(model, user, pks)
+        with counters_suspended():
+            for chunk in _chunks(allowed):
+                apply_bulk_delete(model, chunk)
+                if model._meta.label == 'dogs.Dog':
+                    offspring.update(Parent.objects.filter(parent_dog_id__in=chunk).values_list('dog_id', flat=True))
+                model.objects.filter(pk__in=chunk).delete()
+        if offspring - set(allowed):
+            rebuild_pedigree(offspring - set(allowed))
+        if allowed:
+            _after_commit(model, allowed)
+    return {'requested': len(pks), 'changed': len(allowed), 'denied': len(pks) - len(allowed)}
+
+
+def moderate(label, user, action, pks):
+    """
+    Выполняет массовое действие модерации.
+
+    Args:
+        label (str): Метка модели из MODERATION, например 'dogs.Dog'.
+        user (User): Пользователь, выполняющий действие.
+        action (str): Действие из ACTIONS.
+        pks (Iterable): pk выбранных объектов.
+
+    Returns:
+        dict: Количество выбранных, измененных и недоступных объектов.
+
+    Raises:
+        ValueError: Неизвестное действие.
+    """
+    model = apps.get_model(label)
+    if action == 'delete':
+        return bulk_delete(model, user, pks)
+    if action in ('activate', 'deactivate'):
+        return bulk_set_active(model, user, pks, action == 'activate')
+    raise ValueError(f'Неизвестное действие модерации: {action}')
+
+
+def moderation_response(request, label, success_url):
+    """
+    Обрабатывает POST формы массовой модерации (action и список pk).
+
+    Клиенту, ожидающему JSON, возвращаются счетчики, браузер перенаправляется на
+    success_url с сообщением о результате.
+
+    Args:
+        request (HttpRequest): POST-запрос с полями action и pk.
+        label (str): Метка модели из MODERATION.
+        success_url (str): Адрес перенаправления после действия.
+
+    Returns:
+        HttpResponse: JSON со счетчиками, перенаправление или 400 при неверных данных.
+    """
+    action = request.POST.get('action')
+    try:
+        pks = [int(pk) for pk in request.POST.getlist('pk')]
+    except ValueError:
+        return HttpResponseBadRequest('Неверный идентификатор объекта')
+    if action not in ACTIONS:
+        return HttpResponseBadRequest('Неизвестное действие')
+
+    result = moderate(label, request.user, action, pks)
+    if request.accepts('application/json') and not request.accepts('text/html'):
+        return JsonResponse(result)
+    messages.info(request, f'Выбрано: {result["requested"]}, изменено: {result["changed"]}, '
+                           f'недоступно: {result["denied"]}')
+    return redirect(success_url)
+
+
+def make_admin_action(action, description):
+    """
+    Создает действие админки, выполняющее массовую модерацию выбранных объектов.
+
+    Args:
+        action (str): Действие из ACTIONS.
+        description (str): Название действия в списке админки.
+
+    Returns:
+        function: Действие для ModelAdmin.actions.
+    """
+    def admin_action(modeladmin, request, queryset):
+        result = moderate(queryset.model._meta.label, request.user, action, queryset.values_list('pk', flat=True))
+        modeladmin.message_user(request, f'Выбрано: {result["requested"]}, изменено: {result["changed"]}, '
+                                         f'недоступно: {result["denied"]}')
+    admin_action.__name__ = f'bulk_{action}'
+    admin_action.short_description = description
+    return admin_action
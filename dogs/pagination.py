@@ -0,0 +1,336 @@
+import base64
+import hashlib
+import json
+from datetime import date, datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.core.paginator import Paginator
+from django.db import DatabaseError, connections
+from django.db.models import Q
+from django.utils.functional import cached_property
+
+# Оценка числа строк таблицы по статистике базы, без COUNT(*): vendor -> запрос с параметром "имя таблицы"
+ROW_ESTIMATE_QUERIES = {
+    'microsoft': 'SELECT SUM(row_count) FROM sys.dm_db_partition_stats '
+                 'WHERE object_id = OBJECT_ID(%s) AND index_id IN (0, 1)',
+    'postgresql': 'SELECT reltuples::bigint FROM pg_class WHERE oid = to_regclass(%s)',
+    'mysql': 'SELECT table_rows FROM information_schema.tables '
+             'WHERE table_schema = DATABASE() AND table_name = %s',
+}
+
+
+def encode_cursor(values, backwards=False):
+    """
+    Кодирует позицию в списке (значения ключа сортировки) в строку для URL.
+
+    Args:
+        values (list): Значения поля сортировки и pk последней (или первой) строки страницы.
+        backwards (bool): Курсор ведет на предыдущую страницу.
+
+    Returns:
+        str: Курсор в виде urlsafe base64.
+    """
+    values = [value.isoformat() if isinstance(value, (date, datetime)) else value for value in values]
+    payload = json.dumps({'v': values, 'b': backwards}, separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor):
+    """
+    Декодирует курсор, полученный из URL.
+
+    Args:
+        cursor (str): Курсор в виде urlsafe base64.
+
+    Returns:
+        tuple: Значения ключа сортировки и признак движения назад или (None, False) для некорректного курсора.
+    """
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        return list(payload['v']), bool(payload['b'])
+    except (ValueError, TypeError, KeyError):
+        return None, False
+
+
+def get_cached_count(queryset, timeout=None, version=None):
+    """
+    Возвращает количество строк запроса из кеша, выполняя COUNT(*) не чаще раза в timeout секунд.
+
+    Args:
+        queryset (QuerySet): Запрос, количество строк которого нужно получить.
+        timeout (int | None): Время жизни значения в кеше, по умолчанию PAGINATION_COUNT_TIMEOUT.
+        version (str | None): Версия данных (dogs.caching): при ее изменении количество считается заново.
+
+    Returns:
+        int: Количество строк (без version может отставать от базы на время жизни кеша).
+    """
+    key = _count_key(queryset, version)
+    timeout = settings.PAGINATION_COUNT_TIMEOUT if timeout is None else timeout
+    return cache.get_or_set(key, queryset.count, timeout)
+
+
+async def aget_cached_count(queryset, timeout=None, version=None):
+    """Асинхронный вариант get_cached_count(): COUNT(*) выполняется через acount()."""
+    key = _count_key(queryset, version)
+    timeout = settings.PAGINATION_COUNT_TIMEOUT if timeout is None else timeout
+    count = await cache.aget(key)
+    if count is None:
+        count = await queryset.acount()
+        await cache.aadd(key, count, timeout)
+    return count
+
+
+def _count_key(queryset, version):
+    """Возвращает ключ кеша количества строк запроса."""
+    return f'count:{version}:' + hashlib.md5(str(queryset.query).encode()).hexdigest()
+
+
+def estimate_row_count(model, using='default'):
+    """
+    Возвращает число строк таблицы модели по статистике базы (без сканирования таблицы).
+
+    Args:
+        model (type): Класс модели.
+        using (str): Псевдоним базы данных.
+
+    Returns:
+        int | None: Оценка числа строк или None, если база не хранит статистику (SQLite) или она не собрана.
+    """
+    connection = connections[using]
+    sql = ROW_ESTIMATE_QUERIES.get(connection.vendor)
+    if sql is None:
+        return None
+    try:
+        with connection.cursor() as cursor:
+            cursor.execute(sql, [model._meta.db_table])
+            row = cursor.fetchone()
+    except DatabaseError:
+        return None
+    if not row or row[0] is None or row[0] < 0:  # PostgreSQL: -1 для таблицы без ANALYZE
+        return None
+    return int(row[0])
+
+
+class EstimatedCountPaginator(Paginator):
+    """
+    Пагинатор админки, не выполняющий COUNT(*) по большим таблицам на каждый запрос.
+
+    Для списка без фильтров число строк берется из статистики базы, если таблица больше
+    ADMIN_ESTIMATED_COUNT_THRESHOLD, для отфильтрованного - из кеша (get_cached_count).
+    Номера последних страниц при этом приблизительны.
+    """
+
+    @cached_property
+    def count(self):
+        """Приблизительное общее количество объектов."""
+        queryset = self.object_list
+        if not queryset.query.has_filters():
+            estimate = estimate_row_count(queryset.model, queryset.db)
+            if estimate is not None and estimate >= settings.ADMIN_ESTIMATED_COUNT_THRESHOLD:
+                return estimate
+        return get_cached_count(queryset)
+
+
+class KeysetPage:
+    """
+    Страница списка, выбранная по курсору (keyset pagination).
+
+    Атрибуты:
+        object_list (list): Объекты страницы.
+        next_cursor (str | None): Курсор следующей страницы.
+        previous_cursor (str | None): Курсор предыдущей страницы.
+        count (int): Общее количество объектов (из кеша).
+
+    Методы:
+        has_next(), has_previous(), has_other_pages(): Наличие соседних страниц.
+    """
+
+    def __init__(self, object_list, next_cursor, previous_cursor, count):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.count = count
+        self.next_query = ''
+        self.previous_query = ''
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.next_cursor is not None
+
+    def has_previous(self):
+        return self.previous_cursor is not None
+
+    def has_other_pages(self):
+        return self.has_next() or self.has_previous()
+
+
+def _cursor_values(model, keys, values):
+    """
+    Приводит значения курсора к типам полей сортировки.
+
+    Курсор приходит из URL, поэтому значения могут быть подделаны: '["x"]' вместо pk.
+
+    Args:
+        model (type): Класс модели списка.
+        keys (list): Ключи сортировки ('pk' - первичный ключ).
+        values (list): Значения из decode_cursor().
+
+    Returns:
+        list | None: Значения полей или None, если курсор не подходит к сортировке.
+    """
+    if len(values) != len(keys):
+        return None
+    result = []
+    for key, value in zip(keys, values):
+        try:
+            field = model._meta.pk if key == 'pk' else model._meta.get_field(key)
+        except FieldDoesNotExist:  # Аннотация values(): значение используется как есть
+            result.append(value)
+            continue
+        if value is None or isinstance(value, (list, dict)):
+            return None  # Сравнение с NULL и составными значениями невозможно
+        try:
+            result.append(field.to_python(value))
+        except (ValidationError, ValueError, TypeError):
+            return None
+    return result
+
+
+def _keyset_query(queryset, cursor, per_page, ordering):
+    """
+    Строит запрос страницы для paginate_keyset() и apaginate_keyset().
+
+    Returns:
+        tuple: (запрос на per_page + 1 строк, ключи сортировки, значения курсора, признак движения назад).
+    """
+    descending = ordering.startswith('-')
+    field = ordering.lstrip('-')
+    keys = ['pk'] if field in ('pk', 'id') else [field, 'pk']
+
+    values, backwards = decode_cursor(cursor) if cursor else (None, False)
+    if values is not None:
+        values = _cursor_values(queryset.model, keys, values)
+        if values is None:
+            backwards = False  # Подделанный или устаревший курсор - первая страница
+
+    forward = descending == backwards  # Направление выборки в базе: по возрастанию или по убыванию
+    lookup = 'gt' if forward else 'lt'
+    order_by = keys if forward else ['-' + key for key in keys]
+
+    page_queryset = queryset.order_by(*order_by)
+    if values is not None:
+        condition = Q(**{f'{keys[-1]}__{lookup}': values[-1]})
+        for key, value in zip(reversed(keys[:-1]), reversed(values[:-1])):
+            condition = Q(**{f'{key}__{lookup}': value}) | Q(**{key: value}) & condition
+        page_queryset = page_queryset.filter(condition)
+
+    return page_queryset[:per_page + 1], keys, values, backwards  # Лишняя строка показывает, есть ли страница дальше
+
+
+def _keyset_page(queryset, rows, per_page, keys, values, backwards, count):
+    """Собирает KeysetPage из выбранных строк: определяет курсоры соседних страниц."""
+    has_more = len(rows) > per_page
+    rows = rows[:per_page]
+    if backwards:
+        rows.reverse()
+
+    pk_name = queryset.model._meta.pk.attname
+
+    def key_of(obj):
+        if isinstance(obj, dict):  # Строки values(): pk хранится под именем поля первичного ключа
+            return [obj[pk_name if key == 'pk' else key] for key in keys]
+        return [getattr(obj, key) for key in keys]
+
+    next_cursor = previous_cursor = None
+    if rows:
+        if has_more or backwards:
+            next_cursor = encode_cursor(key_of(rows[-1]))
+        if values is not None and (has_more or not backwards):
+            previous_cursor = encode_cursor(key_of(rows[0]), backwards=True)
+
+    return KeysetPage(rows, next_cursor, previous_cursor, count)
+
+
+def paginate_keyset(queryset, cursor, per_page, ordering='pk', count_version=None):
+    """
+    Выбирает страницу по курсору вместо OFFSET.
+
+    Строки сортируются по (ordering, pk), а следующая страница выбирается условием
+    "ключ больше ключа последней строки", поэтому любая страница стоит столько же,
+    сколько первая, при наличии индекса по (ordering, pk).
+
+    Args:
+        queryset (QuerySet): Отфильтрованный запрос (объекты моделей или values() с полем сортировки и pk).
+        cursor (str | None): Курсор из URL или None для первой страницы.
+        per_page (int): Количество объектов на странице.
+        ordering (str): Поле сортировки, с префиксом '-' для сортировки по убыванию.
+        count_version (str | None): Версия данных для кеша общего количества (get_cached_count).
+
+    Returns:
+        KeysetPage: Страница с объектами и курсорами соседних страниц.
+    """
+    page_queryset, keys, values, backwards = _keyset_query(queryset, cursor, per_page, ordering)
+    rows = list(page_queryset)
+    count = get_cached_count(queryset, version=count_version)
+    return _keyset_page(queryset, rows, per_page, keys, values, backwards, count)
+
+
+async def apaginate_keyset(queryset, cursor, per_page, ordering='pk', count_version=None):
+    """Асинхронный вариант paginate_keyset() для асинхронных представлений (async ORM)."""
+    page_queryset, keys, values, backwards = _keyset_query(queryset, cursor, per_page, ordering)
+    rows = [row async for row in page_queryset]
+    count = await aget_cached_count(queryset, version=count_version)
+    return _keyset_page(queryset, rows, per_page, keys, values, backwards, count)
+
+
+def set_page_queries(page, request, cursor_kwarg='cursor'):
+    """
+    Заполняет строки запроса для ссылок на соседние страницы, сохраняя остальные GET-параметры.
+
+    Args:
+        page (KeysetPage): Страница.
+        request (HttpRequest): Текущий запрос.
+        cursor_kwarg (str): Имя GET-параметра с курсором.
+    """
+    params = request.GET.copy()
+    if page.next_cursor:
+        params[cursor_kwarg] = page.next_cursor
+        page.next_query = params.urlencode()
+    if page.previous_cursor:
+        params[cursor_kwarg] = page.previous_cursor
+        page.previous_query = params.urlencode()
+
+
+class KeysetPaginationMixin:
+    """
+    Миксин для ListView, заменяющий постраничную навигацию по номеру страницы на курсорную.
+
+    Атрибуты:
+        paginate_by (int): Количество объектов на странице.
+        keyset_ordering (str): Поле сортировки (с '-' для убывания), pk добавляется автоматически.
+        cursor_kwarg (str): Имя GET-параметра с курсором.
+    """
+    paginate_by = 12
+    keyset_ordering = 'pk'
+    cursor_kwarg = 'cursor'
+
+    def get_paginate_by(self, queryset):
+        """Отключает стандартную пагинацию ListView."""
+        return None
+
+    def get_context_data(self, **kwargs):
+        """Добавляет в контекст страницу, выбранную по курсору."""
+        page = paginate_keyset(
+            self.object_list, self.request.GET.get(self.cursor_kwarg), self.paginate_by, self.keyset_ordering
+        )
+        set_page_queries(page, self.request, self.cursor_kwarg)
+        context = super().get_context_data(object_list=page.object_list, **kwargs)
+        context.update(page_obj=page, is_paginated=page.has_other_pages())
+        return context
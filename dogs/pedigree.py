@@ -0,0 +1,217 @@
+from collections import defaultdict
+from functools import lru_cache
+
+from django.db.models import F, Min, Q
+
+from dogs.models import Ancestry, Dog, Parent
+
+PEDIGREE_DEPTH = 5  # Поколений в родословной на странице собаки и в расчете инбридинга
+PEDIGREE_MAX_DEPTH = 10  # Поколений, хранимых в таблице замыкания
+PEDIGREE_CHUNK_SIZE = 1000  # pk в одном IN (...): SQL Server принимает не больше 2100 параметров запроса
+
+
+def _chunks(pks):
+    """Разбивает список pk на части по PEDIGREE_CHUNK_SIZE."""
+    pks = list(pks)
+    for start in range(0, len(pks), PEDIGREE_CHUNK_SIZE):
+        yield pks[start:start + PEDIGREE_CHUNK_SIZE]
+
+
+def rebuild_pedigree(dog_pks=None):
+    """
+    Перестраивает таблицу замыкания Ancestry для собак и всех их потомков.
+
+    Вызывается при изменении связей Parent.parent_dog. Строки затронутых собак удаляются
+    и строятся заново по связям с родителями: для родителя, не затронутого изменением,
+    берутся его готовые строки из таблицы. Число запросов не зависит от глубины родословной.
+
+    Args:
+        dog_pks (Iterable | None): pk собак, у которых изменились родители; None - перестроить всю таблицу.
+
+    Returns:
+        int: Количество созданных строк.
+
+    Raises:
+        ValueError: Связи образуют цикл (собака оказалась своим предком).
+    """
+    parents = defaultdict(set)  # pk собаки -> pk родителей-собак питомника
+    if dog_pks is None:
+        Ancestry.objects.all().delete()
+        for dog_pk, parent_pk in Parent.objects.filter(parent_dog__isnull=False).values_list('dog_id', 'parent_dog_id'):
+            parents[dog_pk].add(parent_pk)
+        affected = set(parents)
+    else:
+        affected = set(dog_pks)
+        affected |= set(Ancestry.objects.filter(ancestor_id__in=affected).values_list('descendant_id', flat=True))
+        for chunk in _chunks(affected):
+            Ancestry.objects.filter(descendant_id__in=chunk).delete()
+            for dog_pk, parent_pk in Parent.objects.filter(dog_id__in=chunk, parent_dog__isnull=False) \
+                    .values_list('dog_id', 'parent_dog_id'):
+                parents[dog_pk].add(parent_pk)
+
+    # Готовые строки родителей, родословная которых не изменилась
+    known = defaultdict(set)
+    outside = {parent_pk for pks in parents.values() for parent_pk in pks} - affected
+    for chunk in _chunks(outside):
+        rows = Ancestry.objects.filter(descendant_id__in=chunk, depth__lt=PEDIGREE_MAX_DEPTH)
+        for ancestor_pk, descendant_pk, depth in rows.values_list('ancestor_id', 'descendant_id', 'depth'):
+            known[descendant_pk].add((ancestor_pk, depth))
+
+    visiting = set()
+
+    def ancestry(dog_pk):
+        if dog_pk in known or dog_pk not in affected:
+            return known.get(dog_pk, ())
+        if dog_pk in visiting:
+            raise ValueError(f'Собака {dog_pk} оказалась своим предком')
+        visiting.add(dog_pk)
+        rows = set()
+        for parent_pk in parents.get(dog_pk, ()):
+            rows.add((parent_pk, 1))
+            rows.update((ancestor_pk, depth + 1) for ancestor_pk, depth in ancestry(parent_pk)
+                        if depth < PEDIGREE_MAX_DEPTH)
+        visiting.discard(dog_pk)
+        known[dog_pk] = rows
+        return rows
+
+    objects = [Ancestry(ancestor_id=ancestor_pk, descendant_id=dog_pk, depth=depth)
+               for dog_pk in affected for ancestor_pk, depth in ancestry(dog_pk)]
+    Ancestry.objects.bulk_create(objects, batch_size=500)
+    return len(objects)
+
+
+def get_ancestors(dog, depth=PEDIGREE_DEPTH):
+    """
+    Возвращает предков собаки до поколения depth одним запросом.
+
+    Args:
+        dog (Dog | int): Собака или ее pk.
+        depth (int): Последнее возвращаемое поколение.
+
+    Returns:
+        list: Строки Ancestry с загруженными ancestor и его породой, по поколениям.
+    """
+    return list(Ancestry.objects.filter(descendant=dog, depth__lte=depth).select_related('ancestor__category')
+                .order_by('depth', 'ancestor__name', 'ancestor_id'))
+
+
+def get_descendants(dog, depth=PEDIGREE_MAX_DEPTH):
+    """
+    Возвращает потомков собаки до поколения depth одним запросом.
+
+    Args:
+        dog (Dog | int): Собака или ее pk.
+        depth (int): Последнее возвращаемое поколение.
+
+    Returns:
+        list: Строки Ancestry с загруженными descendant и его породой, по поколениям.
+    """
+    return list(Ancestry.objects.filter(ancestor=dog, depth__lte=depth).select_related('descendant__category')
+                .order_by('depth', 'descendant__name', 'descendant_id'))
+
+
+def get_common_ancestors(dog, other, depth=PEDIGREE_MAX_DEPTH):
+    """
+    Возвращает общих предков двух собак одним запросом.
+
+    Args:
+        dog (Dog | int): Первая собака или ее pk.
+        other (Dog | int): Вторая собака или ее pk.
+        depth (int): Последнее учитываемое поколение.
+
+    Returns:
+        QuerySet: Собаки с атрибутами dog_depth и other_depth - ближайшее поколение предка
+        для каждой из собак, ближайшие предки первыми.
+    """
+    links = Q(descendant_links__depth__lte=depth)
+    return Dog.objects.annotate(
+        dog_depth=Min('descendant_links__depth', filter=links & Q(descendant_links__descendant=dog)),
+        other_depth=Min('descendant_links__depth', filter=links & Q(descendant_links__descendant=other)),
+    ).filter(dog_depth__isnull=False, other_depth__isnull=False) \
+        .select_related('category').order_by(F('dog_depth') + F('other_depth'), 'name', 'pk')
+
+
+def _get_parent_links(dog_pk, depth):
+    """Запрос родителей собаки и ее предков до поколения depth - 1 (родители которых входят в depth)."""
+    ancestors = Ancestry.objects.filter(descendant_id=dog_pk, depth__lt=depth).values('ancestor_id')
+    return Parent.objects.filter(Q(dog_id=dog_pk) | Q(dog_id__in=ancestors))
+
+
+def inbreeding_coefficient(dog, depth=PEDIGREE_DEPTH):
+    """
+    Вычисляет коэффициент инбридинга собаки по Райту с учетом depth поколений.
+
+    Связи родословной загружаются одним запросом, коэффициент считается в памяти через
+    коэффициент родства родителей: родство пары равно половине суммы родства родителей
+    младшего из них с другим, родство с собой - (1 + F) / 2. Предки за пределами depth
+    и родители, не связанные с собаками питомника, считаются неродственными.
+
+    Args:
+        dog (Dog | int): Собака или ее pk.
+        depth (int): Учитываемых поколений.
+
+    Returns:
+        float: Коэффициент инбридинга от 0 до 1.
+    """
+    dog_pk = getattr(dog, 'pk', dog)
+    parents = defaultdict(list)
+    for child_pk, parent_pk in _get_parent_links(dog_pk, depth).filter(parent_dog__isnull=False) \
+            .order_by('parent_dog_id').values_list('dog_id', 'parent_dog_id').distinct():
+        if len(parents[child_pk]) < 2:  # Учитываются отец и мать
+            parents[child_pk].append(parent_pk)
+
+    @lru_cache(maxsize=None)
+    def ancestors(pk):
+        found = set()
+        for parent_pk in parents.get(pk, ()):
+            found |= {parent_pk} | ancestors(parent_pk)
+        return frozenset(found)
+
+    @lru_cache(maxsize=None)
+    def kinship(a, b):
+        if a == b:
+            return (1 + inbreeding(a)) / 2
+        if a in ancestors(b):
+            a, b = b, a  # Раскрывается младший из пары: он не может быть предком другого
+        return sum(kinship(*sorted((parent_pk, b))) for parent_pk in parents.get(a, ())) / 2
+
+    def inbreeding(pk):
+        pair = parents.get(pk, ())
+        return kinship(*sorted(pair)) if len(pair) == 2 else 0.0
+
+    return inbreeding(dog_pk)
+
+
+def get_pedigree_tree(dog, depth=PEDIGREE_DEPTH):
+    """
+    Возвращает родословную собаки на depth поколений одним запросом.
+
+    Родитель, связанный с собакой питомника, выводится с ее актуальными данными и
+    продолжается ее родителями, несвязанный - с данными из Parent.
+
+    Args:
+        dog (Dog | int): Собака или ее pk.
+        depth (int): Выводимых поколений.
+
+    Returns:
+        list: Узлы родителей: dict с name, category, birth_date, dog_id (pk собаки питомника или None)
+        и parents - такими же узлами следующего поколения.
+    """
+    dog_pk = getattr(dog, 'pk', dog)
+    by_dog = defaultdict(list)
+    for parent in _get_parent_links(dog_pk, depth).select_related('category', 'parent_dog__category').order_by('pk'):
+        by_dog[parent.dog_id].append(parent)
+
+    def build(pk, generation):
+        nodes = []
+        for parent in by_dog.get(pk, ()):
+            subject = parent.parent_dog or parent
+            nodes.append({
+                'name': subject.name, 'category': subject.category, 'birth_date': subject.birth_date,
+                'dog_id': parent.parent_dog_id,
+                'parents': build(parent.parent_dog_id, generation + 1)
+                if parent.parent_dog_id and generation < depth else [],
+            })
+        return nodes
+
+    return build(dog_pk, 1)
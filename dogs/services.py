@@ -1,40 +1,188 @@
+import copy
+import time
+
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
-from django.core.mail import send_mail
+from django.db import transaction
+from django.db.models import Case, F, IntegerField, Value, When
+
+from dogs.caching import aget_model_version, bump_model_version, get_model_version
+from dogs.models import Category, Dog, PendingViews
+from users.services import queue_email
+
+CATEGORIES_KEY = 'categories:v{version}'  # Ключ справочника пород определенной версии
+CATEGORY_COUNTS_KEY = 'category_counts'  # Ключ количества активных собак по породам
+DOG_VIEWS_KEY = 'dog_views:{pk}'  # Ключ счетчика еще не записанных в базу просмотров собаки
+DOG_VIEWS_MILESTONE = 20  # Письмо владельцу на каждый 20-й просмотр собаки
+
+# Копия справочника пород в памяти процесса (L1 перед общим кешем)
+_categories_l1 = {'version': None, 'items': (), 'expires': 0.0}
+
+
+def _catalogue():
+    """Возвращает QuerySet справочника пород без счетчиков собак."""
+    return Category.objects.order_by('pk').defer('dog_count', 'active_dog_count')
+
+
+def get_categories_cache(fresh=False):
+    """
+    Получает справочник пород из кеша или базы данных.
+
+    Справочник хранится в двух уровнях: в памяти процесса (L1) и в общем кеше
+    (locmem или Redis). L1 доверяет своей копии CATEGORIES_L1_TIMEOUT секунд,
+    затем сверяет версию с общим кешем; общий кеш хранит список под ключом с
+    версией. В кеш попадают уже загруженные объекты, а не ленивый QuerySet,
+    поэтому при попадании в кеш запросов к базе нет. Если кеш отключен
+    (CACHE_ENABLED = False), список всегда загружается из базы данных.
+
+    Счетчики собак в справочник не входят (меняются с каждой собакой и сбрасывали бы его):
+    количество активных собак подставляет with_dog_counts().
+
+    Args:
+        fresh (bool): Всегда сверять версию с общим кешем (проверка отправленных форм): порода,
+            удаленная в другом процессе, не пройдет проверку по устаревшей копии L1.
+
+    Returns:
+        tuple: Все категории (Category), упорядоченные по pk.
+    """
+    if not settings.CACHE_ENABLED:
+        return tuple(_catalogue())  # Получение данных из базы, если кеш отключен
+
+    now = time.monotonic()
+    if _categories_l1['expires'] > now and not fresh:
+        return _categories_l1['items']  # Копия в памяти процесса еще свежая
+
+    version = get_model_version('dogs.Category')
+    if _categories_l1['version'] != version:
+        key = CATEGORIES_KEY.format(version=version)
+        items = cache.get(key)  # Попытка получить данные из общего кеша
+        if items is None:  # Если данные отсутствуют в кеше
+            items = tuple(_catalogue())  # Получение данных из базы
+            cache.set(key, items, settings.CATEGORIES_CACHE_TIMEOUT)  # Сохранение данных в кеш
+        _categories_l1.update(version=version, items=items)
+
+    _categories_l1['expires'] = now + settings.CATEGORIES_L1_TIMEOUT
+    return _categories_l1['items']
+
+
+async def aget_categories_cache():
+    """
+    Асинхронный вариант get_categories_cache() для асинхронных представлений.
+
+    При свежей копии L1 не обращается ни к кешу, ни к базе и не уходит в поток.
+
+    Returns:
+        tuple: Все категории (Category), упорядоченные по pk.
+    """
+    if not settings.CACHE_ENABLED:
+        return tuple([category async for category in _catalogue()])
+
+    now = time.monotonic()
+    if _categories_l1['expires'] > now:
+        return _categories_l1['items']
+
+    version = await aget_model_version('dogs.Category')
+    if _categories_l1['version'] != version:
+        key = CATEGORIES_KEY.format(version=version)
+        items = await cache.aget(key)
+        if items is None:
+            items = tuple([category async for category in _catalogue()])
+            await cache.aset(key, items, settings.CATEGORIES_CACHE_TIMEOUT)
+        _categories_l1.update(version=version, items=items)
+
+    _categories_l1['expires'] = now + settings.CATEGORIES_L1_TIMEOUT
+    return _categories_l1['items']
+
+
+def get_category_counts():
+    """
+    Возвращает количество активных собак по породам.
 
-from dogs.models import Category
+    Счетчики кешируются отдельно от справочника на CATEGORY_COUNTS_TIMEOUT секунд и не
+    сбрасываются при изменении собак: изменения собак не трогают кеш справочника,
+    страниц и карточек с породами.
+
+    Returns:
+        dict: pk породы -> количество активных собак.
+    """
+    counts = cache.get(CATEGORY_COUNTS_KEY) if settings.CACHE_ENABLED else None
+    if counts is None:
+        counts = dict(Category.objects.values_list('pk', 'active_dog_count'))
+        if settings.CACHE_ENABLED:
+            cache.set(CATEGORY_COUNTS_KEY, counts, settings.CATEGORY_COUNTS_TIMEOUT)
+    return counts
+
+
+async def aget_category_counts():
+    """
+    Асинхронный вариант get_category_counts().
+
+    Returns:
+        dict: pk породы -> количество активных собак.
+    """
+    counts = await cache.aget(CATEGORY_COUNTS_KEY) if settings.CACHE_ENABLED else None
+    if counts is None:
+        counts = {pk: count async for pk, count in Category.objects.values_list('pk', 'active_dog_count')}
+        if settings.CACHE_ENABLED:
+            await cache.aset(CATEGORY_COUNTS_KEY, counts, settings.CATEGORY_COUNTS_TIMEOUT)
+    return counts
+
+
+def with_dog_counts(categories, counts):
+    """
+    Возвращает копии пород справочника с количеством активных собак.
+
+    Объекты справочника общие для запросов процесса (L1), поэтому счетчик записывается в копии.
+
+    Args:
+        categories (Iterable[Category]): Породы из get_categories_cache().
+        counts (dict): Результат get_category_counts().
+
+    Returns:
+        list: Породы с заполненным active_dog_count.
+    """
+    result = []
+    for category in categories:
+        category = copy.copy(category)
+        category.active_dog_count = counts.get(category.pk, 0)
+        result.append(category)
+    return result
 
 
-def get_categories_cache():
+def get_category_choices(empty_label='---------'):
     """
-    Получает список категорий из кеша или базы данных.
+    Возвращает варианты выбора породы для форм из кешированного справочника.
 
-    Проверяет, включен ли кеш. Если кеш включен, пытается получить список категорий
-    из кеша по ключу 'category_list'. Если список не найден, извлекает его из базы
-    данных и сохраняет в кеш. Если кеш отключен, всегда извлекает список категорий
-    из базы данных.
+    Args:
+        empty_label (str | None): Подпись пустого варианта, None - без пустого варианта.
 
     Returns:
-        QuerySet: Список всех категорий (Category) из базы данных.
+        list: Список пар (pk, название).
+    """
+    choices = [('', empty_label)] if empty_label is not None else []
+    return choices + [(category.pk, category.name) for category in get_categories_cache()]
+
+
+def invalidate_categories_cache():
     """
-    if settings.CACHE_ENABLED:
-        key = 'category_list'
-        category_list = cache.get(key)  # Попытка получить данные из кеша
-        if category_list is None:  # Если данные отсутствуют в кеше
-            category_list = Category.objects.all()  # Получение данных из базы
-            cache.set(key, category_list)  # Сохранение данных в кеш
-    else:
-        category_list = Category.objects.all()  # Получение данных из базы, если кеш отключен
+    Сбрасывает кеш справочника пород во всех процессах.
 
-    return category_list
+    Увеличивает версию модели Category в общем кеше (остальные процессы заметят ее после
+    истечения своей копии L1, страницы и карточки с породами - сразу), удаляет счетчики
+    собак по породам и очищает L1 текущего процесса.
+    """
+    bump_model_version('dogs.Category')
+    cache.delete(CATEGORY_COUNTS_KEY)
+    _categories_l1.update(version=None, items=(), expires=0.0)
 
 
 def send_views_mail(dog_object, owner_email, views_count):
     """
-    Отправляет электронное письмо владельцу собаки о количестве просмотров.
+    Ставит в очередь электронное письмо владельцу собаки о количестве просмотров.
 
-    Использует функцию send_mail для отправки письма с указанием количества
-    просмотров записи о собаке. Письмо содержит тему и сообщение с информацией
+    Использует функцию queue_email, поэтому запрос не ждет SMTP-сервер: письмо
+    отправит команда send_outbox. Письмо содержит тему и сообщение с информацией
     о текущем количестве просмотров.
 
     Args:
@@ -42,9 +190,212 @@ def send_views_mail(dog_object, owner_email, views_count):
         owner_email (str): Электронная почта владельца собаки.
         views_count (int): Текущее количество просмотров записи о собаке.
     """
-    send_mail(
+    queue_email(
         subject=f'{views_count} просмотров {dog_object}',  # Тема письма
         message=f'Юхуу! Уже {views_count}, просмотров записи {dog_object}',  # Сообщение письма
-        from_email=settings.EMAIL_HOST_USER,  # Адрес отправителя
         recipient_list=[owner_email, ]  # Список получателей
     )
+
+
+def _pending_views_key(pk):
+    """Возвращает ключ кеша со счетчиком незаписанных просмотров собаки."""
+    return DOG_VIEWS_KEY.format(pk=pk)
+
+
+def save_dog_views(increments):
+    """
+    Прибавляет просмотры к полю Dog.views и ставит в очередь письма о юбилейных просмотрах.
+
+    Все собаки обновляются одним UPDATE с выражением F('views') + CASE ..., поэтому запись
+    не затирает остальные поля и не теряет конкурентные просмотры. Новые значения читаются
+    в той же транзакции после UPDATE, пока строки заблокированы, поэтому каждое значение,
+    кратное DOG_VIEWS_MILESTONE, проходится ровно один раз: письмо не теряется и не повторяется.
+
+    Args:
+        increments (dict): ID собаки -> количество новых просмотров.
+
+    Returns:
+        dict: ID собаки -> количество просмотров в базе после записи.
+    """
+    with transaction.atomic():
+        Dog.objects.filter(pk__in=increments).update(
+            views=F('views') + Case(
+                *[When(pk=pk, then=Value(count)) for pk, count in increments.items()],
+                default=Value(0),
+                output_field=IntegerField(),
+            )
+        )
+        dogs = Dog.objects.filter(pk__in=increments).select_related('owner').only('name', 'views', 'owner__email')
+        totals = {}
+        for dog in dogs:
+            totals[dog.pk] = dog.views
+            if dog.owner is None:
+                continue
+            first = (dog.views - increments[dog.pk]) // DOG_VIEWS_MILESTONE + 1
+            for milestone in range(first, dog.views // DOG_VIEWS_MILESTONE + 1):
+                send_views_mail(dog.name, dog.owner.email, milestone * DOG_VIEWS_MILESTONE)  # Уведомление
+    return totals
+
+
+def get_pending_views(pk):
+    """
+    Возвращает количество просмотров собаки, которые еще не записаны в базу данных.
+
+    Args:
+        pk (int): ID собаки.
+
+    Returns:
+        int: Количество накопленных в кеше просмотров.
+    """
+    return cache.get(_pending_views_key(pk), 0)
+
+
+async def aget_pending_views(pk):
+    """Асинхронный вариант get_pending_views()."""
+    return await cache.aget(_pending_views_key(pk), 0)
+
+
+def register_dog_view(dog):
+    """
+    Регистрирует просмотр профиля собаки.
+
+    С DOG_VIEWS_WRITE_BEHIND (общий кеш Redis) вместо сохранения строки на каждый просмотр
+    увеличивает атомарный счетчик в кеше, а собаку с первым незаписанным просмотром отмечает
+    строкой PendingViews. Когда накопленных просмотров становится DOG_VIEWS_FLUSH_THRESHOLD
+    или больше, они записываются в базу данных через flush_dog_views(). Без общего кеша
+    просмотр сразу записывается в базу: счетчик в памяти процесса не увидит команда
+    flush_dog_views, и он теряется при вытеснении из кеша или перезапуске.
+
+    Письма о юбилейных просмотрах ставятся в очередь при записи в базу (save_dog_views).
+
+    Args:
+        dog (Dog): Объект собаки, загруженный представлением.
+
+    Returns:
+        int: Общее количество просмотров с учетом этого (база данных + кеш).
+    """
+    if not settings.DOG_VIEWS_WRITE_BEHIND:
+        return save_dog_views({dog.pk: 1}).get(dog.pk, dog.views + 1)
+
+    key = _pending_views_key(dog.pk)
+    try:
+        pending = cache.incr(key)  # Атомарное увеличение счетчика
+    except ValueError:
+        cache.add(key, 0, timeout=None)  # Счетчика еще нет - создаем его
+        pending = cache.incr(key)
+
+    if pending == 1:
+        PendingViews.objects.get_or_create(dog_id=dog.pk)  # Запоминаем собаку для периодической записи
+
+    total_views = dog.views + pending
+
+    if pending >= settings.DOG_VIEWS_FLUSH_THRESHOLD:
+        flush_dog_views([dog.pk])
+
+    return total_views
+
+
+async def aregister_dog_view(dog):
+    """
+    Асинхронный вариант register_dog_view().
+
+    Счетчик увеличивается асинхронными вызовами кеша, а запись просмотров в базу (UPDATE)
+    выполняется в потоке через sync_to_async.
+
+    Args:
+        dog (Dog): Объект собаки, загруженный представлением.
+
+    Returns:
+        int: Общее количество просмотров с учетом этого (база данных + кеш).
+    """
+    if not settings.DOG_VIEWS_WRITE_BEHIND:
+        return (await sync_to_async(save_dog_views)({dog.pk: 1})).get(dog.pk, dog.views + 1)
+
+    key = _pending_views_key(dog.pk)
+    try:
+        pending = await cache.aincr(key)
+    except ValueError:
+        await cache.aadd(key, 0, timeout=None)
+        pending = await cache.aincr(key)
+
+    if pending == 1:
+        await PendingViews.objects.aget_or_create(dog_id=dog.pk)
+
+    total_views = dog.views + pending
+
+    if pending >= settings.DOG_VIEWS_FLUSH_THRESHOLD:
+        await sync_to_async(flush_dog_views)([dog.pk])
+
+    return total_views
+
+
+def _claim_pending_views(pk, count):
+    """
+    Атомарно забирает из счетчика собаки до count просмотров.
+
+    Значение, прочитанное get_many(), могло быть уже забрано параллельной записью:
+    счетчик уменьшается на count одним decr, а по его результату видно, сколько
+    просмотров в нем действительно было. Недостающее возвращается обратно.
+
+    Args:
+        pk (int): ID собаки.
+        count (int): Прочитанное количество незаписанных просмотров.
+
+    Returns:
+        int: Количество забранных просмотров (0 - их уже забрала другая запись).
+    """
+    key = _pending_views_key(pk)
+    remaining = cache.decr(key, count)
+    taken = max(0, min(count, remaining + count))  # remaining + count - значение счетчика до decr
+    if taken < count:
+        cache.incr(key, count - taken)  # Возвращаем то, чего в счетчике уже не было
+    return taken
+
+
+def flush_dog_views(pks=None):
+    """
+    Записывает накопленные в кеше просмотры в поле Dog.views (save_dog_views).
+
+    Просмотры забираются из счетчика атомарным уменьшением (_claim_pending_views), поэтому
+    пришедшие параллельно не теряются, а две одновременные записи не учитывают одни и те же
+    просмотры дважды. Отметка PendingViews удаляется у собак с обнуленным
+    счетчиком; если за это время пришел новый первый просмотр, отметка создается снова.
+
+    Args:
+        pks (list | None): ID собак для записи. Если не указан, записываются все
+            собаки с отметкой PendingViews.
+
+    Returns:
+        int: Количество записанных в базу просмотров.
+    """
+    if pks is None:
+        pks = list(PendingViews.objects.values_list('dog_id', flat=True))
+    if not pks:
+        return 0
+
+    counts = cache.get_many([_pending_views_key(pk) for pk in pks])
+    increments = {}
+    for pk in pks:
+        count = counts.get(_pending_views_key(pk))
+        if count:
+            taken = _claim_pending_views(pk, count)
+            if taken:
+                increments[pk] = taken
+
+    if increments:
+        try:
+            save_dog_views(increments)
+        except Exception:
+            for pk, count in increments.items():
+                cache.incr(_pending_views_key(pk), count)  # Возвращаем просмотры в кеш при ошибке
+            raise
+
+    # Собаки, по которым больше нечего записывать
+    drained = [pk for pk in pks if not get_pending_views(pk)]
+    if drained:
+        PendingViews.objects.filter(dog_id__in=drained).delete()
+        for pk in drained:
+            if get_pending_views(pk):  # Первый просмотр пришел между проверкой и удалением отметки
+                PendingViews.objects.get_or_create(dog_id=pk)
+
+    return sum(increments.values())
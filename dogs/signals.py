@@ -0,0 +1,150 @@
+from django.db import transaction
+from django.db.models.signals import post_init, post_save, pre_delete, post_delete
+from django.dispatch import receiver
+
+from dogs.caching import bump_object_version
+from dogs.counters import COUNTERS, apply_counter_change, counters_are_suspended, get_counter_state
+from dogs.models import Parent
+from dogs.pedigree import rebuild_pedigree
+from dogs.services import invalidate_categories_cache
+
+# Модели с изображениями в хранилище по хешу содержимого: модель -> поле. Уменьшенные копии
+# новых файлов создает команда generate_image_variants --pending (MediaFile.has_variants)
+IMAGE_FIELDS = {
+    'dogs.Dog': 'photo',
+    'users.User': 'avatar',
+}
+# Модели, карточки которых кешируются по версии объекта (dogs.caching.CARDS), и модели, версии
+# которых входят в ETag ответов API
+VERSIONED_MODELS = ('dogs.Dog', 'dogs.Parent', 'reviews.Review', 'users.User')
+
+
+def _release_later(file, name):
+    """После фиксации транзакции освобождает ссылку на файл в хранилище по хешу содержимого."""
+    if name and hasattr(file.storage, 'release'):
+        transaction.on_commit(lambda: file.storage.release(name))
+
+
+@receiver(post_init)
+def remember_image_name(sender, instance, **kwargs):
+    """Запоминает имя загруженного из базы изображения, чтобы освободить его при замене."""
+    field = IMAGE_FIELDS.get(sender._meta.label)
+    if field:
+        instance._image_original_name = instance.__dict__.get(field) or ''
+
+
+@receiver(post_save)
+def release_replaced_image(sender, instance, raw=False, **kwargs):
+    """Освобождает изображение, замененное новым или удаленное из объекта."""
+    field = IMAGE_FIELDS.get(sender._meta.label)
+    if not field or raw:
+        return
+
+    file = getattr(instance, field)
+    original_name = str(getattr(instance, '_image_original_name', '') or '')
+    if original_name != (file.name or ''):
+        _release_later(file, original_name)  # Старое изображение заменено или удалено из объекта
+        instance._image_original_name = file.name or ''
+
+
+@receiver(post_delete)
+def release_image(sender, instance, **kwargs):
+    """Освобождает ссылку на изображение удаленного объекта."""
+    field = IMAGE_FIELDS.get(sender._meta.label)
+    if field:
+        file = getattr(instance, field)
+        _release_later(file, file.name)
+
+
+@receiver(post_save, sender='dogs.Category')
+@receiver(post_delete, sender='dogs.Category')
+def invalidate_categories(sender, raw=False, **kwargs):
+    """Сбрасывает кеш справочника пород после фиксации изменения породы."""
+    if not raw:
+        transaction.on_commit(invalidate_categories_cache)
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def bump_cache_version(sender, instance, raw=False, update_fields=None, **kwargs):
+    """После фиксации изменения объекта сбрасывает его закешированные карточки и страницы."""
+    if raw or sender._meta.label not in VERSIONED_MODELS:
+        return
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return  # Вход пользователя не меняет его карточку
+    if kwargs.get('created'):
+        # pk может достаться от откаченной или удаленной строки (SQLite, MySQL после перезапуска,
+        # тесты): записи кеша прежнего владельца pk становятся недоступны сразу
+        bump_object_version(instance)
+    transaction.on_commit(lambda: bump_object_version(instance))
+
+
+@receiver(post_init)
+def remember_counter_state(sender, instance, **kwargs):
+    """Запоминает родителя и активность объекта, чтобы при сохранении изменить счетчики на разницу."""
+    if sender._meta.label in COUNTERS:
+        instance._counter_state = get_counter_state(instance) if instance.pk is not None else None
+
+
+@receiver(post_save)
+def update_counters(sender, instance, created=False, raw=False, **kwargs):
+    """Изменяет счетчики родителя при создании объекта, смене родителя или признака активности."""
+    if raw or sender._meta.label not in COUNTERS:
+        return
+    old_state = None if created else getattr(instance, '_counter_state', None)
+    new_state = get_counter_state(instance)
+    if not created and (old_state is None or new_state is None):
+        return  # Неизвестно, что изменилось: расхождение исправит команда recount
+    apply_counter_change(sender, old_state, new_state)
+    instance._counter_state = new_state
+
+
+@receiver(post_delete)
+def decrement_counters(sender, instance, **kwargs):
+    """Уменьшает счетчики родителя при удалении объекта (при массовом удалении они уже уменьшены)."""
+    if sender._meta.label in COUNTERS and not counters_are_suspended():
+        old_state = getattr(instance, '_counter_state', None) or get_counter_state(instance)
+        apply_counter_change(sender, old_state, None)
+
+
+@receiver(post_init, sender='dogs.Parent')
+def remember_pedigree_link(sender, instance, **kwargs):
+    """Запоминает собаку и родителя-собаку питомника, чтобы перестроить родословную при их изменении."""
+    if instance.pk is None:
+        instance._pedigree_link = (None, None)  # Новый родитель: связь появится при сохранении
+    else:
+        instance._pedigree_link = (instance.__dict__.get('dog_id'), instance.__dict__.get('parent_dog_id'))
+
+
+@receiver(post_save, sender='dogs.Parent')
+def update_pedigree(sender, instance, raw=False, **kwargs):
+    """Перестраивает родословную собаки, если изменилась связь родителя с собакой питомника."""
+    if raw:
+        return
+    old_dog, old_parent_dog = getattr(instance, '_pedigree_link', (None, None))
+    link = (instance.dog_id, instance.parent_dog_id)
+    if link != (old_dog, old_parent_dog) and (old_parent_dog or instance.parent_dog_id):
+        rebuild_pedigree({pk for pk in (old_dog, instance.dog_id) if pk})
+    instance._pedigree_link = link
+
+
+@receiver(post_delete, sender='dogs.Parent')
+def remove_from_pedigree(sender, instance, **kwargs):
+    """Перестраивает родословную собаки после удаления родителя-собаки питомника."""
+    if instance.parent_dog_id and not counters_are_suspended():  # Массовое удаление собак - см. bulk_delete
+        rebuild_pedigree([instance.dog_id])
+
+
+@receiver(pre_delete, sender='dogs.Dog')
+def remember_offspring(sender, instance, **kwargs):
+    """Запоминает потомков удаляемой собаки: их родословная перестраивается после удаления."""
+    if not counters_are_suspended():
+        instance._offspring = list(Parent.objects.filter(parent_dog=instance).values_list('dog_id', flat=True))
+
+
+@receiver(post_delete, sender='dogs.Dog')
+def rebuild_offspring_pedigree(sender, instance, **kwargs):
+    """Убирает удаленную собаку из родословной потомков (связи Parent.parent_dog обнулены)."""
+    offspring = getattr(instance, '_offspring', None)
+    if offspring:
+        rebuild_pedigree(offspring)
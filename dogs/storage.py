@@ -0,0 +1,127 @@
+import hashlib
+import os
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils.deconstruct import deconstructible
+
+
+def content_hash(content):
+    """
+    Вычисляет SHA-256 содержимого файла, читая его частями.
+
+    Args:
+        content (File): Файл Django.
+
+    Returns:
+        str: Шестнадцатеричный хеш содержимого.
+    """
+    digest = hashlib.sha256()
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    for chunk in content.chunks():
+        digest.update(chunk)
+    if hasattr(content, 'seek'):
+        content.seek(0)
+    return digest.hexdigest()
+
+
+def content_addressed_name(directory, digest, extension):
+    """Возвращает имя файла по хешу содержимого: 'dogs/ab/abcdef....jpg'."""
+    return f'{directory}/{digest[:2]}/{digest}{extension.lower()}'
+
+
+@deconstructible
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    Хранилище, сохраняющее файлы под хешем их содержимого.
+
+    Одинаковые файлы хранятся один раз: повторная загрузка того же содержимого не создает
+    копию, а увеличивает счетчик ссылок в модели MediaFile. Содержимое файла по одному
+    имени никогда не меняется, поэтому URL неизменяемы и могут кешироваться браузерами
+    и CDN бессрочно. Файл удаляется, когда на него не остается ссылок (release()).
+    """
+
+    def get_available_name(self, name, max_length=None):
+        """Имя определяется содержимым в _save(), поэтому подбирать свободное имя не нужно."""
+        return name
+
+    def _save(self, name, content):
+        directory = os.path.dirname(name)
+        extension = os.path.splitext(name)[1]
+        name = content_addressed_name(directory, content_hash(content), extension)
+
+        with transaction.atomic():
+            media_file = self._lock(name, content.size)  # release() того же файла ждет конца транзакции
+            if not self.exists(name):
+                name = super()._save(name, content)  # Такого содержимого еще нет - записываем файл
+            media_file.refcount = F('refcount') + 1
+            media_file.save(update_fields=['refcount'])
+        return name
+
+    @staticmethod
+    def _lock(name, size=0):
+        """
+        Блокирует строку MediaFile файла (select_for_update), создавая ее при необходимости.
+
+        Загрузка и освобождение одного и того же содержимого выполняются по очереди: иначе
+        _save() мог бы увидеть файл, который release() сейчас удалит, и сослаться на удаленный файл.
+        Вызывается внутри транзакции.
+
+        Args:
+            name (str): Имя файла в хранилище.
+            size (int): Размер файла для новой строки.
+
+        Returns:
+            MediaFile: Заблокированная строка (refcount=0 у только что созданной).
+        """
+        media_file_model = apps.get_model('dogs', 'MediaFile')
+        while True:
+            media_file = media_file_model.objects.select_for_update().filter(name=name).first()
+            if media_file is not None:
+                return media_file
+            try:
+                with transaction.atomic():
+                    return media_file_model.objects.create(name=name, size=size, refcount=0)
+            except IntegrityError:
+                continue  # Строку одновременно создал другой запрос - блокируем ее
+
+    def release(self, name):
+        """
+        Уменьшает счетчик ссылок на файл и удаляет файл вместе с уменьшенными копиями,
+        когда ссылок не осталось. Файлы, не учтенные в MediaFile, не трогаются.
+
+        Строка MediaFile блокируется до конца транзакции, поэтому одновременная загрузка
+        того же содержимого дождется удаления и запишет файл заново.
+
+        Args:
+            name (str): Имя файла в хранилище.
+
+        Returns:
+            bool: Был ли файл удален.
+        """
+        from dogs.images import delete_variants
+
+        media_file_model = apps.get_model('dogs', 'MediaFile')
+        with transaction.atomic():
+            media_file = media_file_model.objects.select_for_update().filter(name=name).first()
+            if media_file is None:
+                return False
+            if media_file.refcount > 1:
+                media_file.refcount = F('refcount') - 1
+                media_file.save(update_fields=['refcount'])
+                return False
+            media_file.delete()
+            self.delete(name)  # Под блокировкой строки: файл не удалится после новой ссылки на него
+            delete_variants(name)
+        return True
+
+
+media_storage = ContentAddressedStorage()
+
+
+def get_media_storage():
+    """Возвращает хранилище для Dog.photo и User.avatar (вызывается Django при загрузке моделей)."""
+    return media_storage
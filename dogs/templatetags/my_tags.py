@@ -5,19 +5,47 @@
 чтобы каталог рассматривался как пакет Пайтон"""
 
 from django import template
+from django.utils.safestring import mark_safe
+
+from dogs.caching import render_cards
+from dogs.images import variant_url, variant_srcset
 
 register = template.Library()
 
 
 @register.filter()
-def dogs_media(val):
+def dogs_media(val, width=None):
+    """Возвращает URL фото собаки: уменьшенную копию нужной ширины, если она есть, иначе оригинал."""
     if val:
+        if width:
+            url = variant_url(val.name, int(width), ready=getattr(val, 'has_variants', None))
+            if url:
+                return url
         return fr'/media/{val}'
     return '/static/INF.jpg'
 
 
 @register.filter()
-def user_media(val):
+def user_media(val, width=None):
+    """Возвращает URL аватара: уменьшенную копию нужной ширины, если она есть, иначе оригинал."""
     if val:
+        if width:
+            url = variant_url(val.name, int(width), ready=getattr(val, 'has_variants', None))
+            if url:
+                return url
         return f'/media/{val}'
     return '/static/noavatar.png'
+
+
+@register.filter()
+def media_srcset(val, extension='jpeg'):
+    """Возвращает значение атрибута srcset из уменьшенных копий изображения в формате extension."""
+    if val:
+        return variant_srcset(val.name, extension, ready=getattr(val, 'has_variants', None))
+    return ''
+
+
+@register.simple_tag(takes_context=True)
+def cached_cards(context, objects, template_name):
+    """Выводит карточки объектов шаблоном template_name, беря неизмененные карточки из кеша."""
+    return mark_safe(render_cards(objects, template_name, context.get('user')))
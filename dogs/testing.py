@@ -0,0 +1,53 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+
+class QueryCountTestMixin:
+    """
+    Миксин для тестов, проверяющих, что количество SQL-запросов не растет вместе с числом строк.
+
+    Вместо заранее подобранного бюджета запросов сравнивается число запросов при small
+    и при large строках: N+1 проявляется как разница между ними.
+
+    Методы:
+        count_queries(request): Выполняет запрос без кеша и возвращает число SQL-запросов.
+        assertConstantQueries(request, add_rows): Сравнивает число запросов при малом и большом наборе строк.
+    """
+    small = 2
+    large = 12
+
+    def count_queries(self, request):
+        """
+        Выполняет проверяемый запрос и возвращает число SQL-запросов.
+
+        Args:
+            request (str | Callable): Адрес страницы (GET должен вернуть 200) или функция, выполняющая запрос.
+
+        Returns:
+            int: Количество SQL-запросов.
+        """
+        cache.clear()  # Общее количество строк и страницы кешируются - сравниваем запросы без кеша
+        with CaptureQueriesContext(connection) as context:
+            if callable(request):
+                request()
+            else:
+                self.assertEqual(self.client.get(request).status_code, 200)
+        return len(context)
+
+    def assertConstantQueries(self, request, add_rows):
+        """
+        Проверяет, что запрос выполняет одинаковое число SQL-запросов при small и large строках.
+
+        Args:
+            request (str | Callable): Адрес страницы или функция, выполняющая запрос (count_queries).
+            add_rows (Callable): Функция add_rows(count), добавляющая count строк для проверяемой страницы.
+        """
+        add_rows(self.small)
+        small_count = self.count_queries(request)
+        add_rows(self.large - self.small)
+        large_count = self.count_queries(request)
+        self.assertEqual(
+            small_count, large_count,
+            f'{request}: {small_count} запросов для {self.small} строк и {large_count} для {self.large}'
+        )
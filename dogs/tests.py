@@ -1,3 +1,933 @@
-from django.test import TestCase
+import json
+import shutil
+import tempfile
+import time
+from functools import partial
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.models import Permission
+from django.core.cache import cache, caches
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import Client, TestCase, RequestFactory, override_settings, skipUnlessDBFeature
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from PIL import Image
+
+from dogs.benchmark import compare_with_baseline, get_routes, measure_route, seed
+from dogs.caching import get_model_version, render_cards
+from dogs.counters import recount_counters
+from dogs.forms import DogForm
+from dogs.images import generate_pending_variants, variant_name
+from dogs.loadtest import parse_mix, summarize
+from dogs.management.commands.generate_image_variants import find_images
+from dogs.models import Ancestry, Category, Dog, MediaFile, Parent, PendingViews
+from dogs.moderation import bulk_set_active
+from dogs.pagination import encode_cursor
+from dogs.pedigree import get_ancestors, get_common_ancestors, get_descendants, inbreeding_coefficient
+from dogs.services import (
+    CATEGORY_COUNTS_KEY, _categories_l1, flush_dog_views, get_categories_cache, get_category_counts,
+    invalidate_categories_cache, save_dog_views, with_dog_counts,
+)
+from dogs.storage import media_storage
+from dogs.templatetags.my_tags import dogs_media, media_srcset
+from dogs.testing import QueryCountTestMixin
+from dogs.transfer import KennelImporter, iter_export_records, iter_json_array, write_records
+from dogs.utils import QueryBudgetExceeded, query_budget, use_async_views
+from dogs.views import DogUpdateView
+from reviews.models import Review
+from users.models import OutgoingEmail, User, UserRoles
+
+
+class DogListQueryCountTest(QueryCountTestMixin, TestCase):
+    """Списки собак загружают породы пачкой, а не отдельным запросом на каждую карточку."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='user@test.ru', role=UserRoles.USER)
+        cls.category = Category.objects.create(name='Овчарка', description='-')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add_dogs(self, count, is_active=True, category=None, photo=False):
+        """Добавляет count собак пользователя, каждую своей породы (или породы category), с фото при photo."""
+        start = Dog.objects.count()
+        for i in range(start, start + count):
+            Dog.objects.create(name=f'Шарик {i}', owner=self.user, is_active=is_active,
+                               photo=f'dogs/{i:02}/{i}.jpg' if photo else None,
+                               category=category or Category.objects.create(name=f'Порода {i}', description='-'))
+        if photo:  # Копии созданы у каждого второго фото
+            MediaFile.objects.bulk_create(MediaFile(name=f'dogs/{i:02}/{i}.jpg', has_variants=i % 2 == 0)
+                                          for i in range(start, start + count))
+
+    def test_list_dogs(self):
+        self.assertConstantQueries(reverse('dogs:list_dogs'), self.add_dogs)
+
+    def test_list_dogs_with_photos(self):
+        self.assertConstantQueries(reverse('dogs:list_dogs'), partial(self.add_dogs, photo=True))
+
+    def test_search_dogs(self):
+        self.assertConstantQueries(reverse('dogs:search_dogs') + '?q=Шарик', self.add_dogs)
+
+    def test_deactivated_dogs(self):
+        self.assertConstantQueries(reverse('dogs:deactivated_list_dogs'), partial(self.add_dogs, is_active=False))
+
+    def test_category_dogs(self):
+        self.assertConstantQueries(reverse('dogs:category_dogs', args=[self.category.pk]),
+                                   partial(self.add_dogs, category=self.category))
+
+
+class QueryBudgetTest(TestCase):
+    """Превышение бюджета запросов приводит к ошибке в строгом режиме и к предупреждению иначе."""
+
+    def setUp(self):
+        Category.objects.create(name='Овчарка', description='-')
+
+        @query_budget(0)
+        def view(request):
+            return HttpResponse(Category.objects.count())
+
+        self.view = view
+        self.request = RequestFactory().get('/')
+
+    @override_settings(QUERY_BUDGET_STRICT=True)
+    def test_strict_raises(self):
+        with self.assertRaises(QueryBudgetExceeded):
+            self.view(self.request)
+
+    @override_settings(QUERY_BUDGET_STRICT=False)
+    def test_not_strict_logs(self):
+        with self.assertLogs('dogs.utils', level='WARNING'):
+            response = self.view(self.request)
+        self.assertEqual(response.content, b'1')
+
+
+class KeysetPaginationTest(TestCase):
+    """Курсорная пагинация проходит список вперед и назад без пропусков и повторов."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='user@test.ru')
+        self.client.force_login(self.user)
+        category = Category.objects.create(name='Овчарка', description='-')
+        Dog.objects.bulk_create(Dog(name=f'Рекс {i % 4}', category=category) for i in range(10))
+        self.expected = list(Dog.objects.order_by('name', 'pk').values_list('pk', flat=True))
+
+    def walk(self, query, direction):
+        pages = []
+        while True:
+            response = self.client.get(reverse('dogs:list_dogs') + '?' + query)
+            page = response.context['page_obj']
+            pages.append([dog.pk for dog in page.object_list])
+            query = page.next_query if direction == 'next' else page.previous_query
+            if not query:
+                return pages, page
+
+    def test_forward_and_back(self):
+        pages, last_page = self.walk('', 'next')
+        self.assertEqual([pk for page in pages for pk in page], self.expected)
+        self.assertEqual(last_page.count, 10)
+
+        back_pages, _ = self.walk(last_page.previous_query, 'previous')
+        self.assertEqual(back_pages, pages[-2::-1])
+
+    def test_tampered_cursor_shows_first_page(self):
+        first_page = self.walk('', 'next')[0][0]
+        for values in (['x'], ['Рекс 1', 'x'], ['Рекс 1', None], [['Рекс'], 1], {'a': 1}, 'x'):
+            with self.subTest(values):
+                response = self.client.get(reverse('dogs:list_dogs'), {'cursor': encode_cursor(values)})
+                self.assertEqual([dog.pk for dog in response.context['page_obj'].object_list], first_page)
+
+
+class ContentAddressedStorageTest(TestCase):
+    """Одинаковые загрузки хранятся одним файлом, который удаляется вместе с последней ссылкой."""
+
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_VARIANT_WIDTHS=())
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.category = Category.objects.create(name='Овчарка', description='-')
+
+    def upload(self, filename):
+        dog = Dog(name=filename, category=self.category)
+        buffer = BytesIO()
+        Image.new('RGB', (4, 4), 'brown').save(buffer, 'JPEG')
+        dog.photo = SimpleUploadedFile(filename, buffer.getvalue())
+        dog.save()
+        return dog
+
+    def test_dedupe_and_release(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            first, second = self.upload('rex.jpg'), self.upload('REX_copy.JPG')
+        self.assertEqual(first.photo.name, second.photo.name)
+        self.assertEqual(MediaFile.objects.get(name=first.photo.name).refcount, 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            first.delete()
+        self.assertTrue(media_storage.exists(second.photo.name))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        self.assertFalse(media_storage.exists(second.photo.name))
+        self.assertFalse(MediaFile.objects.exists())
+
+    def test_release_on_replace(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            dog, other = self.upload('rex.jpg'), self.upload('rex_copy.jpg')
+        old_name = dog.photo.name
+
+        buffer = BytesIO()
+        Image.new('RGB', (4, 4), 'white').save(buffer, 'JPEG')
+        with self.captureOnCommitCallbacks(execute=True):
+            dog.photo = SimpleUploadedFile('new.jpg', buffer.getvalue())
+            dog.save()
+        self.assertEqual(MediaFile.objects.get(name=old_name).refcount, 1)  # Старое фото осталось у other
+
+        with self.captureOnCommitCallbacks(execute=True):
+            other.photo = None
+            other.save()
+        self.assertFalse(media_storage.exists(old_name))
+        self.assertFalse(MediaFile.objects.filter(name=old_name).exists())
+        self.assertEqual(MediaFile.objects.get(name=dog.photo.name).refcount, 1)
+
+    def test_save_after_release_rewrites_file(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            dog = self.upload('rex.jpg')
+        name = dog.photo.name
+        self.assertTrue(media_storage.release(name))
+        self.assertFalse(media_storage.release(name))  # Неучтенный файл не трогается
+
+        self.assertEqual(self.upload('rex.jpg').photo.name, name)
+        self.assertTrue(media_storage.exists(name))
+        self.assertEqual(MediaFile.objects.get(name=name).refcount, 1)
+
+
+class ImageVariantsTest(TestCase):
+    """Копии фото создаются вне запроса загрузки, а шаблоны выводят их без обращений к хранилищу."""
+
+    def setUp(self):
+        cache.clear()
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root, IMAGE_VARIANT_WIDTHS=(300, 600))
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.user = User.objects.create(email='owner@test.ru')
+        self.dog = Dog(name='Рекс', category=Category.objects.create(name='Овчарка', description='-'), owner=self.user)
+        buffer = BytesIO()
+        Image.new('RGB', (800, 400), 'brown').save(buffer, 'JPEG')
+        self.dog.photo = SimpleUploadedFile('rex.jpg', buffer.getvalue())
+        self.dog.save()
+        self.name = self.dog.photo.name
+
+    def card(self):
+        return render_cards(Dog.objects.all(), 'dogs/includes/inc_dog_card.html', self.user)
+
+    def test_backfill_finds_content_addressed_files(self):
+        self.assertEqual(find_images('dogs'), [self.name])  # Файл лежит в подкаталоге 'dogs/ab/'
+        generate_pending_variants()
+        self.assertEqual(find_images('dogs'), [self.name])  # Копии не обрабатываются повторно
+
+    def test_original_until_generated(self):
+        self.assertFalse(default_storage.exists(variant_name(self.name, 300, 'webp')))  # Загрузка не ждет копий
+        self.assertEqual(dogs_media(self.dog.photo, 300), f'/media/{self.name}')
+        self.assertEqual(media_srcset(self.dog.photo, 'webp'), '')
+        self.assertNotIn('_300.webp', self.card())
+
+        self.assertEqual(generate_pending_variants(), 1)
+        with Image.open(default_storage.open(variant_name(self.name, 300, 'webp'))) as image:
+            self.assertEqual(image.size, (300, 150))
+        self.assertEqual(generate_pending_variants(), 0)
+
+        with mock.patch('dogs.images.default_storage.exists', side_effect=AssertionError('exists()')):
+            self.assertEqual(dogs_media(self.dog.photo, 300), default_storage.url(variant_name(self.name, 300, 'jpeg')))
+            with self.assertNumQueries(0):  # Признак копий уже в кеше
+                self.assertIn('_600.webp 600w', media_srcset(self.dog.photo, 'webp'))
+        self.assertIn('_300.webp', self.card())  # Карточка сброшена сменой версии MediaFile
+
+    def test_failed_file_falls_back_to_original(self):
+        default_storage.delete(self.name)
+        with self.assertLogs('dogs.images', level='ERROR'):
+            self.assertEqual(generate_pending_variants(), 1)
+        self.assertIsNone(MediaFile.objects.get(name=self.name).has_variants)
+        self.assertEqual(generate_pending_variants(), 0)  # Не повторяется
+        self.assertEqual(dogs_media(self.dog.photo, 300), f'/media/{self.name}')
+
+
+class CategoryCacheTest(TestCase):
+    """Справочник пород читается из кеша без запросов и сбрасывается при изменении породы."""
+
+    def setUp(self):
+        cache.clear()
+        invalidate_categories_cache()
+        self.category = Category.objects.create(name='Овчарка', description='-')
+
+    def test_cached_until_changed(self):
+        self.assertEqual([c.name for c in get_categories_cache()], ['Овчарка'])
+        with self.assertNumQueries(0):
+            get_categories_cache()
+            DogForm()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.name = 'Немецкая овчарка'
+            self.category.save()
+        self.assertEqual([c.name for c in get_categories_cache()], ['Немецкая овчарка'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+        self.assertEqual(get_categories_cache(), ())
+
+    def test_form_rejects_category_deleted_in_other_process(self):
+        get_categories_cache()
+        stale_l1 = dict(_categories_l1)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.category.delete()
+        _categories_l1.update(stale_l1, expires=time.monotonic() + 60)  # L1 другого процесса еще не истек
+        self.assertEqual(len(get_categories_cache()), 1)
+
+        form = DogForm(data={'name': 'Рекс', 'category': stale_l1['items'][0].pk})
+        self.assertFalse(form.is_valid())
+        self.assertIn('category', form.errors)
+
+    def test_dog_changes_keep_catalogue(self):
+        get_categories_cache()
+        version = get_model_version('dogs.Category')
+        with self.captureOnCommitCallbacks(execute=True):
+            dog = Dog.objects.create(name='Рекс', category=self.category)
+        self.assertEqual(with_dog_counts(get_categories_cache(), get_category_counts())[0].active_dog_count, 1)
+        self.assertNotIn('active_dog_count', get_categories_cache()[0].__dict__)  # Счетчики не в справочнике
+
+        with self.captureOnCommitCallbacks(execute=True):
+            bulk_set_active(Dog, User.objects.create(email='admin@test.ru', is_superuser=True), [dog.pk], False)
+        self.assertEqual(get_model_version('dogs.Category'), version)  # Страницы и карточки с породами не сброшены
+        with self.assertNumQueries(0):
+            self.assertEqual(get_category_counts(), {self.category.pk: 1})  # До истечения CATEGORY_COUNTS_TIMEOUT
+        cache.delete(CATEGORY_COUNTS_KEY)
+        self.assertEqual(get_category_counts(), {self.category.pk: 0})
+
+
+class DogViewsTest(TestCase):
+    """Просмотры собак доходят до базы без потерь, письмо о юбилейном просмотре - ровно одно."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(email='owner@test.ru')
+        self.client.force_login(User.objects.create(email='viewer@test.ru'))
+        category = Category.objects.create(name='Овчарка', description='-')
+        self.dogs = [Dog.objects.create(name=f'Рекс {i}', category=category, owner=self.owner) for i in range(2)]
+
+    def view(self, dog, times=1):
+        for _ in range(times):
+            response = self.client.get(reverse('dogs:detail_dog', args=[dog.pk]))
+        return response.context['views']
+
+    def milestone_emails(self):
+        return list(OutgoingEmail.objects.filter(subject__contains='просмотров').values_list('subject', flat=True))
+
+    def test_written_through_without_shared_cache(self):
+        self.assertEqual(self.view(self.dogs[0], 3), 3)
+        self.dogs[0].refresh_from_db()
+        self.assertEqual(self.dogs[0].views, 3)
+        self.assertFalse(PendingViews.objects.exists())
+
+    @override_settings(DOG_VIEWS_WRITE_BEHIND=True, DOG_VIEWS_FLUSH_THRESHOLD=5)
+    def test_threshold_and_flush(self):
+        self.assertEqual(self.view(self.dogs[0], 3), 3)
+        self.view(self.dogs[1], 7)
+        self.assertEqual(set(PendingViews.objects.values_list('dog_id', flat=True)), {d.pk for d in self.dogs})
+        self.assertEqual(Dog.objects.get(pk=self.dogs[1].pk).views, 5)  # Порог: 5 просмотров записаны
+
+        self.assertEqual(flush_dog_views(), 5)
+        self.assertEqual([d.views for d in Dog.objects.order_by('pk')], [3, 7])
+        self.assertFalse(PendingViews.objects.exists())
+        self.assertEqual(flush_dog_views(), 0)
+
+        self.view(self.dogs[0])  # Первый просмотр после записи снова отмечает собаку
+        self.assertEqual(list(PendingViews.objects.values_list('dog_id', flat=True)), [self.dogs[0].pk])
+
+    @override_settings(DOG_VIEWS_WRITE_BEHIND=True, DOG_VIEWS_FLUSH_THRESHOLD=100)
+    def test_interleaved_flushes_count_once(self):
+        Dog.objects.filter(pk=self.dogs[0].pk).update(views=15)
+        self.view(self.dogs[0], 5)
+        backend = caches['default']
+        get_many = backend.get_many
+        flushed = []
+
+        def interleaved_get_many(keys):
+            counts = get_many(keys)  # Обе записи прочитали 5 просмотров
+            if len(flushed) == 0:
+                flushed.append(None)
+                flushed.append(flush_dog_views([self.dogs[0].pk]))  # Вторая запись успевает раньше первой
+            return counts
+
+        with mock.patch.object(backend, 'get_many', interleaved_get_many):
+            flushed.append(flush_dog_views([self.dogs[0].pk]))
+        self.assertEqual(flushed, [None, 5, 0])
+        self.assertEqual(Dog.objects.get(pk=self.dogs[0].pk).views, 20)
+        self.assertEqual(self.milestone_emails(), ['20 просмотров Рекс 0'])
+        self.assertEqual(cache.get(f'dog_views:{self.dogs[0].pk}'), 0)
+
+    def test_milestone_from_saved_value(self):
+        Dog.objects.filter(pk=self.dogs[0].pk).update(views=18)
+        self.assertEqual(save_dog_views({self.dogs[0].pk: 1}), {self.dogs[0].pk: 19})
+        self.assertEqual(self.milestone_emails(), [])
+        save_dog_views({self.dogs[0].pk: 3})
+        save_dog_views({self.dogs[0].pk: 3})
+        self.assertEqual(self.milestone_emails(), ['20 просмотров Рекс 0'])
+        save_dog_views({self.dogs[0].pk: 40})
+        self.assertEqual(len(self.milestone_emails()), 3)  # 40 и 60
+
+    def test_stale_snapshot_does_not_repeat_milestone(self):
+        Dog.objects.filter(pk=self.dogs[0].pk).update(views=19)
+        self.view(self.dogs[0])
+        Dog.objects.filter(pk=self.dogs[0].pk).update(views=19)  # Другой процесс видел то же значение
+        self.view(self.dogs[0])
+        self.assertEqual(len(self.milestone_emails()), 2)  # Каждое значение 20 - одно письмо
+        self.assertEqual(Dog.objects.get(pk=self.dogs[0].pk).views, 20)
+
+    def test_flush_command_refuses_process_local_cache(self):
+        with self.assertRaises(CommandError):
+            call_command('flush_dog_views')
+
+
+class FragmentCacheTest(TestCase):
+    """Карточки кешируются по версии объекта и роли пользователя, страницы - только для анонимных."""
+
+    def setUp(self):
+        cache.clear()
+        self.owner = User.objects.create(email='owner@test.ru')
+        self.other = User.objects.create(email='other@test.ru')
+        self.dog = Dog.objects.create(
+            name='Рекс', category=Category.objects.create(name='Овчарка', description='-'), owner=self.owner
+        )
+
+    def render(self, user):
+        return render_cards(Dog.objects.all(), 'dogs/includes/inc_dog_card.html', user)
+
+    def test_card_depends_on_viewer_and_version(self):
+        self.assertIn('Изменить', self.render(self.owner))
+        self.assertNotIn('Изменить', self.render(self.other))
+        with self.assertNumQueries(0):
+            self.assertIn('Рекс', render_cards([self.dog], 'dogs/includes/inc_dog_card.html', self.other))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.dog.name = 'Мухтар'
+            self.dog.save()
+        self.assertIn('Мухтар', self.render(self.other))
+
+    def test_page_cached_for_anonymous_only(self):
+        self.assertContains(self.client.get(reverse('dogs:index')), 'Вход')
+        with self.assertNumQueries(0):
+            self.client.get(reverse('dogs:index'))
+
+        self.client.force_login(self.owner)
+        self.assertContains(self.client.get(reverse('dogs:index')), 'Выход')
+
+
+class KennelTransferTest(TestCase):
+    """Экспорт и потоковый импорт данных питомника."""
+
+    def test_json_array_read_in_small_chunks(self):
+        records = [{'model': 'dogs.category', 'pk': i, 'fields': {'name': f'Порода [{i}]', 'description': '}'}}
+                   for i in range(5)]
+        file = StringIO(json.dumps(records, indent=1))
+        self.assertEqual(list(iter_json_array(file, chunk_size=7)), records)
+
+    def test_import_remaps_users_and_keeps_timestamps(self):
+        user = User.objects.create(email='breeder@test.ru')
+        records = [
+            {'model': 'users.user', 'pk': 500, 'fields': {'email': 'breeder@test.ru', 'first_name': 'Анна'}},
+            {'model': 'dogs.category', 'pk': 7, 'fields': {'name': 'Колли', 'description': '-'}},
+            {'model': 'dogs.dog', 'pk': 9, 'fields': {'name': 'Лесси', 'category': 7, 'owner': 500}},
+            {'model': 'dogs.dog', 'pk': 10, 'fields': {'name': 'Без породы', 'category': 99, 'owner': None}},
+            {'model': 'reviews.review', 'pk': 3, 'fields': {
+                'title': 'Отлично', 'slug': 'otlichno', 'content': '-', 'created': '2020-01-02T03:04:05Z',
+                'sign_of_review': True, 'autor': 500, 'dog': 9,
+            }},
+        ]
+        importer = KennelImporter(batch_size=2)
+        for record in records:
+            importer.add(record)
+        stats = importer.finish()
+
+        user.refresh_from_db()
+        self.assertEqual(user.first_name, 'Анна')
+        self.assertEqual(Dog.objects.get(pk=9).owner_id, user.pk)
+        self.assertEqual(stats['dogs.dog']['skipped'], 1)
+        review = Review.objects.get(pk=3)
+        self.assertEqual((review.autor_id, review.created.year), (user.pk, 2020))
+
+        output = StringIO()
+        write_records(iter_export_records(Dog), output, 'jsonl')
+        self.assertEqual(json.loads(output.getvalue())['fields']['owner'], user.pk)
+
+
+class CounterTest(TestCase):
+    """Счетчики собак породы и отзывов собаки меняются вместе с данными и восстанавливаются recount."""
+
+    def setUp(self):
+        self.shepherd = Category.objects.create(name='Овчарка', description='-')
+        self.collie = Category.objects.create(name='Колли', description='-')
+
+    def assertCounts(self, obj, *expected):
+        obj.refresh_from_db()
+        if isinstance(obj, Category):
+            fields = ('dog_count', 'active_dog_count')
+        else:
+            fields = ('review_count', 'active_review_count')
+        self.assertEqual(tuple(getattr(obj, field) for field in fields), expected)
+
+    def test_dog_counters(self):
+        dog = Dog.objects.create(name='Рекс', category=self.shepherd)
+        Dog.objects.create(name='Мухтар', category=self.shepherd, is_active=False)
+        self.assertCounts(self.shepherd, 2, 1)
+
+        dog.is_active = False
+        dog.save()
+        self.assertCounts(self.shepherd, 2, 0)
+
+        dog = Dog.objects.get(pk=dog.pk)
+        dog.category = self.collie
+        dog.is_active = True
+        dog.save()
+        self.assertCounts(self.shepherd, 1, 0)
+        self.assertCounts(self.collie, 1, 1)
+
+        dog.delete()
+        self.assertCounts(self.collie, 0, 0)
+
+    def test_review_counters_and_recount(self):
+        dog = Dog.objects.create(name='Рекс', category=self.shepherd)
+        review = Review.objects.create(title='Отлично', slug='otlichno', content='-', dog=dog)
+        Review.objects.create(title='Плохо', slug='ploho', content='-', dog=dog, sign_of_review=False)
+        self.assertCounts(dog, 2, 1)
+        review.delete()
+        self.assertCounts(dog, 1, 0)
+
+        Category.objects.update(dog_count=10)
+        Dog.objects.update(active_review_count=5)
+        fixed = recount_counters()
+        self.assertEqual(fixed, {'dogs.Category': 2, 'dogs.Dog': 1})
+        self.assertCounts(self.shepherd, 1, 1)
+        self.assertCounts(dog, 1, 0)
+
+
+class BulkModerationTest(TestCase):
+    """Массовая модерация: права проверяются на весь набор, счетчики и кеши обновляются без сигналов."""
+
+    def setUp(self):
+        self.owner = User.objects.create(email='owner@test.ru', role=UserRoles.USER)
+        self.moderator = User.objects.create(email='moderator@test.ru', role=UserRoles.MODERATOR)
+        self.category = Category.objects.create(name='Овчарка', description='-')
+        self.own = [Dog.objects.create(name=f'Свой {i}', category=self.category, owner=self.owner, is_active=False)
+                    for i in range(3)]
+        self.other = Dog.objects.create(name='Чужой', category=self.category, is_active=False)
+        self.pks = [dog.pk for dog in self.own] + [self.other.pk]
+
+    def test_user_activates_only_own_dogs(self):
+        self.client.force_login(self.owner)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('dogs:bulk_moderation_dogs'), {'action': 'activate', 'pk': self.pks},
+                                        HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json(), {'requested': 4, 'changed': 3, 'denied': 1})
+        self.assertEqual(sum('UPDATE "dogs_dog"' in query['sql'] for query in queries), 1)
+        self.assertEqual(Dog.objects.filter(is_active=True).count(), 3)
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.dog_count, self.category.active_dog_count), (4, 3))
+
+    def test_moderator_deletes_batch(self):
+        Review.objects.create(title='Спам', slug='spam', content='-', dog=self.other)
+        self.moderator.user_permissions.add(Permission.objects.get(codename='delete_dog'))
+        self.client.force_login(self.moderator)
+        response = self.client.post(reverse('dogs:bulk_moderation_dogs'), {'action': 'delete', 'pk': self.pks})
+        self.assertRedirects(response, reverse('dogs:deactivated_list_dogs'))
+        self.assertFalse(Dog.objects.exists())
+        self.category.refresh_from_db()
+        self.assertEqual((self.category.dog_count, self.category.active_dog_count), (0, 0))
+
+    def test_delete_requires_permission(self):
+        self.client.force_login(self.owner)
+        response = self.client.post(reverse('dogs:bulk_moderation_dogs'), {'action': 'delete', 'pk': self.pks},
+                                    HTTP_ACCEPT='application/json')
+        self.assertEqual(response.json()['changed'], 0)
+        self.assertEqual(Dog.objects.count(), 4)
+
+    def test_deactivated_list_shows_selection(self):
+        self.client.force_login(self.moderator)
+        response = self.client.get(reverse('dogs:deactivated_list_dogs'))
+        self.assertContains(response, f'name="pk" value="{self.own[0].pk}"')
+
+
+class ExportTest(TestCase):
+    """Потоковая выгрузка: ответ отдается по кускам, все строки читаются одним запросом со связанными объектами."""
+
+    def setUp(self):
+        self.staff = User.objects.create(email='staff@test.ru', is_staff=True)
+        self.category = Category.objects.create(name='Лайка', description='-')
+        for i in range(5):
+            Dog.objects.create(name=f'Собака {i}', category=self.category, owner=self.staff)
+
+    def test_csv_streams_all_rows(self):
+        self.client.force_login(self.staff)
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('dogs:export', args=('dogs', 'csv')))
+            content = b''.join(response.streaming_content).decode()
+        self.assertTrue(response.streaming)
+        self.assertIn('attachment; filename="dogs-', response['Content-Disposition'])
+        lines = content.lstrip('\ufeff').splitlines()
+        self.assertTrue(lines[0].startswith('id,кличка,порода'))
+        self.assertEqual(len(lines), 6)
+        self.assertIn('Лайка,', lines[1])
+        self.assertEqual(len([q for q in queries.captured_queries if 'dogs_dog' in q['sql']]), 1)
+
+    def test_jsonl_rows(self):
+        self.client.force_login(self.staff)
+        response = self.client.get(reverse('dogs:export', args=('breeders', 'jsonl')))
+        rows = [json.loads(line) for line in b''.join(response.streaming_content).decode().splitlines()]
+        self.assertEqual([row['email'] for row in rows], ['staff@test.ru'])
+
+    def test_requires_staff_and_known_export(self):
+        url = reverse('dogs:export', args=('dogs', 'csv'))
+        self.client.force_login(User.objects.create(email='user@test.ru'))
+        self.assertEqual(self.client.get(url).status_code, 302)
+        self.client.force_login(self.staff)
+        self.assertEqual(self.client.get(reverse('dogs:export', args=('dogs', 'xml'))).status_code, 404)
+
+
+class AdminScaleTest(TestCase):
+    """Список админки не загружает связанные объекты для фильтров и не пересчитывает всю таблицу."""
+
+    def setUp(self):
+        self.admin = User.objects.create(email='admin@test.ru', is_staff=True, is_superuser=True)
+        category = Category.objects.create(name='Овчарка', description='-')
+        for i in range(5):
+            dog = Dog.objects.create(name=f'Собака {i}', category=category, owner=self.admin)
+            Review.objects.create(title=f'Отзыв {i}', slug=f'review-{i}', content='-', dog=dog, autor=self.admin)
+        self.client.force_login(self.admin)
+
+    def test_review_changelist_filters_by_autocomplete(self):
+        dog = Dog.objects.first()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:reviews_review_changelist'), {'dog__id__exact': dog.pk})
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'data-field-name="dog"')
+        self.assertContains(response, 'Отзыв 0</a>')
+        self.assertNotContains(response, 'Отзыв 1</a>')  # Только отзыв выбранной собаки
+        self.assertNotContains(response, 'Собака 1')  # Фильтр не выводит всех собак
+        self.assertFalse([query for query in queries if 'FROM "dogs_dog"' in query['sql']
+                          and 'INNER JOIN' not in query['sql'] and 'IN (' not in query['sql']])
+
+
+class QueryPlanTest(TestCase):
+    """
+    Горячие списки читают собак, отзывы и пользователей по индексам, а не полным сканированием таблицы.
+
+    Запросы представлений перехватываются и передаются в EXPLAIN QUERY PLAN (SQLite тестовой базы).
+    Полным считается сканирование "SCAN <таблица>" без индекса, которое не может остановиться после
+    LIMIT строк: запрос без LIMIT или с сортировкой во временном B-дереве. COUNT(*) для пагинации
+    не проверяется: он кешируется (get_cached_count), а для фильтра, под который попадает большая
+    часть строк, сканирование таблицы дешевле индекса.
+    """
+
+    HOT_TABLES = ('dogs_dog', 'reviews_review', 'users_user')
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.moderator = User.objects.create(email='moderator@test.ru', role=UserRoles.MODERATOR)
+        owners = User.objects.bulk_create([User(email=f'owner{i}@test.ru', is_active=i % 10 != 0) for i in range(50)])
+        cls.owner = owners[1]
+        cls.category = Category.objects.create(name='Овчарка', description='-')
+        dogs = Dog.objects.bulk_create([
+            Dog(name=f'Собака {i:04}', category=cls.category, owner=owners[i % 50], is_active=i % 5 != 0)
+            for i in range(500)
+        ])
+        Review.objects.bulk_create([
+            Review(title=f'Отзыв {i}', slug=f'review-{i}', content='-', dog=dogs[i], autor=owners[i % 50],
+                   sign_of_review=i % 7 != 0)
+            for i in range(500)
+        ])
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+
+    def assertNoTableScans(self, url, user):
+        cache.clear()
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        scans = []
+        with connection.cursor() as cursor:
+            for query in queries:
+                sql = query['sql']
+                if not sql.startswith('SELECT') or sql.startswith('SELECT COUNT(*)') \
+                        or not any(table in sql for table in self.HOT_TABLES):
+                    continue
+                cursor.execute('EXPLAIN QUERY PLAN ' + sql)
+                plan = [row[-1] for row in cursor.fetchall()]
+                bounded = ' LIMIT ' in sql and not any('TEMP B-TREE' in step for step in plan)
+                scans += [(step, sql) for step in plan
+                          if step.split(' ')[0] == 'SCAN' and step.split(' ')[1] in self.HOT_TABLES
+                          and 'USING' not in step and not bounded]
+        self.assertFalse(scans, f'{url}: полное сканирование таблицы')
+
+    @skipUnlessDBFeature('supports_partial_indexes')
+    def test_hot_views_use_indexes(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('EXPLAIN QUERY PLAN есть только в SQLite')
+        self.assertNoTableScans(reverse('dogs:list_dogs'), self.owner)
+        self.assertNoTableScans(reverse('dogs:deactivated_list_dogs'), self.owner)
+        self.assertNoTableScans(reverse('dogs:deactivated_list_dogs'), self.moderator)
+        self.assertNoTableScans(reverse('dogs:category_dogs', args=[self.category.pk]), self.owner)
+        self.assertNoTableScans(reverse('reviews:list_reviews'), self.owner)
+        self.assertNoTableScans(reverse('reviews:deactivated_reviews'), self.owner)
+        self.assertNoTableScans(reverse('users:users_list'), self.owner)
+
+
+class PedigreeTest(TestCase):
+    """Родословная: таблица замыкания поддерживается при записи, запросы не зависят от глубины."""
+
+    def setUp(self):
+        self.owner = User.objects.create(email='owner@test.ru')
+        self.category = Category.objects.create(name='Овчарка', description='-')
+        dog = lambda name: Dog.objects.create(name=name, category=self.category, owner=self.owner)  # noqa: E731
+        # Полнородные брат и сестра sire и dam - дети founder_a и founder_b, puppy - их щенок
+        self.founder_a, self.founder_b, self.sire, self.dam, self.puppy = (
+            dog(name) for name in ('Альфа', 'Бета', 'Гром', 'Дина', 'Ерш'))
+        for child, parents in ((self.sire, (self.founder_a, self.founder_b)),
+                               (self.dam, (self.founder_a, self.founder_b)), (self.puppy, (self.sire, self.dam))):
+            for parent in parents:
+                Parent.objects.create(dog=child, parent_dog=parent, name=parent.name, category=self.category)
+
+    def test_ancestors_descendants_and_inbreeding(self):
+        with self.assertNumQueries(1):
+            ancestors = get_ancestors(self.puppy)
+        self.assertEqual([(row.ancestor.name, row.depth) for row in ancestors],
+                         [('Гром', 1), ('Дина', 1), ('Альфа', 2), ('Бета', 2)])
+        self.assertEqual({row.descendant for row in get_descendants(self.founder_a)},
+                         {self.sire, self.dam, self.puppy})
+        with self.assertNumQueries(1):
+            common = list(get_common_ancestors(self.sire, self.dam))
+        self.assertEqual([(dog, dog.dog_depth, dog.other_depth) for dog in common],
+                         [(self.founder_a, 1, 1), (self.founder_b, 1, 1)])
+        with self.assertNumQueries(1):
+            self.assertAlmostEqual(inbreeding_coefficient(self.puppy), 0.25)
+        self.assertEqual(inbreeding_coefficient(self.sire), 0)
+
+    def test_closure_follows_changes(self):
+        Parent.objects.get(dog=self.dam, parent_dog=self.founder_a).delete()
+        self.assertFalse(Ancestry.objects.filter(descendant=self.dam, ancestor=self.founder_a).exists())
+        self.assertTrue(Ancestry.objects.filter(descendant=self.puppy, ancestor=self.founder_a).exists())  # Через sire
+        self.founder_b.delete()
+        self.assertEqual({row.ancestor for row in get_ancestors(self.puppy)},
+                         {self.sire, self.dam, self.founder_a})
+        parent = Parent.objects.get(dog=self.sire, parent_dog=self.founder_a)
+        parent.parent_dog = None
+        parent.save()
+        self.assertEqual({row.ancestor for row in get_ancestors(self.puppy)}, {self.sire, self.dam})
+
+    def test_detail_tree_and_cycle_validation(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('dogs:detail_dog', args=[self.puppy.pk]))
+        self.assertContains(response, 'Коэффициент инбридинга: 25,00%')
+        self.assertContains(response, reverse('dogs:detail_dog', args=[self.founder_a.pk]), count=2)
+
+        response = self.client.post(reverse('dogs:update_dog', args=[self.founder_a.pk]), {
+            'name': 'Альфа', 'category': self.category.pk,
+            'parent_set-TOTAL_FORMS': 1, 'parent_set-INITIAL_FORMS': 0,
+            'parent_set-MIN_NUM_FORMS': 0, 'parent_set-MAX_NUM_FORMS': 1000,
+            'parent_set-0-parent_dog': self.puppy.pk,
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, 'Собака не может быть своим предком')
+        self.assertFalse(Parent.objects.filter(dog=self.founder_a).exists())
+
+        litter = Dog.objects.create(name='Жук', category=self.category, owner=self.owner)
+        self.client.post(reverse('dogs:update_dog', args=[litter.pk]), {
+            'name': 'Жук', 'category': self.category.pk,
+            'parent_set-TOTAL_FORMS': 1, 'parent_set-INITIAL_FORMS': 0,
+            'parent_set-MIN_NUM_FORMS': 0, 'parent_set-MAX_NUM_FORMS': 1000,
+            'parent_set-0-parent_dog': self.puppy.pk,
+        })
+        self.assertEqual(Parent.objects.get(dog=litter).name, 'Ерш')  # Кличка взята из карточки собаки
+        self.assertEqual(len(get_ancestors(litter)), 5)
+
+
+class DogUpdateViewTest(QueryCountTestMixin, TestCase):
+    """Сохранение собаки с родителями выполняется постоянным числом запросов."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create(email='owner@test.ru')
+        cls.category = Category.objects.create(name='Овчарка', description='-')
+        cls.dog = Dog.objects.create(name='Рекс', category=cls.category, owner=cls.owner)
+        cls.url = reverse('dogs:update_dog', args=[cls.dog.pk])
+
+    def setUp(self):
+        self.client.force_login(self.owner)
+
+    def add_parents(self, count):
+        Parent.objects.bulk_create(
+            Parent(dog=self.dog, name=f'Предок {i}', category=self.category) for i in range(count)
+        )
+
+    def post_parents(self):
+        """Переименовывает всех родителей, удаляет первого и добавляет нового одной отправкой формы."""
+        parents = list(Parent.objects.filter(dog=self.dog).order_by('pk'))
+        data = {
+            'name': 'Рекс II', 'category': self.category.pk,
+            'parent_set-TOTAL_FORMS': len(parents) + 1, 'parent_set-INITIAL_FORMS': len(parents),
+            'parent_set-MIN_NUM_FORMS': 0, 'parent_set-MAX_NUM_FORMS': 1000,
+        }
+        for i, parent in enumerate(parents):
+            data.update({f'parent_set-{i}-id': parent.pk, f'parent_set-{i}-dog': self.dog.pk,
+                         f'parent_set-{i}-name': f'{parent.name}!', f'parent_set-{i}-category': self.category.pk})
+        data['parent_set-0-DELETE'] = 'on'
+        data.update({f'parent_set-{len(parents)}-name': 'Новый предок',
+                     f'parent_set-{len(parents)}-category': self.category.pk})
+        response = self.client.post(self.url, data)
+        self.assertRedirects(response, reverse('dogs:detail_dog', args=[self.dog.pk]), fetch_redirect_response=False)
+
+    def test_saves_parents(self):
+        self.assertContains(self.client.get(self.url), 'parent_set-TOTAL_FORMS')
+        self.add_parents(2)
+        self.post_parents()
+        self.assertEqual(Parent.objects.filter(dog=self.dog, name__endswith='!').count(), 1)
+        self.assertTrue(Parent.objects.filter(dog=self.dog, name='Новый предок').exists())
+
+    def test_shows_all_errors(self):
+        data = {
+            'name': '', 'category': self.category.pk,
+            'parent_set-TOTAL_FORMS': 1, 'parent_set-INITIAL_FORMS': 0,
+            'parent_set-MIN_NUM_FORMS': 0, 'parent_set-MAX_NUM_FORMS': 1000,
+            'parent_set-0-name': '', 'parent_set-0-category': self.category.pk,
+        }
+        formset_checked = []
+        original_form_invalid = DogUpdateView.form_invalid
+
+        def form_invalid(view, form):
+            formset_checked.append(view.formset._errors is not None)
+            return original_form_invalid(view, form)
+
+        with mock.patch.object(DogUpdateView, 'form_invalid', form_invalid):
+            response = self.client.post(self.url, data)
+        self.assertEqual(formset_checked, [True])  # Набор проверен до вывода ошибок, хотя форма собаки неверна
+        self.assertIn('name', response.context['form'].errors)
+        self.assertIn('name', response.context['formset'].errors[0])
+
+    def test_constant_queries(self):
+        self.add_parents(1)
+        self.post_parents()  # Первое сохранение добавляет новые слова в поисковый словарь
+        Parent.objects.all().delete()
+        self.assertConstantQueries(self.post_parents, self.add_parents)
+
+
+class DogToggleActivityTest(TestCase):
+    """Активность собаки переключается только POST-запросом с CSRF-токеном."""
+
+    def setUp(self):
+        self.owner = User.objects.create(email='owner@test.ru')
+        self.dog = Dog.objects.create(name='Рекс', category=Category.objects.create(name='Овчарка', description='-'),
+                                      owner=self.owner)
+        self.url = reverse('dogs:toggle_activity_dog', args=[self.dog.pk])
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(self.owner)
+
+    def test_get_does_not_change(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post(self.url).status_code, 403)  # Без CSRF-токена
+        self.dog.refresh_from_db()
+        self.assertTrue(self.dog.is_active)
+
+    def test_form_button_toggles(self):
+        response = self.client.get(reverse('dogs:update_dog', args=[self.dog.pk]))
+        self.assertContains(response, f'formaction="{self.url}"')
+        response = self.client.post(self.url, {'csrfmiddlewaretoken': response.context['csrf_token']})
+        self.assertRedirects(response, reverse('dogs:list_dogs'), fetch_redirect_response=False)
+        self.dog.refresh_from_db()
+        self.assertFalse(self.dog.is_active)
+
+
+class AsyncViewsTest(TestCase):
+    """Асинхронные представления для чтения (settings.ASYNC_VIEWS) выводят те же страницы, что и синхронные."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='reader@test.ru')
+        category = Category.objects.create(name='Хаски', description='-')
+        self.dogs = [Dog.objects.create(name=f'Пес {number}', category=category) for number in range(4)]
+        self.review = Review.objects.create(title='Отзыв', content='-', dog=self.dogs[0], autor=self.user)
+        use_async_views(True)
+        self.addCleanup(use_async_views, False)
+
+    async def test_pages(self):
+        response = await self.async_client.get(reverse('dogs:list_dogs'))
+        self.assertRedirects(response, '/user/?next=/dogs/', fetch_redirect_response=False)
+
+        await self.async_client.aforce_login(self.user)
+        response = await self.async_client.get(reverse('dogs:list_dogs'))
+        self.assertContains(response, 'Пес 0')
+        self.assertNotContains(response, 'Пес 3')  # Третья собака уже на следующей странице
+        next_query = response.context['page_obj'].next_query
+        next_page = await self.async_client.get(reverse('dogs:list_dogs') + '?' + next_query)
+        self.assertContains(next_page, 'Пес 3')
+
+        self.assertContains(await self.async_client.get(reverse('dogs:index')), 'Хаски')
+        self.assertContains(await self.async_client.get(reverse('dogs:detail_dog', args=[self.dogs[0].pk])), 'Пес 0')
+        self.assertContains(await self.async_client.get(reverse('reviews:list_reviews')), 'Отзыв')
+        self.assertContains(await self.async_client.get(reverse('reviews:detail_review', args=[self.review.slug])),
+                            'Отзыв')
+        self.assertContains(await self.async_client.get(reverse('users:profile_user_view', args=[self.user.pk])),
+                            'reader@test.ru')
+        response = await self.async_client.get(reverse('dogs:detail_dog', args=[0]))
+        self.assertEqual(response.status_code, 404)
+
+
+class BenchmarkTest(TestCase):
+    """Команда bench: заполнение базы, адреса маршрутов и сравнение с базовым отчетом."""
+
+    def test_seed_routes_and_baseline(self):
+        created = seed(users=3, categories=2, dogs=12, reviews=5, batch_size=4)
+        self.assertEqual(created, {'users': 3, 'categories': 2, 'dogs': 12, 'reviews': 5})
+        self.assertEqual(seed(users=3, categories=2, dogs=12, reviews=5)['dogs'], 0)  # Повторно не создаются
+        self.assertEqual(Category.objects.order_by('pk').first().dog_count, 6)  # Счетчики пересчитаны
+        self.assertTrue(Ancestry.objects.exists())  # Родословная построена по связям Parent
+
+        samples = {'dog': Dog.objects.first(), 'category': Category.objects.first(),
+                   'review': Review.objects.first(), 'user': User.objects.first()}
+        routes, skipped = get_routes(samples)
+        self.assertEqual(routes['dogs:detail_dog'], reverse('dogs:detail_dog', args=[samples['dog'].pk]))
+        self.assertIn('dogs:toggle_activity_dog', skipped)
+
+        self.client.force_login(User.objects.create(email='admin@test.ru', is_staff=True, is_superuser=True))
+        result = measure_route(self.client, routes['dogs:list_dogs'], iterations=3, warmup=1)
+        self.assertEqual(result['status'], 200)
+        self.assertGreater(result['bytes'], 0)
+
+        report = {'routes': {'dogs:list_dogs': result}}
+        self.assertEqual(compare_with_baseline(report, report), [])
+        slower = {'routes': {'dogs:list_dogs': {**result, 'p95_ms': result['p95_ms'] * 2 + 5,
+                                                'queries': result['queries'] + 1}}}
+        self.assertEqual(len(compare_with_baseline(slower, report)), 2)
+
+
+class LoadTestReportTest(TestCase):
+    """Команда loadtest: разбор смеси сценариев и сводка замеров."""
+
+    def test_mix_and_summary(self):
+        self.assertEqual(parse_mix('browse=3,detail=1'), {'browse': 3.0, 'detail': 1.0})
+        with self.assertRaises(ValueError):
+            parse_mix('browse=1,crawl=2')
+
+        samples = [('browse', 0.004, True), ('browse', 0.030, True), ('detail', 0.150, False), ('detail', 7.0, True)]
+        report = summarize(samples, elapsed=2)
+        self.assertEqual(report['total']['count'], 4)
+        self.assertEqual(report['total']['throughput'], 2)
+        self.assertEqual(report['detail']['error_rate'], 0.5)
+        self.assertEqual(report['browse']['histogram']['<=5ms'], 1)
+        self.assertEqual(report['browse']['histogram']['<=50ms'], 1)
+        self.assertEqual(report['detail']['histogram']['>5000ms'], 1)
+        self.assertEqual(report['detail']['p99_ms'], 7000)
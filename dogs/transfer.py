@@ -0,0 +1,376 @@
+import csv
+import json
+import re
+import time
+from datetime import date, datetime, time as datetime_time
+from decimal import Decimal
+
+from django.apps import apps
+from django.core.management.color import no_style
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connection, transaction
+
+from dogs.caching import bump_model_version, forget_object_versions
+from dogs.counters import recount_counters
+from dogs.pedigree import rebuild_pedigree
+from dogs.services import invalidate_categories_cache
+from search.services import index_objects
+
+# Модели в порядке зависимостей: при экспорте родительские строки идут раньше дочерних
+KENNEL_MODELS = ('users.user', 'dogs.category', 'dogs.dog', 'dogs.parent', 'reviews.review')
+# Естественные ключи: строка с тем же значением в базе обновляется, даже если pk в файле другой
+NATURAL_KEYS = {'users.user': 'email'}
+FORMATS = ('json', 'jsonl', 'csv')
+
+_JSON_SEPARATORS = re.compile(r'[\s,]*')
+
+
+def get_kennel_model(label):
+    """
+    Возвращает модель по метке, проверяя, что она поддерживается импортом и экспортом.
+
+    Args:
+        label (str): Метка модели, например 'dogs.dog'.
+
+    Returns:
+        type: Класс модели.
+
+    Raises:
+        ValueError: Модель не входит в KENNEL_MODELS.
+    """
+    label = label.lower()
+    if label not in KENNEL_MODELS:
+        raise ValueError(f'Неподдерживаемая модель {label}, допустимы: {", ".join(KENNEL_MODELS)}')
+    return apps.get_model(label)
+
+
+def get_transfer_fields(model):
+    """Возвращает переносимые поля модели: все хранимые в таблице, кроме первичного ключа."""
+    return [field for field in model._meta.concrete_fields if not field.primary_key]
+
+
+def _to_text(value):
+    """Преобразует значение из базы в строку для CSV."""
+    if value is None:
+        return ''
+    if isinstance(value, (date, datetime, datetime_time)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return str(value)
+    return value
+
+
+def iter_export_records(model, batch_size=1000):
+    """
+    Выдает строки модели по одной в формате фикстур Django: {'model', 'pk', 'fields'}.
+
+    Строки читаются итератором пачками по batch_size, поэтому память не зависит от размера таблицы.
+    Внешние ключи выгружаются значением первичного ключа, как в dumpdata.
+
+    Args:
+        model (type): Класс модели.
+        batch_size (int): Количество строк, читаемых из базы за раз.
+
+    Yields:
+        dict: Запись одной строки.
+    """
+    fields = get_transfer_fields(model)
+    label = model._meta.label_lower
+    rows = model._default_manager.order_by('pk').values_list('pk', *[field.attname for field in fields])
+    for pk, *values in rows.iterator(chunk_size=batch_size):
+        yield {'model': label, 'pk': pk, 'fields': {field.name: value for field, value in zip(fields, values)}}
+
+
+def write_records(records, file, file_format, model=None):
+    """
+    Записывает записи в файл в формате json (массив), jsonl (строка на запись) или csv.
+
+    Args:
+        records (Iterable[dict]): Записи из iter_export_records.
+        file (TextIO): Открытый файл.
+        file_format (str): Формат из FORMATS.
+        model (type | None): Модель для заголовка CSV (в CSV - только одна модель).
+
+    Returns:
+        int: Количество записанных записей.
+    """
+    count = 0
+    if file_format == 'csv':
+        writer = csv.writer(file)
+        writer.writerow(['pk'] + [field.name for field in get_transfer_fields(model)])
+        for record in records:
+            writer.writerow([record['pk']] + [_to_text(value) for value in record['fields'].values()])
+            count += 1
+        return count
+
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    if file_format == 'json':
+        file.write('[')
+    for record in records:
+        if file_format == 'json':
+            file.write(',\n' if count else '\n')
+        file.write(encoder.encode(record))
+        if file_format == 'jsonl':
+            file.write('\n')
+        count += 1
+    if file_format == 'json':
+        file.write('\n]\n')
+    return count
+
+
+def iter_json_array(file, chunk_size=1 << 16):
+    """
+    Читает элементы JSON-массива по одному, не загружая файл целиком.
+
+    Файл читается кусками по chunk_size символов; каждый элемент разбирается
+    JSONDecoder.raw_decode, как только он целиком оказывается в буфере.
+
+    Args:
+        file (TextIO): Открытый файл с JSON-массивом (например, фикстура dumpdata).
+        chunk_size (int): Размер читаемого куска.
+
+    Yields:
+        dict: Очередной элемент массива.
+
+    Raises:
+        ValueError: Файл не является JSON-массивом или обрывается.
+    """
+    decoder = json.JSONDecoder()
+    buffer = file.read(chunk_size).lstrip()
+    if not buffer.startswith('['):
+        raise ValueError('Ожидается JSON-массив')
+    position = 1
+
+    while True:
+        position = _JSON_SEPARATORS.match(buffer, position).end()
+        if position < len(buffer) and buffer[position] == ']':
+            return
+        try:
+            if position == len(buffer):
+                raise json.JSONDecodeError('Нет данных', buffer, position)
+            item, position = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            chunk = file.read(chunk_size)  # Элемент не поместился в буфер - дочитываем файл
+            if not chunk:
+                raise ValueError('Неожиданный конец JSON-файла или ошибка в записи')
+            buffer, position = buffer[position:] + chunk, 0
+            continue
+        yield item
+
+
+def iter_jsonl(file):
+    """Читает записи JSON Lines: по одному JSON-объекту в строке."""
+    for line in file:
+        if line.strip():
+            yield json.loads(line)
+
+
+def iter_csv(file, model):
+    """
+    Читает записи CSV с заголовком 'pk,<поле>,...' одной модели.
+
+    Пустое значение в CSV для поля, допускающего NULL, считается NULL.
+
+    Args:
+        file (TextIO): Открытый CSV-файл.
+        model (type): Модель, строки которой содержит файл.
+
+    Yields:
+        dict: Запись в формате фикстур.
+    """
+    nullable = {field.name for field in get_transfer_fields(model) if field.null}
+    label = model._meta.label_lower
+    for row in csv.DictReader(file):
+        pk = row.pop('pk', None) or None
+        fields = {name: None if value == '' and name in nullable else value for name, value in row.items()}
+        yield {'model': label, 'pk': pk, 'fields': fields}
+
+
+def read_records(file, file_format, model=None):
+    """Возвращает итератор записей файла в формате json, jsonl или csv."""
+    if file_format == 'json':
+        return iter_json_array(file)
+    if file_format == 'jsonl':
+        return iter_jsonl(file)
+    return iter_csv(file, model)
+
+
+class KennelImporter:
+    """
+    Потоковый импорт записей в формате фикстур пачками bulk_create/bulk_update.
+
+    Записи копятся в буфере своей модели и записываются пачками по batch_size.
+    Перед записью пачки записываются буферы моделей, на которые она ссылается,
+    поэтому внешние ключи можно проверить одним запросом на поле: строки со
+    ссылкой на отсутствующий объект пропускаются (для обязательного поля) или
+    получают NULL. Строки с существующим pk (или естественным ключом из NATURAL_KEYS)
+    обновляются, остальные создаются с pk из файла. В памяти хранятся только
+    текущие пачки и словари переназначения pk, поэтому расход памяти не зависит
+    от размера файла.
+
+    Атрибуты:
+        batch_size (int): Размер пачки.
+        index (bool): Обновлять поисковый индекс для записанных объектов.
+        progress (callable | None): Функция вывода прогресса, получает строку.
+        stats (dict): Метка модели -> счетчики created, updated, skipped, detached.
+    """
+
+    def __init__(self, batch_size=1000, index=True, progress=None, progress_every=10000):
+        self.batch_size = batch_size
+        self.index = index
+        self.progress = progress
+        self.progress_every = progress_every
+        self.buffers = {}
+        self.pk_maps = {}  # Метка модели -> {pk в файле: pk в базе} для строк, найденных по естественному ключу
+        self.stats = {}
+        self.started = time.monotonic()
+        self.total = 0
+
+    def add(self, record):
+        """Добавляет запись в буфер ее модели, записывая полный буфер в базу."""
+        model = get_kennel_model(record['model'])
+        label = model._meta.label_lower
+        buffer = self.buffers.setdefault(label, [])
+        buffer.append(self.build(model, record))
+        if len(buffer) >= self.batch_size:
+            self.flush(label)
+
+    @staticmethod
+    def build(model, record):
+        """Создает несохраненный объект модели из записи, приводя значения к типам полей."""
+        values = {}
+        for field in get_transfer_fields(model):
+            if field.name not in record['fields']:
+                continue  # Поле отсутствует в файле - остается значение по умолчанию
+            value = record['fields'][field.name]
+            values[field.attname] = None if value is None else field.to_python(value)
+        obj = model(**values)
+        obj.pk = model._meta.pk.to_python(record['pk']) if record.get('pk') is not None else None
+        return obj
+
+    def flush(self, label=None):
+        """Записывает буфер модели label (или все буферы) вместе с буферами моделей, от которых он зависит."""
+        labels = [label] if label else list(KENNEL_MODELS)
+        for current in labels:
+            model = apps.get_model(current)
+            for field in model._meta.concrete_fields:
+                related = field.related_model
+                if related is not None and related._meta.label_lower in self.buffers:
+                    self.flush(related._meta.label_lower)
+            objects = self.buffers.pop(current, [])
+            if objects:
+                self.write(model, objects)
+
+    def resolve_foreign_keys(self, model, objects):
+        """
+        Переназначает и проверяет внешние ключи пачки одним запросом на поле.
+
+        Returns:
+            list: Объекты, все обязательные ссылки которых существуют в базе.
+        """
+        stats = self.stats[model._meta.label_lower]
+        for field in model._meta.concrete_fields:
+            related = field.related_model
+            if related is None:
+                continue
+            pk_map = self.pk_maps.get(related._meta.label_lower, {})
+            for obj in objects:
+                value = getattr(obj, field.attname)
+                if value in pk_map:
+                    setattr(obj, field.attname, pk_map[value])
+
+            referenced = {getattr(obj, field.attname) for obj in objects} - {None}
+            existing = set(related._default_manager.filter(pk__in=referenced).values_list('pk', flat=True))
+            resolved = []
+            for obj in objects:
+                value = getattr(obj, field.attname)
+                if value is None or value in existing:
+                    resolved.append(obj)
+                elif field.null:
+                    setattr(obj, field.attname, None)  # Необязательная ссылка на отсутствующий объект
+                    stats['detached'] += 1
+                    resolved.append(obj)
+                else:
+                    stats['skipped'] += 1
+            objects = resolved
+        return objects
+
+    def write(self, model, objects):
+        """Записывает пачку объектов: существующие обновляет, новые создает."""
+        label = model._meta.label_lower
+        stats = self.stats.setdefault(label, {'created': 0, 'updated': 0, 'skipped': 0, 'detached': 0})
+        fields = get_transfer_fields(model)
+        objects = self.resolve_foreign_keys(model, objects)
+
+        natural_key = NATURAL_KEYS.get(label)
+        if natural_key:
+            values = [getattr(obj, natural_key) for obj in objects]
+            found = dict(model._default_manager.filter(**{f'{natural_key}__in': values}).values_list(natural_key, 'pk'))
+            for obj in objects:
+                target = found.get(getattr(obj, natural_key))
+                if target is not None and target != obj.pk:
+                    self.pk_maps.setdefault(label, {})[obj.pk] = target
+                    obj.pk = target
+
+        pks = [obj.pk for obj in objects if obj.pk is not None]
+        existing = set(model._default_manager.filter(pk__in=pks).values_list('pk', flat=True))
+        to_update = [obj for obj in objects if obj.pk in existing]
+        to_create = [obj for obj in objects if obj.pk not in existing]
+        # bulk_create проставляет auto_now/auto_now_add текущим временем - сохраняем значения из файла
+        auto_fields = [field for field in fields if getattr(field, 'auto_now', False)
+                       or getattr(field, 'auto_now_add', False)]
+        imported_times = [[getattr(obj, field.attname) for field in auto_fields] for obj in to_create]
+
+        with transaction.atomic():
+            if to_update:
+                model._default_manager.bulk_update(to_update, [field.name for field in fields], self.batch_size)
+            if to_create:
+                model._default_manager.bulk_create(to_create, self.batch_size)
+                restored = []
+                for obj, values in zip(to_create, imported_times):
+                    for field, value in zip(auto_fields, values):
+                        if value is not None:
+                            setattr(obj, field.attname, value)
+                            restored.append(obj)
+                if restored:
+                    model._default_manager.bulk_update(
+                        list({obj.pk: obj for obj in restored}.values()), [field.name for field in auto_fields],
+                        self.batch_size
+                    )
+            if self.index:
+                index_objects(model, objects)
+        forget_object_versions(model, [obj.pk for obj in to_update])  # Карточки обновленных объектов устарели
+
+        stats['created'] += len(to_create)
+        stats['updated'] += len(to_update)
+        before = self.total // self.progress_every
+        self.total += len(objects)
+        if self.progress and self.total // self.progress_every != before:
+            self.report()
+
+    def report(self):
+        """Выводит количество записанных строк и скорость импорта."""
+        elapsed = max(time.monotonic() - self.started, 1e-6)
+        self.progress(f'Записано строк: {self.total}, {self.total / elapsed:.0f} строк/с')
+
+    def finish(self):
+        """
+        Записывает остатки буферов, пересчитывает денормализованные счетчики и родословную, сбрасывает
+        счетчики последовательностей pk (строки созданы с pk из файла) и кеши импортированных моделей.
+
+        Returns:
+            dict: Счетчики по моделям.
+        """
+        self.flush()
+        recount_counters()  # bulk_create/bulk_update не отправляют сигналы, поддерживающие счетчики
+        models = [apps.get_model(label) for label in self.stats]
+        with connection.cursor() as cursor:
+            for sql in connection.ops.sequence_reset_sql(no_style(), models):
+                cursor.execute(sql)
+        for model in models:
+            bump_model_version(model._meta.label)
+        if 'dogs.category' in self.stats:
+            invalidate_categories_cache()
+        if 'dogs.parent' in self.stats:
+            rebuild_pedigree()  # Связи родителей записаны без сигналов, строящих родословную
+        return self.stats
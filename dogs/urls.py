@@ -1,26 +1,39 @@
+from django.conf import settings
 from django.urls import path
-from django.views.decorators.cache import cache_page, never_cache
+from django.views.decorators.cache import never_cache
+from dogs.caching import cache_page_for_anonymous
 from dogs.views import index, category_dogs, DogListView, DogCreateView, DogDetailView, DogUpdateView, DogDeleteView, \
-    CategoryListView, DogDeactivateListView, DogSearchListView, dog_toggle_activity, CategorySearchListView
+    CategoryListView, DogDeactivateListView, DogSearchListView, dog_toggle_activity, CategorySearchListView, \
+    dog_bulk_moderation, export_data, index_async, category_list_async, dog_list_async, dog_detail_async
 from dogs.apps import DogsConfig
 
 # Устанавливаем имя пространства имен для маршрутов приложения 'dogs'
 app_name = DogsConfig.name
 
+# Представления для чтения: асинхронные под ASGI (settings.ASYNC_VIEWS), синхронные под WSGI
+if settings.ASYNC_VIEWS:
+    index_view, category_list_view = index_async, category_list_async
+    dog_list_view, dog_detail_view = dog_list_async, dog_detail_async
+else:
+    index_view, category_list_view = index, CategoryListView.as_view()
+    dog_list_view, dog_detail_view = DogListView.as_view(), DogDetailView.as_view()
+
 urlpatterns = [
-    path('', cache_page(60)(index), name='index'),  # Главная страница с кешированием на 60 секунд
-    path('categories/', cache_page(60)(CategoryListView.as_view()), name='categories'),  # Список категорий с
-    # кешированием
+    path('', cache_page_for_anonymous(60, ('dogs.Category',))(index_view), name='index'),  # Главная страница, для
+    # анонимных пользователей кешируется до изменения пород
+    path('categories/', category_list_view, name='categories'),  # Список категорий (только для авторизованных)
     path('categories/search', CategorySearchListView.as_view(), name='search_categories'),  # Поиск категорий
     path('categories/<int:pk>/dogs/', category_dogs, name='category_dogs'),  # Список собак по категории
-    path('dogs/', DogListView.as_view(), name='list_dogs'),  # Список всех собак
+    path('dogs/', dog_list_view, name='list_dogs'),  # Список всех собак
     path('dogs/deactivate/', DogDeactivateListView.as_view(), name='deactivated_list_dogs'),  # Список неактивных собак
     path('dogs/search/', DogSearchListView.as_view(), name='search_dogs'),  # Поиск собак
     path('dogs/create/', DogCreateView.as_view(), name='create_dog'),  # Создание новой собаки
-    path('dogs/detail/<int:pk>/', DogDetailView.as_view(), name='detail_dog'),  # Детали собаки по ID
+    path('dogs/detail/<int:pk>/', dog_detail_view, name='detail_dog'),  # Детали собаки по ID
     path('dogs/toggle/<int:pk>', dog_toggle_activity, name='toggle_activity_dog'),  # Переключение активности собаки
     # по ID
+    path('dogs/bulk/', dog_bulk_moderation, name='bulk_moderation_dogs'),  # Массовая модерация выбранных собак
     path('dogs/update/<int:pk>/', never_cache(DogUpdateView.as_view()), name='update_dog'),  # Обновление информации о
     # собаке без кеширования
     path('dogs/delete/<int:pk>', DogDeleteView.as_view(), name='delete_dog'),  # Удаление собаки по ID
+    path('export/<slug:name>.<slug:file_format>', export_data, name='export'),  # Потоковая выгрузка для сотрудников
 ]
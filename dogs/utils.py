@@ -0,0 +1,139 @@
+import importlib
+import logging
+from functools import wraps
+
+from django.conf import settings
+from django.db import connection
+from django.test import override_settings
+from django.urls import clear_url_caches
+
+logger = logging.getLogger(__name__)
+
+# Модули маршрутов, которые выбирают синхронные или асинхронные представления по settings.ASYNC_VIEWS
+URL_MODULES = ('dogs.urls', 'reviews.urls', 'users.urls', 'config.urls')
+
+
+class QueryBudgetExceeded(Exception):
+    """Исключение: представление выполнило больше SQL-запросов, чем разрешено бюджетом."""
+
+
+class QueryCounter:
+    """
+    Контекстный менеджер для подсчета SQL-запросов.
+
+    Подключается к соединению через connection.execute_wrapper, поэтому работает
+    и без DEBUG, не накапливая тексты запросов в connection.queries.
+
+    Атрибуты:
+        count (int): Количество выполненных запросов.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self._wrapper = None
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+    def __enter__(self):
+        self._wrapper = connection.execute_wrapper(self)
+        self._wrapper.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._wrapper.__exit__(*exc_info)
+
+
+def _render_within_budget(name, budget, get_response):
+    """
+    Выполняет представление вместе с рендерингом шаблона и проверяет бюджет запросов.
+
+    TemplateResponse рендерится лениво, уже после выхода из представления, поэтому
+    он рендерится здесь принудительно, чтобы учесть запросы из шаблонов.
+
+    Args:
+        name (str): Имя представления для сообщения об ошибке.
+        budget (int): Допустимое количество запросов.
+        get_response (callable): Функция, возвращающая ответ представления.
+
+    Raises:
+        QueryBudgetExceeded: Если бюджет превышен и QUERY_BUDGET_STRICT включен.
+
+    Returns:
+        HttpResponse: Ответ представления.
+    """
+    with QueryCounter() as counter:
+        response = get_response()
+        if hasattr(response, 'render') and not response.is_rendered:
+            response.render()
+
+    if counter.count > budget:
+        message = f'{name}: {counter.count} SQL-запросов при бюджете {budget}'
+        if getattr(settings, 'QUERY_BUDGET_STRICT', settings.DEBUG):
+            raise QueryBudgetExceeded(message)
+        logger.warning(message)
+
+    return response
+
+
+def query_budget(budget):
+    """
+    Декоратор функционального представления, ограничивающий количество SQL-запросов.
+
+    Args:
+        budget (int): Допустимое количество запросов на один запрос к представлению.
+
+    Returns:
+        callable: Декорированное представление.
+    """
+
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            return _render_within_budget(
+                view_func.__name__, budget, lambda: view_func(request, *args, **kwargs)
+            )
+
+        wrapper.query_budget = budget
+        return wrapper
+
+    return decorator
+
+
+class QueryBudgetMixin:
+    """
+    Миксин для представлений на классах, ограничивающий количество SQL-запросов.
+
+    Должен стоять в списке родителей перед LoginRequiredMixin, чтобы учитывать
+    и запросы проверки авторизации (сессия и пользователь).
+
+    Атрибуты:
+        query_budget (int): Допустимое количество запросов на один запрос к представлению.
+    """
+    query_budget = None
+
+    def dispatch(self, request, *args, **kwargs):
+        if self.query_budget is None:
+            return super().dispatch(request, *args, **kwargs)
+
+        parent_dispatch = super().dispatch
+        return _render_within_budget(
+            type(self).__name__, self.query_budget, lambda: parent_dispatch(request, *args, **kwargs)
+        )
+
+
+def use_async_views(enabled):
+    """
+    Переключает маршруты процесса на асинхронные или синхронные представления (замеры и тесты).
+
+    Маршруты выбирают представления при импорте, поэтому модули перезагружаются
+    с измененным settings.ASYNC_VIEWS.
+
+    Args:
+        enabled (bool): True - асинхронные представления, False - синхронные.
+    """
+    with override_settings(ASYNC_VIEWS=enabled):
+        for name in URL_MODULES:
+            importlib.reload(importlib.import_module(name))
+    clear_url_caches()
@@ -1,15 +1,27 @@
-from django.db.models import Q
+from asgiref.sync import sync_to_async
 from django.shortcuts import render, get_object_or_404, redirect
 from django.urls import reverse, reverse_lazy
 from django.views.generic import ListView, CreateView, DetailView, UpdateView, DeleteView
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
-from django.forms import inlineformset_factory
+from django.db import transaction
 from django.core.exceptions import PermissionDenied
-
-from dogs.models import Category, Dog, Parent
-from dogs.forms import DogForm, ParentForm  # DogAdminForm
-from dogs.services import send_views_mail
+from django.views.decorators.http import require_GET, require_POST
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import Http404
+from django.template.response import TemplateResponse
+
+from dogs.models import Category, Dog
+from dogs.forms import DogForm, ParentFormset  # DogAdminForm
+from dogs.services import register_dog_view, get_pending_views, get_categories_cache, \
+    aget_categories_cache, aregister_dog_view, aget_pending_views, get_category_counts, aget_category_counts, \
+    with_dog_counts
+from dogs.utils import QueryBudgetMixin, query_budget
+from dogs.pagination import KeysetPaginationMixin, apaginate_keyset, paginate_keyset, set_page_queries
+from dogs.moderation import bulk_set_active, moderation_response
+from dogs.exports import EXPORTS, EXPORT_FORMATS, export_response
+from dogs.pedigree import PEDIGREE_DEPTH, get_pedigree_tree, inbreeding_coefficient
+from search.services import search_queryset
 from users.models import UserRoles
 
 
@@ -26,7 +38,8 @@ def index(request):
         HttpResponse: Рендеринг главной страницы с контекстом.
     """
     context = {
-        'object_list': Category.objects.all()[:3],  # Получение первых трех категорий
+        # Первые три категории из кешированного справочника с количеством собак
+        'object_list': with_dog_counts(get_categories_cache()[:3], get_category_counts()),
         'title': 'Питомник - Главная'
     }
     return render(request, 'dogs/index.html', context)
@@ -53,14 +66,13 @@ class CategorySearchListView(LoginRequiredMixin, ListView):
         """
         Получает список категорий на основе поискового запроса.
 
+        Ищет по названию и описанию породы в поисковом индексе с учетом префиксов и опечаток.
+
         Returns:
-            QuerySet: Список категорий, соответствующих запросу.
+            list: Список категорий, соответствующих запросу, в порядке релевантности.
         """
-        query = self.request.GET.get('q')
-        object_list = Category.objects.filter(
-            Q(name__icontains=query),  # Фильтрация по имени категории
-        )
-        return object_list
+        query = self.request.GET.get('q', '')
+        return search_queryset(query, Category.objects.all())  # Пустой запрос дает пустой список
 
 
 class CategoryListView(LoginRequiredMixin, ListView):
@@ -80,11 +92,21 @@ class CategoryListView(LoginRequiredMixin, ListView):
     }
     template_name = 'dogs/categories.html'
 
+    def get_queryset(self):
+        """
+        Получает список категорий из кешированного справочника пород.
+
+        Returns:
+            list: Все категории с количеством собак без обращения к базе данных при попадании в кеш.
+        """
+        return with_dog_counts(get_categories_cache(), get_category_counts())
+
 
+@query_budget(6)
 @login_required
 def category_dogs(request, pk):
     """
-    Представление для отображения списка собак в определенной категории.
+    Представление для отображения списка собак в определенной категории с курсорной пагинацией.
 
     Args:
         request: HTTP запрос.
@@ -94,23 +116,30 @@ def category_dogs(request, pk):
         HttpResponse: Рендеринг страницы со списком собак в категории.
     """
     category_item = Category.objects.get(pk=pk)
+    queryset = Dog.objects.filter(category_id=pk).select_related('category')  # Собаки категории с породой
+    page = paginate_keyset(queryset, request.GET.get('cursor'),
+                           DogListView.paginate_by, DogListView.keyset_ordering)  # Как в общем списке собак
+    set_page_queries(page, request)
     context = {
-        'object_list': Dog.objects.filter(category_id=pk),  # Получение всех собак в категории
+        'object_list': page.object_list,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
         'title': f'Собаки породы {category_item.name}',
         'category_pk': category_item.pk,
     }
     return render(request, 'dogs/dogs.html', context)
 
 
-class DogListView(LoginRequiredMixin, ListView):
+class DogListView(QueryBudgetMixin, LoginRequiredMixin, KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка всех активных собак.
 
-    Ограничивает доступ только для авторизованных пользователей и поддерживает пагинацию.
+    Ограничивает доступ только для авторизованных пользователей и поддерживает курсорную пагинацию.
 
     Атрибуты:
         model: Модель Dog.
         paginate_by: Количество собак на странице.
+        keyset_ordering: Поле сортировки для курсорной пагинации.
         extra_context: Дополнительный контекст для шаблона.
         template_name: Шаблон для отображения списка собак.
         login_url: URL для перенаправления неавторизованных пользователей.
@@ -120,6 +149,8 @@ class DogListView(LoginRequiredMixin, ListView):
     """
     model = Dog
     paginate_by = 3
+    keyset_ordering = 'name'
+    query_budget = 6
     extra_context = {
         'title': 'Питомник - Все наши собаки',
     }
@@ -133,12 +164,11 @@ class DogListView(LoginRequiredMixin, ListView):
         Returns:
             QuerySet: Список активных собак.
         """
-        queryset = super().get_queryset()
-        queryset = queryset.filter(is_active=True)  # Фильтрация по статусу активности
+        queryset = Dog.active.select_related('category')  # Активные собаки с породой
         return queryset
 
 
-class DogDeactivateListView(LoginRequiredMixin, ListView):
+class DogDeactivateListView(QueryBudgetMixin, LoginRequiredMixin, KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка неактивных собак.
 
@@ -156,8 +186,12 @@ class DogDeactivateListView(LoginRequiredMixin, ListView):
     model = Dog
     extra_context = {
         'title': 'Питомник - неактивные собаки',
+        'bulk_moderation_url': reverse_lazy('dogs:bulk_moderation_dogs'),  # Форма массовой модерации
     }
     template_name = 'dogs/dogs.html'
+    paginate_by = 3
+    keyset_ordering = 'name'
+    query_budget = 6
 
     def get_queryset(self):
         """
@@ -166,7 +200,7 @@ class DogDeactivateListView(LoginRequiredMixin, ListView):
         Returns:
             QuerySet: Список неактивных собак.
         """
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().select_related('category')  # Порода загружается вместе с собакой
 
         # Фильтрация по роли пользователя
         if self.request.user.role in [UserRoles.MODERATOR, UserRoles.ADMIN]:
@@ -178,7 +212,7 @@ class DogDeactivateListView(LoginRequiredMixin, ListView):
         return queryset
 
 
-class DogSearchListView(LoginRequiredMixin, ListView):
+class DogSearchListView(QueryBudgetMixin, LoginRequiredMixin, ListView):
     """
     Представление для поиска собак по имени.
 
@@ -197,19 +231,20 @@ class DogSearchListView(LoginRequiredMixin, ListView):
     extra_context = {
         'title': 'Результаты поискового запроса',
     }
+    query_budget = 8
 
     def get_queryset(self):
         """
         Получает список активных собак на основе поискового запроса.
 
+        Ищет по кличке в поисковом индексе с учетом префиксов и опечаток.
+
         Returns:
-            QuerySet: Список активных собак, соответствующих запросу по имени.
+            list: Список активных собак, соответствующих запросу по имени, в порядке релевантности.
         """
-        query = self.request.GET.get('q')
-        object_list = Dog.objects.filter(
-            Q(name__icontains=query), is_active=True,
-        )
-        return object_list
+        query = self.request.GET.get('q', '')
+        queryset = Dog.active.select_related('category')  # Порода вместе с собакой
+        return search_queryset(query, queryset)
 
 
 class DogCreateView(LoginRequiredMixin, CreateView):
@@ -254,12 +289,33 @@ class DogCreateView(LoginRequiredMixin, CreateView):
         return super().form_valid(form)
 
 
+def get_pedigree_context(dog):
+    """
+    Возвращает контекст родословной для страницы собаки.
+
+    Args:
+        dog (Dog): Собака.
+
+    Returns:
+        dict: pedigree - дерево на PEDIGREE_DEPTH поколений, pedigree_depth и inbreeding -
+        коэффициент инбридинга в процентах (только при известных родителях).
+    """
+    context = {
+        'pedigree': get_pedigree_tree(dog, PEDIGREE_DEPTH),  # Родословная одним запросом
+        'pedigree_depth': PEDIGREE_DEPTH,
+    }
+    if context['pedigree']:
+        context['inbreeding'] = inbreeding_coefficient(dog, PEDIGREE_DEPTH) * 100  # В процентах
+    return context
+
+
 class DogDetailView(LoginRequiredMixin, DetailView):
     """
     Представление для отображения деталей собаки.
 
     Ограничивает доступ только для авторизованных пользователей.
-    Увеличивает количество просмотров и отправляет уведомление владельцу о каждом 20-м просмотре.
+    Учитывает просмотр в счетчике кеша и отправляет уведомление владельцу о каждом 20-м просмотре.
+    Выводит родословную на PEDIGREE_DEPTH поколений и коэффициент инбридинга (dogs.pedigree).
 
     Атрибуты:
         model: Модель Dog.
@@ -272,6 +328,10 @@ class DogDetailView(LoginRequiredMixin, DetailView):
     model = Dog
     template_name = 'dogs/detail.html'
 
+    def get_queryset(self):
+        """Загружает собаку вместе с породой и владельцем одним запросом."""
+        return super().get_queryset().select_related('category', 'owner')
+
     def get_context_data(self, **kwargs):
         """
         Добавляет дополнительные данные в контекст шаблона.
@@ -280,23 +340,19 @@ class DogDetailView(LoginRequiredMixin, DetailView):
             **kwargs: Дополнительные аргументы контекста.
 
         Returns:
-            dict: Обновленный контекст с данными о собаке и заголовком страницы.
+            dict: Обновленный контекст с данными о собаке, количеством просмотров и заголовком страницы.
         """
         context_data = super().get_context_data(**kwargs)
-        object = self.get_object()
-        context_data['title'] = f'{object.name} {object.category}'  # Заголовок страницы
+        dog = self.object  # Объект уже загружен DetailView
+        context_data['title'] = f'{dog.name} {dog.category}'  # Заголовок страницы
 
-        dog_object_increase = get_object_or_404(Dog, pk=object.pk)  # Получение объекта собаки по ID
-
-        if object.owner != self.request.user:
-            dog_object_increase.views_count()  # Увеличение счетчика просмотров
-
-            if object.owner:
-                object_owner_email = object.owner.email  # Получение email владельца
+        if dog.owner != self.request.user:
+            views = register_dog_view(dog)  # Учет просмотра (письмо о юбилейном просмотре - при записи в базу)
+        else:
+            views = dog.views + get_pending_views(dog.pk)
 
-                if dog_object_increase.views % 20 == 0 and dog_object_increase.views != 0:
-                    send_views_mail(dog_object_increase.name, object_owner_email,
-                                    dog_object_increase.views)  # Отправка уведомления
+        context_data['views'] = views  # Просмотры из базы данных и кеша
+        context_data.update(get_pedigree_context(dog))
 
         return context_data
 
@@ -312,6 +368,7 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
         model: Модель Dog.
         form_class: Форма обновления собаки (DogForm).
         template_name: Шаблон для создания/обновления собаки.
+        formset: Набор форм родителей (ParentFormset), связанный с запросом один раз.
 
     Returns:
         HttpResponseRedirect: Перенаправление на страницу деталей собаки после успешного обновления.
@@ -320,20 +377,21 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
     model = Dog
     form_class = DogForm
     template_name = 'dogs/create_update.html'
+    formset = None  # Набор форм родителей текущего запроса (get_formset)
 
     def get_success_url(self):
         """Возвращает URL перенаправления после успешного обновления."""
-        return reverse('dogs:detail_dog', args=[self.kwargs.get('pk')])
+        return reverse('dogs:detail_dog', args=[self.object.pk])
 
     def get_object(self, queryset=None):
         """Получает объект собаки и проверяет права доступа."""
 
-        self.object = super().get_object(queryset)
+        obj = super().get_object(queryset)
 
-        if self.object.owner != self.request.user and self.request.user.role != UserRoles.ADMIN:
+        if obj.owner_id != self.request.user.pk and self.request.user.role != UserRoles.ADMIN:
             raise PermissionDenied()  # Запрет доступа если пользователь не владелец или администратор
 
-        return self.object
+        return obj
 
     # def get_form_class(self):
     #     dog_forms = {
@@ -345,37 +403,47 @@ class DogUpdateView(LoginRequiredMixin, UpdateView):
     #     dog_forms_class = dog_forms[user_role]
     #     return dog_forms_class
 
+    def get_formset(self):
+        """
+        Возвращает набор форм родителей, привязанный к данным запроса.
 
-    def get_context_data(self, **kwargs):
-        """Добавляет дополнительные данные в контекст шаблона."""
-
-        context_data = super().get_context_data(**kwargs)
-
-        ParentFormset = inlineformset_factory(Dog, Parent, form=ParentForm, extra=1)  # Создание формы набора родителей
-
-        if self.request.method == 'POST':
-            formset = ParentFormset(self.request.POST, instance=self.object)  # Обработка POST-запроса
-        else:
-            formset = ParentFormset(instance=self.object)  # Обработка GET-запроса
+        Набор создается один раз за запрос и используется и для проверки, и для вывода ошибок.
 
-        context_data['formset'] = formset  # Добавление формы набора в контекст
+        Returns:
+            ParentFormset: Набор форм родителей собаки.
+        """
+        if self.formset is None:
+            if self.request.method == 'POST':
+                self.formset = ParentFormset(self.request.POST, instance=self.object)
+            else:
+                self.formset = ParentFormset(instance=self.object)
+        return self.formset
 
+    def get_context_data(self, **kwargs):
+        """Добавляет набор форм родителей в контекст шаблона."""
+        context_data = super().get_context_data(**kwargs)
+        context_data['formset'] = self.get_formset()
         return context_data
 
-    def form_valid(self, form):
-        """Обрабатывает валидную форму и сохраняет обновленную информацию о собаке."""
+    def post(self, request, *args, **kwargs):
+        """Проверяет форму собаки и набор форм родителей; сохраняет, только если обе формы верны."""
+        self.object = self.get_object()
+        form = self.get_form()
+        formset = self.get_formset()
+        form_is_valid = form.is_valid()  # Обе формы проверяются всегда, чтобы показать все ошибки сразу
+        formset_is_valid = formset.is_valid()
+        if form_is_valid and formset_is_valid:
+            return self.form_valid(form)
+        return self.form_invalid(form)
 
-        context_data = self.get_context_data()
-
-        formset = context_data['formset']
-
-        self.object = form.save()  # Сохранение формы
+    def form_valid(self, form):
+        """Сохраняет собаку и всех ее родителей в одной транзакции массовыми запросами."""
+        with transaction.atomic():
+            self.object = form.save()
+            self.formset.instance = self.object
+            self.formset.save_bulk()
 
-        if formset.is_valid():
-            formset.instance = self.object  # Привязка формы набора к объекту собаки
-            formset.save()  # Сохранение формы набора родителей
-
-        return super().form_valid(form)
+        return redirect(self.get_success_url())
 
 
 class DogDeleteView(PermissionRequiredMixin, DeleteView):
@@ -400,23 +468,168 @@ class DogDeleteView(PermissionRequiredMixin, DeleteView):
     permission_required = 'dogs.delete_dog'
 
 
+@login_required
+@require_POST
 def dog_toggle_activity(request, pk):
     """
     Переключает статус активности собаки (активна/неактивна).
 
+    Читается только признак активности, а изменяется он одним UPDATE без сохранения
+    всех полей собаки. Изменять чужих собак могут только модераторы и администраторы.
+    Принимает только POST с CSRF-токеном: переход по ссылке не меняет данные.
+
     Args:
-       request (HttpRequest): HTTP запрос от клиента.
+       request (HttpRequest): POST-запрос от клиента.
        pk (int): ID собаки.
 
     Returns:
        HttpResponseRedirect: Перенаправление на страницу списка собак после изменения статуса активности.
     """
 
-    dog_item = get_object_or_404(Dog, pk=pk)  # Получение объекта собаки по ID
+    is_active = get_object_or_404(Dog.objects.values_list('is_active', flat=True), pk=pk)  # Текущий статус
 
-    dog_item.is_active = not dog_item.is_active  # Переключение статуса активности
-
-    dog_item.save()  # Сохранение изменений
+    if bulk_set_active(Dog, request.user, [pk], not is_active)['denied']:
+        raise PermissionDenied  # Собака принадлежит другому пользователю
 
     return redirect(reverse('dogs:list_dogs'))  # Перенаправление на страницу списка собак
 
+
+@login_required
+@require_POST
+def dog_bulk_moderation(request):
+    """
+    Массово активирует, деактивирует или удаляет выбранных собак.
+
+    Права проверяются сразу для всего набора: модераторы и администраторы изменяют
+    любых собак, пользователи - только своих, удаление требует права dogs.delete_dog.
+
+    Args:
+        request (HttpRequest): POST-запрос с полями action и pk.
+
+    Returns:
+        HttpResponse: Перенаправление на список неактивных собак или JSON со счетчиками.
+    """
+    return moderation_response(request, 'dogs.Dog', reverse('dogs:deactivated_list_dogs'))
+
+
+@staff_member_required
+@require_GET
+def export_data(request, name, file_format):
+    """
+    Потоковая выгрузка собак, отзывов или заводчиков для сотрудников.
+
+    Строки читаются из базы пачками и сразу отправляются клиенту (dogs.exports),
+    поэтому память сервера не зависит от размера таблицы.
+
+    Args:
+        request (HttpRequest): HTTP запрос от сотрудника.
+        name (str): Имя выгрузки: dogs, reviews или breeders.
+        file_format (str): Формат файла: csv или jsonl.
+
+    Returns:
+        StreamingHttpResponse: Файл выгрузки во вложении.
+    """
+    if name not in EXPORTS or file_format not in EXPORT_FORMATS:
+        raise Http404('Неизвестная выгрузка')
+    return export_response(name, file_format)
+
+
+# Асинхронные варианты представлений для чтения (settings.ASYNC_VIEWS, запуск через ASGI).
+# Данные загружаются асинхронным ORM и асинхронными вызовами кеша, TemplateResponse
+# рендерится обработчиком Django в потоке, блокирующая работа вызывается через sync_to_async.
+
+async def index_async(request):
+    """
+    Асинхронный вариант index().
+
+    Args:
+        request: HTTP запрос.
+
+    Returns:
+        TemplateResponse: Главная страница.
+    """
+    context = {
+        'object_list': with_dog_counts((await aget_categories_cache())[:3], await aget_category_counts()),
+        'title': 'Питомник - Главная'
+    }
+    return TemplateResponse(request, 'dogs/index.html', context)
+
+
+@login_required
+async def category_list_async(request):
+    """
+    Асинхронный вариант CategoryListView.
+
+    Args:
+        request: HTTP запрос.
+
+    Returns:
+        TemplateResponse: Список всех пород из кешированного справочника.
+    """
+    context = {
+        'object_list': with_dog_counts(await aget_categories_cache(), await aget_category_counts()),
+        'title': 'Питомник все наши породы',
+    }
+    return TemplateResponse(request, 'dogs/categories.html', context)
+
+
+@login_required(login_url=DogListView.login_url)
+async def dog_list_async(request):
+    """
+    Асинхронный вариант DogListView с той же курсорной пагинацией.
+
+    Args:
+        request: HTTP запрос.
+
+    Returns:
+        TemplateResponse: Страница списка активных собак.
+    """
+    page = await apaginate_keyset(Dog.active.select_related('category'), request.GET.get('cursor'),
+                                  DogListView.paginate_by, DogListView.keyset_ordering)
+    set_page_queries(page, request)
+    context = {
+        'object_list': page.object_list,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'title': 'Питомник - Все наши собаки',
+    }
+    return TemplateResponse(request, 'dogs/dogs.html', context)
+
+
+@login_required
+async def dog_detail_async(request, pk):
+    """
+    Асинхронный вариант DogDetailView.
+
+    Просмотр учитывается асинхронными вызовами кеша, а запись просмотров в базу
+    и расчет родословной (несколько запросов и вычисления в памяти) выполняются в потоке.
+
+    Args:
+        request: HTTP запрос.
+        pk (int): ID собаки.
+
+    Returns:
+        TemplateResponse: Страница собаки.
+
+    Raises:
+        Http404: Собака не найдена.
+    """
+    try:
+        dog = await Dog.objects.select_related('category', 'owner').aget(pk=pk)
+    except Dog.DoesNotExist:
+        raise Http404('Собака не найдена')
+
+    user = await request.auser()
+    if dog.owner != user:
+        views = await aregister_dog_view(dog)
+    else:
+        views = dog.views + await aget_pending_views(dog.pk)
+
+    context = {
+        'object': dog,
+        'dog': dog,
+        'title': f'{dog.name} {dog.category}',
+        'views': views,
+        **await sync_to_async(get_pedigree_context)(dog),
+    }
+    return TemplateResponse(request, 'dogs/detail.html', context)
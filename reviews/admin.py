@@ -1,21 +1,35 @@
 from django.contrib import admin
 from reviews.models import Review
+from dogs.admin import AutocompleteFilter, ModerationAdminMixin, ScalableAdminMixin
+from dogs.exports import make_export_action
 
 
 @admin.register(Review)
-class ReviewAdmin(admin.ModelAdmin):
+class ReviewAdmin(ModerationAdminMixin, ScalableAdminMixin, admin.ModelAdmin):
     """
     Административный интерфейс для модели Review.
 
     Этот класс настраивает отображение и поведение модели Review в административной панели Django.
+    Массовые действия модерации добавляет ModerationAdminMixin, настройки для больших
+    таблиц (оценка количества строк, фильтры с автодополнением) - ScalableAdminMixin.
 
     Атрибуты:
         list_display (tuple): Поля, которые будут отображаться в списке объектов.
         ordering (tuple): Поля, по которым будет производиться сортировка объектов в списке.
         list_filter (tuple): Поля, по которым можно фильтровать объекты в списке.
+        list_select_related (tuple): Связанные объекты, загружаемые одним запросом со списком.
+        search_fields (tuple): Поля для поиска.
+        autocomplete_fields (tuple): Внешние ключи, выбираемые поиском вместо полного списка.
+        actions (tuple): Массовая модерация и потоковая выгрузка выбранных отзывов.
     """
 
     list_display = ('title', 'dog', 'autor', 'created', 'sign_of_review',)  # Поля для отображения в списке
     ordering = ('created',)  # Сортировка по дате создания
-    list_filter = ('dog', 'autor',)  # Фильтры по собаке и автору отзыва
-
+    list_filter = (('dog', AutocompleteFilter), ('autor', AutocompleteFilter), 'sign_of_review')  # Фильтры по
+    # собаке и автору отзыва с поиском вместо списка всех собак и пользователей
+    list_select_related = ('dog__category', 'autor')  # Собака выводится с породой
+    search_fields = ('title',)
+    autocomplete_fields = ('dog', 'autor')
+    actions = ModerationAdminMixin.actions + (
+        make_export_action('reviews', 'csv'), make_export_action('reviews', 'jsonl'),
+    )
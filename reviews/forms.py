@@ -8,12 +8,12 @@ class ReviewForm(StyleFormMixin, forms.ModelForm):
     """
     Форма для создания и редактирования отзыва.
 
-    Эта форма основана на модели Review и включает в себя поля для ввода заголовка, содержания и слага.
+    Эта форма основана на модели Review и включает в себя поля для выбора собаки, ввода заголовка и содержания.
+    Слаг не вводится: его создает Review.save() при первом сохранении и больше не меняет.
 
     Атрибуты:
         title (CharField): Заголовок отзыва, максимальная длина 150 символов.
         content (TextInput): Поле для ввода текста отзыва.
-        slug (SlugField): Уникальный слаг для отзыва, скрытое поле с начальным значением 'temp_slug'.
 
     Метаданные:
         Meta: Определяет модель, к которой относится форма, и поля, которые будут включены в форму.
@@ -21,8 +21,7 @@ class ReviewForm(StyleFormMixin, forms.ModelForm):
 
     title = forms.CharField(max_length=150, label='Заголовок_формы')  # Заголовок отзыва
     content = forms.TextInput()  # Поле для ввода текста отзыва
-    slug = forms.SlugField(max_length=20, initial='temp_slug', widget=forms.HiddenInput())  # Скрытое поле слага
 
     class Meta:
         model = Review  # Модель, к которой относится форма
-        fields = ('dog', 'title', 'content', 'slug')  # Поля, включенные в форму
+        fields = ('dog', 'title', 'content')  # Поля, включенные в форму
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('dogs', '0010_query_indexes'),
+        ('reviews', '0002_review_delete_reviews'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('sign_of_review', True)), fields=['-created', '-id'], name='review_published_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='review',
+            index=models.Index(condition=models.Q(('sign_of_review', False)), fields=['-created', '-id'], name='review_hidden_idx'),
+        ),
+    ]
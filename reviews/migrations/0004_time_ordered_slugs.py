@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:40
+
+import secrets
+
+from django.db import migrations, models
+
+BATCH_SIZE = 1000
+UPDATE_BATCH_SIZE = 300  # bulk_update передает 5 параметров на строку, SQL Server принимает до 2100
+# Формат слага на момент миграции (копия reviews.utils: миграция не должна зависеть от текущего кода)
+SLUG_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+SLUG_TIME_LENGTH = 9
+SLUG_RANDOM_LENGTH = 11
+
+
+def encode_base36(value, length):
+    """Кодирует неотрицательное число строкой base36 фиксированной длины."""
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 36)
+        chars.append(SLUG_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def time_ordered_slug(moment):
+    """Возвращает слаг из времени moment в миллисекундах и случайной части, base36."""
+    milliseconds = int(moment.timestamp() * 1000)
+    return encode_base36(milliseconds, SLUG_TIME_LENGTH) + \
+        encode_base36(secrets.randbelow(36 ** SLUG_RANDOM_LENGTH), SLUG_RANDOM_LENGTH)
+
+
+def rekey_slugs(apps, schema_editor):
+    """
+    Заменяет случайные слаги существующих отзывов упорядоченными по времени создания.
+
+    Старый слаг сохраняется в legacy_slug: ReviewDetailView перенаправляет с него на новый адрес.
+    """
+    Review = apps.get_model('reviews', 'Review')
+    batch = []
+    for review in Review.objects.filter(legacy_slug__isnull=True).order_by('created', 'pk') \
+            .only('pk', 'slug', 'created').iterator(chunk_size=BATCH_SIZE):
+        review.legacy_slug = review.slug
+        review.slug = time_ordered_slug(review.created)
+        batch.append(review)
+        if len(batch) == BATCH_SIZE:
+            Review.objects.bulk_update(batch, ['slug', 'legacy_slug'], batch_size=UPDATE_BATCH_SIZE)
+            batch = []
+    Review.objects.bulk_update(batch, ['slug', 'legacy_slug'], batch_size=UPDATE_BATCH_SIZE)
+
+
+def restore_slugs(apps, schema_editor):
+    """Возвращает отзывам старые слаги."""
+    Review = apps.get_model('reviews', 'Review')
+    Review.objects.filter(legacy_slug__isnull=False).update(slug=models.F('legacy_slug'), legacy_slug=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('reviews', '0003_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='review',
+            name='legacy_slug',
+            field=models.SlugField(blank=True, editable=False, max_length=25, null=True, verbose_name='старый URL'),
+        ),
+        migrations.AlterField(
+            model_name='review',
+            name='slug',
+            field=models.SlugField(blank=True, max_length=25, unique=True, verbose_name='URL'),
+        ),
+        migrations.AddConstraint(
+            model_name='review',
+            constraint=models.UniqueConstraint(condition=models.Q(('legacy_slug__isnull', False)), fields=('legacy_slug',), name='review_legacy_slug_unique'),
+        ),
+        migrations.RunPython(rekey_slugs, restore_slugs),
+    ]
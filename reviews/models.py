@@ -1,9 +1,19 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
 from django.urls import reverse
 
 from users.models import NULLABLE
 from dogs.models import Dog
+from reviews.utils import slug_generator
+
+SLUG_ATTEMPTS = 3  # Попыток сохранить новый отзыв при совпадении сгенерированного слага
+
+
+class PublishedReviewManager(models.Manager):
+    """Менеджер опубликованных отзывов (Review.published): условие совпадает с индексом review_published_idx."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(sign_of_review=True)
 
 
 class Review(models.Model):
@@ -15,29 +25,46 @@ class Review(models.Model):
 
     Атрибуты:
         title (CharField): Заголовок отзыва, максимальная длина 150 символов.
-        slug (SlugField): Уникальный слаг для отзыва, используется в URL.
+        slug (SlugField): Уникальный слаг для отзыва, используется в URL. Если не задан, создается
+            при сохранении упорядоченным по времени (reviews.utils.slug_generator).
+        legacy_slug (SlugField): Случайный слаг отзыва, созданного до перехода на упорядоченные слаги:
+            старые ссылки перенаправляются на новый адрес.
         content (TextField): Содержимое отзыва.
         created (DateTimeField): Дата и время создания отзыва, автоматически устанавливается при добавлении.
         sign_of_review (BooleanField): Статус активности отзыва (по умолчанию True).
         autor (ForeignKey): Связь с пользователем, который написал отзыв.
         dog (ForeignKey): Связь с моделью Dog, указывающая на собаку, к которой относится отзыв.
 
+    Менеджеры:
+        objects: Все отзывы (менеджер по умолчанию).
+        published: Только активные отзывы (PublishedReviewManager).
+
     Методы:
         __str__(): Возвращает строковое представление отзыва по заголовку.
         get_absolute_url(): Возвращает URL для просмотра деталей отзыва.
+        save(): Сохраняет отзыв в одной транзакции с изменением счетчиков собаки, создавая слаг.
 
     Метаданные:
         verbose_name: Человекочитаемое имя модели в единственном числе.
         verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+        indexes: Индексы под списки отзывов (сначала новые, курсорная пагинация по created и pk).
+        constraints: Уникальность заполненных старых слагов.
     """
 
     title = models.CharField(max_length=150, verbose_name='Заголовок')  # Заголовок отзыва
-    slug = models.SlugField(max_length=25, unique=True, db_index=True, verbose_name='URL')  # Уникальный слаг
+    # Уникальный слаг
+    slug = models.SlugField(max_length=25, unique=True, db_index=True, blank=True, verbose_name='URL')
+    legacy_slug = models.SlugField(max_length=25, **NULLABLE, editable=False, verbose_name='старый URL')
     content = models.TextField(verbose_name='Содержимое')  # Содержимое отзыва
     created = models.DateTimeField(verbose_name='Дата создания', auto_now_add=True)  # Дата создания
     sign_of_review = models.BooleanField(default=True, verbose_name='активный')  # Статус активности
-    autor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, **NULLABLE, verbose_name='Автор')  # Автор отзыва
-    dog = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='dogs', verbose_name='Собака')  # Связанная собака
+    # Автор отзыва
+    autor = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, **NULLABLE, verbose_name='Автор')
+    # Связанная собака
+    dog = models.ForeignKey(Dog, on_delete=models.CASCADE, related_name='dogs', verbose_name='Собака')
+
+    objects = models.Manager()  # Объявлен первым, чтобы остаться менеджером по умолчанию
+    published = PublishedReviewManager()
 
     def __str__(self):
         """Возвращает строковое представление заголовка отзыва."""
@@ -47,7 +74,39 @@ class Review(models.Model):
         """Возвращает URL для просмотра деталей отзыва."""
         return reverse('reviews:detail_review', kwargs={'slug': self.slug})
 
+    def save(self, *args, **kwargs):
+        """
+        Сохраняет отзыв; счетчики отзывов собаки меняются в post_save в той же транзакции.
+
+        Слаг нового отзыва создается без запроса к базе. Если он все же совпал со слагом,
+        созданным другим процессом в ту же миллисекунду, вставка повторяется с новым слагом.
+        """
+        generated = not self.slug
+        for attempt in range(SLUG_ATTEMPTS):
+            if generated:
+                self.slug = slug_generator()
+            try:
+                with transaction.atomic():
+                    super().save(*args, **kwargs)
+                return
+            except IntegrityError:
+                if not generated or attempt == SLUG_ATTEMPTS - 1 \
+                        or not Review.objects.filter(slug=self.slug).exists():
+                    raise
+
     class Meta:
         verbose_name = 'review'  # Человекочитаемое имя модели в единственном числе
         verbose_name_plural = 'reviews'  # Человекочитаемое имя модели во множественном числе
-
+        indexes = [
+            # Активные отзывы (ReviewListView): WHERE sign_of_review ORDER BY created DESC, id DESC
+            models.Index(fields=['-created', '-id'], condition=models.Q(sign_of_review=True),
+                         name='review_published_idx'),
+            # Неактивные отзывы (ReviewDeactivatedListView)
+            models.Index(fields=['-created', '-id'], condition=models.Q(sign_of_review=False),
+                         name='review_hidden_idx'),
+        ]
+        constraints = [
+            # Только для отзывов со старым слагом: у новых legacy_slug пуст
+            models.UniqueConstraint(fields=['legacy_slug'], condition=models.Q(legacy_slug__isnull=False),
+                                    name='review_legacy_slug_unique'),
+        ]
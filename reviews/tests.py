@@ -1,3 +1,103 @@
-from django.test import TestCase
+from functools import partial
+from unittest import mock
 
-# Create your tests here.
+from django.db import connection
+from django.test import Client, TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from dogs.models import Category, Dog
+from dogs.testing import QueryCountTestMixin
+from reviews.models import Review
+from reviews.utils import SLUG_LENGTH, slug_generator
+from users.models import User
+
+
+class ReviewListQueryCountTest(QueryCountTestMixin, TestCase):
+    """Списки отзывов загружают собак и породы пачкой, а не отдельным запросом на каждую карточку."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='user@test.ru')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add_reviews(self, count, active=True):
+        """Добавляет count отзывов о разных собаках разных пород."""
+        for i in range(count):
+            category = Category.objects.create(name=f'Порода {i}', description='-')
+            dog = Dog.objects.create(name=f'Шарик {i}', category=category)
+            Review.objects.create(title=f'Отзыв {i}', content='-', slug=slug_generator(), dog=dog,
+                                  autor=self.user, sign_of_review=active)
+
+    def test_list_reviews(self):
+        self.assertConstantQueries(reverse('reviews:list_reviews'), self.add_reviews)
+
+    def test_deactivated_reviews(self):
+        self.assertConstantQueries(reverse('reviews:deactivated_reviews'), partial(self.add_reviews, active=False))
+
+
+class ReviewSlugTest(TestCase):
+    """Слаги отзывов упорядочены по времени, совпадение повторяется новым слагом, старые слаги перенаправляются."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='user@test.ru')
+        self.client.force_login(self.user)
+        self.dog = Dog.objects.create(name='Шарик', category=Category.objects.create(name='Лайка', description='-'))
+
+    def test_slugs_are_ordered_and_unique(self):
+        slugs = [slug_generator() for _ in range(1000)]
+        self.assertEqual(slugs, sorted(slugs))
+        self.assertEqual(len(set(slugs)), len(slugs))
+        self.assertTrue(all(len(slug) == SLUG_LENGTH and slug == slug.lower() for slug in slugs))
+
+    def test_create_generates_slug_in_one_insert(self):
+        self.user.role = 'user'
+        self.user.save()
+        with CaptureQueriesContext(connection) as queries:
+            Review.objects.create(title='Отлично', content='-', dog=self.dog)
+        review_queries = [query['sql'] for query in queries.captured_queries if '"reviews_review"' in query['sql']]
+        self.assertEqual(len(review_queries), 1)  # Только INSERT: слаг не проверяется запросом
+        response = self.client.post(reverse('reviews:create_review'), {'dog': self.dog.pk, 'title': 'Хорошо',
+                                                                       'content': '-'})
+        review = Review.objects.get(title='Хорошо')
+        self.assertRedirects(response, review.get_absolute_url(), fetch_redirect_response=False)
+        self.assertEqual((len(review.slug), review.autor), (SLUG_LENGTH, self.user))
+
+    def test_collision_retries_with_new_slug(self):
+        taken = Review.objects.create(title='Первый', content='-', dog=self.dog).slug
+        with mock.patch('reviews.models.slug_generator', side_effect=[taken, 'fresh-slug']):
+            review = Review.objects.create(title='Второй', content='-', dog=self.dog)
+        self.assertEqual(review.slug, 'fresh-slug')
+
+    def test_legacy_slug_redirects(self):
+        review = Review.objects.create(title='Старый', content='-', dog=self.dog, legacy_slug='OldRandomSlug123')
+        response = self.client.get(reverse('reviews:detail_review', args=['OldRandomSlug123']))
+        self.assertRedirects(response, review.get_absolute_url(), status_code=301)
+        self.assertEqual(self.client.get(reverse('reviews:detail_review', args=['missing'])).status_code, 404)
+
+
+class ReviewToggleActivityTest(TestCase):
+    """Активность отзыва переключается только POST-запросом с CSRF-токеном."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='user@test.ru')
+        dog = Dog.objects.create(name='Шарик', category=Category.objects.create(name='Лайка', description='-'))
+        self.review = Review.objects.create(title='Отзыв', content='-', dog=dog, autor=self.user)
+        self.url = reverse('reviews:toggle_activity_review', args=[self.review.slug])
+        self.client = Client(enforce_csrf_checks=True)
+        self.client.force_login(self.user)
+
+    def test_toggle_requires_post(self):
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        self.assertEqual(self.client.post(self.url).status_code, 403)  # Без CSRF-токена
+        self.review.refresh_from_db()
+        self.assertTrue(self.review.sign_of_review)
+
+        response = self.client.get(reverse('reviews:update_review', args=[self.review.slug]))
+        self.assertContains(response, f'formaction="{self.url}"')
+        response = self.client.post(self.url, {'csrfmiddlewaretoken': response.context['csrf_token']})
+        self.assertRedirects(response, reverse('reviews:deactivated_reviews'), fetch_redirect_response=False)
+        self.review.refresh_from_db()
+        self.assertFalse(self.review.sign_of_review)
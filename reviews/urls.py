@@ -1,19 +1,29 @@
+from django.conf import settings
 from django.urls import path
 
 from reviews.apps import ReviewsConfig
 from reviews.views import ReviewListView, ReviewDeactivatedListView, ReviewCreateView, ReviewDetailView, \
-    ReviewUpdateView, ReviewDeleteView, review_toggle_activity
+    ReviewUpdateView, ReviewDeleteView, review_toggle_activity, ReviewSearchListView, review_bulk_moderation, \
+    review_list_async, review_detail_async
 
 # Устанавливаем имя пространства имен для маршрутов приложения 'reviews'
 app_name = ReviewsConfig.name
 
+# Представления для чтения: асинхронные под ASGI (settings.ASYNC_VIEWS), синхронные под WSGI
+if settings.ASYNC_VIEWS:
+    review_list_view, review_detail_view = review_list_async, review_detail_async
+else:
+    review_list_view, review_detail_view = ReviewListView.as_view(), ReviewDetailView.as_view()
+
 urlpatterns = [
-    path('', ReviewListView.as_view(), name='list_reviews'),  # Список всех отзывов
+    path('', review_list_view, name='list_reviews'),  # Список всех отзывов
     path('deactivated/', ReviewDeactivatedListView.as_view(), name='deactivated_reviews'),  # Список неактивных отзывов
+    path('search/', ReviewSearchListView.as_view(), name='search_reviews'),  # Поиск отзывов
     path('review/create/', ReviewCreateView.as_view(), name='create_review'),  # Создание нового отзыва
-    path('review/detail/<slug:slug>/', ReviewDetailView.as_view(), name='detail_review'),  # Детали отзыва по слагу
+    path('review/detail/<slug:slug>/', review_detail_view, name='detail_review'),  # Детали отзыва по слагу
     path('review/update/<slug:slug>/', ReviewUpdateView.as_view(), name='update_review'),  # Обновление отзыва по слагу
     path('review/delete/<slug:slug>/', ReviewDeleteView.as_view(), name='delete_review'),  # Удаление отзыва по слагу
     path('review/toggle/<slug:slug>/', review_toggle_activity, name='toggle_activity_review'),  # Переключение
     # активности отзыва по слагу
+    path('bulk/', review_bulk_moderation, name='bulk_moderation_reviews'),  # Массовая модерация выбранных отзывов
 ]
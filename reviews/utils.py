@@ -1,6 +1,56 @@
-import string
-import random
+import secrets
+import threading
+import time
 
+# Слаг отзыва: 9 символов времени создания в миллисекундах + 11 случайных символов, base36.
+# Строчные буквы и цифры сортируются одинаково в двоичной и регистронезависимой сортировке
+# (SQL Server по умолчанию не различает регистр), поэтому новые слаги всегда попадают в конец
+# уникального индекса, а не в случайную страницу B-дерева.
+SLUG_ALPHABET = '0123456789abcdefghijklmnopqrstuvwxyz'
+SLUG_TIME_LENGTH = 9  # 36 ** 9 мс - до 5188 года
+SLUG_RANDOM_LENGTH = 11  # 36 ** 11 = 2 ** 56.9 вариантов на каждую миллисекунду
+SLUG_LENGTH = SLUG_TIME_LENGTH + SLUG_RANDOM_LENGTH
 
-def slug_generator():
-    return ''.join(random.choices(string.ascii_lowercase + string.digits + string.ascii_uppercase, k=20))
+_last = (0, 0)  # Время и случайная часть последнего слага процесса
+_lock = threading.Lock()
+
+
+def encode_base36(value, length):
+    """Кодирует неотрицательное число строкой base36 фиксированной длины."""
+    chars = []
+    for _ in range(length):
+        value, digit = divmod(value, 36)
+        chars.append(SLUG_ALPHABET[digit])
+    return ''.join(reversed(chars))
+
+
+def slug_generator(moment=None):
+    """
+    Создает уникальный слаг отзыва, упорядоченный по времени создания (как ULID, но в base36).
+
+    Слаги одного процесса строго возрастают: в пределах одной миллисекунды случайная часть
+    предыдущего слага увеличивается на 1. Случайная часть разных процессов совпадает
+    с вероятностью 2 ** -57 на миллисекунду, а совпадение отлавливает Review.save().
+
+    Args:
+        moment (datetime | None): Время, по которому строится слаг (перевод старых слагов); None - текущее.
+
+    Returns:
+        str: Слаг длиной SLUG_LENGTH символов.
+    """
+    global _last
+    if moment is not None:
+        milliseconds = int(moment.timestamp() * 1000)
+        return encode_base36(milliseconds, SLUG_TIME_LENGTH) + \
+            encode_base36(secrets.randbelow(36 ** SLUG_RANDOM_LENGTH), SLUG_RANDOM_LENGTH)
+
+    with _lock:
+        milliseconds = time.time_ns() // 1_000_000
+        last_milliseconds, last_random = _last
+        if milliseconds <= last_milliseconds and last_random + 1 < 36 ** SLUG_RANDOM_LENGTH:
+            milliseconds, random_part = last_milliseconds, last_random + 1
+        else:
+            milliseconds = max(milliseconds, last_milliseconds + (milliseconds <= last_milliseconds))
+            random_part = secrets.randbelow(36 ** SLUG_RANDOM_LENGTH // 2)  # Запас для увеличения на 1
+        _last = (milliseconds, random_part)
+    return encode_base36(milliseconds, SLUG_TIME_LENGTH) + encode_base36(random_part, SLUG_RANDOM_LENGTH)
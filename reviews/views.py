@@ -1,16 +1,23 @@
-from django.http import HttpResponseForbidden
+from django.http import Http404, HttpResponseForbidden
 from django.shortcuts import reverse, get_object_or_404, redirect
 from django.views.generic import CreateView, ListView, DetailView, UpdateView, DeleteView
 from django.contrib.auth.mixins import LoginRequiredMixin, PermissionRequiredMixin
 from django.core.exceptions import PermissionDenied
+from django.contrib.auth.decorators import login_required
+from django.template.response import TemplateResponse
+from django.urls import reverse_lazy
+from django.views.decorators.http import require_POST
 
 from reviews.models import Review
 from users.models import UserRoles
 from reviews.forms import ReviewForm
-from reviews.utils import slug_generator
+from dogs.utils import QueryBudgetMixin
+from dogs.pagination import KeysetPaginationMixin, apaginate_keyset, set_page_queries
+from dogs.moderation import bulk_set_active, moderation_response
+from search.services import search_queryset
 
 
-class ReviewListView(LoginRequiredMixin, ListView):
+class ReviewListView(QueryBudgetMixin, LoginRequiredMixin, KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка всех активных отзывов.
 
@@ -29,6 +36,8 @@ class ReviewListView(LoginRequiredMixin, ListView):
         'title': 'Все отзывы'
     }
     template_name = 'reviews/reviews_list.html'
+    keyset_ordering = '-created'  # Сначала новые отзывы
+    query_budget = 5
 
     def get_queryset(self):
         """
@@ -37,12 +46,11 @@ class ReviewListView(LoginRequiredMixin, ListView):
         Returns:
             QuerySet: Список отзывов с активным статусом.
         """
-        queryset = super().get_queryset()
-        queryset = queryset.filter(sign_of_review=True)  # Фильтрация по статусу активности
+        queryset = Review.published.select_related('dog__category')  # Активные отзывы с собакой
         return queryset
 
 
-class ReviewDeactivatedListView(LoginRequiredMixin, ListView):
+class ReviewDeactivatedListView(QueryBudgetMixin, LoginRequiredMixin, KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка неактивных отзывов.
 
@@ -58,9 +66,12 @@ class ReviewDeactivatedListView(LoginRequiredMixin, ListView):
     """
     model = Review
     extra_context = {
-        'title': 'Неактивные отзывы'
+        'title': 'Неактивные отзывы',
+        'bulk_moderation_url': reverse_lazy('reviews:bulk_moderation_reviews'),  # Форма массовой модерации
     }
     template_name = 'reviews/reviews_list.html'
+    keyset_ordering = '-created'  # Сначала новые отзывы
+    query_budget = 5
 
     def get_queryset(self):
         """
@@ -70,10 +81,38 @@ class ReviewDeactivatedListView(LoginRequiredMixin, ListView):
             QuerySet: Список отзывов с неактивным статусом.
         """
         queryset = super().get_queryset()
-        queryset = queryset.filter(sign_of_review=False)  # Фильтрация по статусу активности
+        queryset = queryset.filter(sign_of_review=False).select_related('dog__category')  # Неактивные отзывы с собакой
         return queryset
 
 
+class ReviewSearchListView(QueryBudgetMixin, LoginRequiredMixin, ListView):
+    """
+    Представление для поиска активных отзывов по заголовку и тексту.
+
+    Ограничивает доступ только для авторизованных пользователей.
+
+    Атрибуты:
+        model: Модель Review.
+        extra_context: Дополнительный контекст для шаблона.
+        template_name: Шаблон для отображения результатов поиска.
+
+    Returns:
+        list: Список активных отзывов, соответствующих запросу, в порядке релевантности.
+    """
+    model = Review
+    extra_context = {
+        'title': 'Результаты поискового запроса'
+    }
+    template_name = 'reviews/reviews_list.html'
+    query_budget = 7
+
+    def get_queryset(self):
+        """Получает список активных отзывов из поискового индекса."""
+        query = self.request.GET.get('q', '')
+        queryset = Review.published.select_related('dog__category')
+        return search_queryset(query, queryset)
+
+
 class ReviewCreateView(LoginRequiredMixin, CreateView):
     """
     Представление для создания нового отзыва.
@@ -106,14 +145,8 @@ class ReviewCreateView(LoginRequiredMixin, CreateView):
         if self.request.user.role not in [UserRoles.USER, UserRoles.ADMIN]:
             return HttpResponseForbidden()  # Запрет доступа если роль пользователя не USER или ADMIN
 
-        self.object = form.save()  # Сохранение формы
-
-        if self.object.slug == 'temp_slug':
-            self.object.slug = slug_generator()  # Генерация уникального слага если он временный
-
-        self.object.autor = self.request.user  # Установка текущего пользователя как автора отзыва
-        self.object.save()  # Сохранение объекта отзыва
-
+        form.instance.autor = self.request.user  # Установка текущего пользователя как автора отзыва
+        # Одна вставка: слаг, упорядоченный по времени, создает Review.save()
         return super().form_valid(form)
 
 
@@ -128,12 +161,23 @@ class ReviewDetailView(LoginRequiredMixin, DetailView):
          template_name: Шаблон для отображения деталей отзыва.
 
      Returns:
-         HttpResponse: Рендеринг страницы с деталями отзыва.
+         HttpResponse: Рендеринг страницы с деталями отзыва или постоянное перенаправление
+         со старого случайного слага на новый.
      """
 
     model = Review
     template_name = 'reviews/review_detail.html'
 
+    def get(self, request, *args, **kwargs):
+        """Показывает отзыв, а по старому слагу (Review.legacy_slug) перенаправляет на новый адрес."""
+        try:
+            return super().get(request, *args, **kwargs)
+        except Http404:
+            slug = Review.objects.filter(legacy_slug=kwargs['slug']).values_list('slug', flat=True).first()
+            if slug is None:
+                raise
+            return redirect('reviews:detail_review', slug=slug, permanent=True)
+
 
 class ReviewUpdateView(LoginRequiredMixin, UpdateView):
     """
@@ -194,26 +238,96 @@ class ReviewDeleteView(PermissionRequiredMixin, DeleteView):
         return reverse('reviews:list_reviews')
 
 
+@login_required
+@require_POST
 def review_toggle_activity(request, slug):
     """
     Переключает статус активности отзыва (активный/неактивный).
 
+    Читаются только pk и признак активности, а изменяется он одним UPDATE без сохранения
+    всех полей отзыва. Изменять чужие отзывы могут только модераторы и администраторы.
+    Принимает только POST с CSRF-токеном: переход по ссылке не меняет данные.
+
     Args:
-        request (HttpRequest): HTTP запрос от клиента.
+        request (HttpRequest): POST-запрос от клиента.
         slug (str): Уникальный слаг отзыва.
 
     Returns:
         HttpResponseRedirect: Перенаправление на страницу со списком активных или неактивных отзывов в зависимости от статуса.
     """
 
-    review_item = get_object_or_404(Review, slug=slug)  # Получение объекта отзыва по слагу
+    pk, sign_of_review = get_object_or_404(Review.objects.values_list('pk', 'sign_of_review'), slug=slug)
+
+    if bulk_set_active(Review, request.user, [pk], not sign_of_review)['denied']:
+        raise PermissionDenied  # Отзыв написан другим пользователем
 
-    if review_item.sign_of_review:
-        review_item.sign_of_review = False  # Установка статуса неактивным
-        review_item.save()
+    if sign_of_review:
         return redirect(reverse('reviews:deactivated_reviews'))  # Перенаправление на страницу неактивных отзывов
-    else:
-        review_item.sign_of_review = True  # Установка статуса активным
-        review_item.save()
-        return redirect(reverse('reviews:list_reviews'))  # Перенаправление на страницу активных отзывов
+    return redirect(reverse('reviews:list_reviews'))  # Перенаправление на страницу активных отзывов
+
 
+@login_required
+@require_POST
+def review_bulk_moderation(request):
+    """
+    Массово активирует, деактивирует или удаляет выбранные отзывы.
+
+    Права проверяются сразу для всего набора: модераторы и администраторы изменяют
+    любые отзывы, пользователи - только свои, удаление требует права reviews.delete_review.
+
+    Args:
+        request (HttpRequest): POST-запрос с полями action и pk.
+
+    Returns:
+        HttpResponse: Перенаправление на список неактивных отзывов или JSON со счетчиками.
+    """
+    return moderation_response(request, 'reviews.Review', reverse('reviews:deactivated_reviews'))
+
+
+# Асинхронные варианты представлений для чтения (settings.ASYNC_VIEWS, запуск через ASGI)
+
+@login_required
+async def review_list_async(request):
+    """
+    Асинхронный вариант ReviewListView с той же курсорной пагинацией.
+
+    Args:
+        request: HTTP запрос.
+
+    Returns:
+        TemplateResponse: Страница списка активных отзывов.
+    """
+    page = await apaginate_keyset(Review.published.select_related('dog__category'), request.GET.get('cursor'),
+                                  ReviewListView.paginate_by, ReviewListView.keyset_ordering)
+    set_page_queries(page, request)
+    context = {
+        'object_list': page.object_list,
+        'page_obj': page,
+        'is_paginated': page.has_other_pages(),
+        'title': 'Все отзывы',
+    }
+    return TemplateResponse(request, 'reviews/reviews_list.html', context)
+
+
+@login_required
+async def review_detail_async(request, slug):
+    """
+    Асинхронный вариант ReviewDetailView, в том числе с перенаправлением со старого слага.
+
+    Args:
+        request: HTTP запрос.
+        slug (str): Слаг отзыва.
+
+    Returns:
+        HttpResponse: Страница отзыва или постоянное перенаправление на новый адрес.
+
+    Raises:
+        Http404: Отзыв не найден ни по новому, ни по старому слагу.
+    """
+    review = await Review.objects.select_related('dog', 'autor').filter(slug=slug).afirst()
+    if review is None:
+        new_slug = await Review.objects.filter(legacy_slug=slug).values_list('slug', flat=True).afirst()
+        if new_slug is None:
+            raise Http404('Отзыв не найден')
+        return redirect('reviews:detail_review', slug=new_slug, permanent=True)
+    return TemplateResponse(request, 'reviews/review_detail.html', {'object': review, 'review': review})
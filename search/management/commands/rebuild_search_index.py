@@ -0,0 +1,26 @@
+from django.core.management import BaseCommand
+
+from search.services import prune_terms, rebuild_index
+
+
+class Command(BaseCommand):
+    """
+    Перестраивает поисковый индекс для собак, пород, отзывов и пользователей.
+
+    Нужна после первого развертывания и после массовых изменений в обход сигналов
+    (queryset.update, загрузка данных напрямую в базу). С --prune только удаляет из словаря
+    слова, не встречающиеся ни в одном объекте (можно запускать по расписанию).
+    """
+
+    help = 'Перестраивает поисковый индекс'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1000, help='Количество объектов в пачке')
+        parser.add_argument('--prune', action='store_true', help='Только удалить неиспользуемые слова словаря')
+
+    def handle(self, *args, **options):
+        if options['prune']:
+            print(f'Удалено слов: {prune_terms()}')
+            return
+        for label, count in rebuild_index(options['batch_size']).items():
+            print(f'{label}: проиндексировано {count}')
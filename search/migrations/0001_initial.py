@@ -0,0 +1,44 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:07
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('contenttypes', '0002_remove_content_type_name'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64, unique=True, verbose_name='term')),
+                ('length', models.PositiveSmallIntegerField(verbose_name='length')),
+            ],
+            options={
+                'verbose_name': 'search term',
+                'verbose_name_plural': 'search terms',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('object_id', models.PositiveBigIntegerField(verbose_name='object id')),
+                ('weight', models.FloatField(default=1, verbose_name='weight')),
+                ('content_type', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='contenttypes.contenttype', verbose_name='content type')),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='postings', to='search.searchterm', verbose_name='term')),
+            ],
+            options={
+                'verbose_name': 'search posting',
+                'verbose_name_plural': 'search postings',
+                'indexes': [models.Index(fields=['content_type', 'object_id'], name='search_posting_object_idx')],
+                'constraints': [models.UniqueConstraint(fields=('term', 'content_type', 'object_id'), name='search_posting_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,72 @@
+from django.db import models
+from django.contrib.contenttypes.models import ContentType
+
+
+class SearchTerm(models.Model):
+    """
+    Модель слова в словаре поискового индекса.
+
+    Словарь намного меньше таблицы вхождений, поэтому поиск по префиксу и поиск
+    с опечатками выполняются по нему, а затем по найденным словам выбираются вхождения.
+
+    Атрибуты:
+        term (CharField): Слово в нормализованном виде (нижний регистр, ё -> е).
+        length (PositiveSmallIntegerField): Длина слова, нужна для отбора кандидатов с опечатками.
+
+    Методы:
+        __str__(): Возвращает слово.
+
+    Метаданные:
+        verbose_name: Человекочитаемое имя модели в единственном числе.
+        verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+    """
+
+    term = models.CharField(max_length=64, unique=True, verbose_name='term')  # Слово
+    length = models.PositiveSmallIntegerField(verbose_name='length')  # Длина слова
+
+    def __str__(self):
+        """Возвращает слово."""
+        return self.term
+
+    class Meta:
+        verbose_name = 'search term'
+        verbose_name_plural = 'search terms'
+
+
+class SearchPosting(models.Model):
+    """
+    Модель вхождения слова в объект (обратный индекс).
+
+    Атрибуты:
+        term (ForeignKey): Слово из словаря.
+        content_type (ForeignKey): Тип проиндексированного объекта.
+        object_id (PositiveBigIntegerField): ID проиндексированного объекта.
+        weight (FloatField): Вес вхождения - сумма весов полей, в которых встречается слово.
+
+    Методы:
+        __str__(): Возвращает строковое представление вхождения.
+
+    Метаданные:
+        verbose_name: Человекочитаемое имя модели в единственном числе.
+        verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+        constraints: Одно вхождение слова на объект.
+        indexes: Индекс для удаления вхождений объекта при переиндексации.
+    """
+
+    term = models.ForeignKey(SearchTerm, on_delete=models.CASCADE, related_name='postings', verbose_name='term')
+    content_type = models.ForeignKey(ContentType, on_delete=models.CASCADE, verbose_name='content type')
+    object_id = models.PositiveBigIntegerField(verbose_name='object id')
+    weight = models.FloatField(default=1, verbose_name='weight')
+
+    def __str__(self):
+        return f'{self.term_id} -> {self.content_type_id}:{self.object_id}'
+
+    class Meta:
+        verbose_name = 'search posting'
+        verbose_name_plural = 'search postings'
+        constraints = [
+            models.UniqueConstraint(fields=['term', 'content_type', 'object_id'], name='search_posting_unique'),
+        ]
+        indexes = [
+            models.Index(fields=['content_type', 'object_id'], name='search_posting_object_idx'),
+        ]
@@ -0,0 +1,269 @@
+import re
+from collections import defaultdict
+
+from django.apps import apps
+from django.contrib.contenttypes.models import ContentType
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, OuterRef
+
+from search.models import SearchTerm, SearchPosting
+
+# Индексируемые модели: поле модели -> вес поля при ранжировании
+SEARCH_FIELDS = {
+    'dogs.Category': {'name': 3.0, 'description': 1.0},
+    'dogs.Dog': {'name': 3.0},
+    'reviews.Review': {'title': 2.0, 'content': 1.0},
+    'users.User': {'first_name': 2.0, 'last_name': 2.0},
+}
+
+EXACT_MATCH = 1.0  # Множитель веса при точном совпадении слова
+PREFIX_MATCH = 0.6  # Множитель веса при совпадении по префиксу
+FUZZY_MATCH = 0.4  # Множитель веса при совпадении с опечаткой
+PREFIX_TERMS_LIMIT = 50  # Сколько слов словаря брать на один префикс
+FUZZY_TERMS_LIMIT = 1000  # Сколько слов словаря проверять на опечатку для одного слова запроса
+FUZZY_MIN_LENGTH = 4  # С какой длины слова запроса допускаются опечатки
+
+TOKEN_RE = re.compile(r'\w+')
+
+
+def tokenize(text):
+    """
+    Разбивает текст на нормализованные слова.
+
+    Args:
+        text (str): Исходный текст.
+
+    Returns:
+        list: Слова в нижнем регистре, ё заменена на е, не короче двух символов.
+    """
+    text = (text or '').lower().replace('ё', 'е')
+    return [token[:64] for token in TOKEN_RE.findall(text) if len(token) > 1]
+
+
+def get_search_fields(model):
+    """Возвращает индексируемые поля модели с их весами или None, если модель не индексируется."""
+    return SEARCH_FIELDS.get(model._meta.label)
+
+
+def levenshtein(first, second, limit):
+    """
+    Вычисляет расстояние Левенштейна с ранним выходом.
+
+    Args:
+        first (str): Первое слово.
+        second (str): Второе слово.
+        limit (int): Максимальное интересующее расстояние.
+
+    Returns:
+        int: Расстояние или limit + 1, если оно больше limit.
+    """
+    if abs(len(first) - len(second)) > limit:
+        return limit + 1
+    previous = list(range(len(second) + 1))
+    for i, first_char in enumerate(first, 1):
+        current = [i]
+        for j, second_char in enumerate(second, 1):
+            current.append(min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (first_char != second_char),
+            ))
+        if min(current) > limit:
+            return limit + 1
+        previous = current
+    return previous[-1]
+
+
+def _object_terms(instance, fields):
+    """Возвращает словарь слово -> вес для объекта."""
+    weights = defaultdict(float)
+    for field, weight in fields.items():
+        for token in tokenize(getattr(instance, field)):
+            weights[token] += weight
+    return weights
+
+
+def _get_term_ids(terms):
+    """Возвращает ID слов словаря, добавляя отсутствующие слова одним запросом."""
+    existing = dict(SearchTerm.objects.filter(term__in=terms).values_list('term', 'pk'))
+    missing = [SearchTerm(term=term, length=len(term)) for term in terms if term not in existing]
+    if missing:
+        SearchTerm.objects.bulk_create(missing, ignore_conflicts=True)
+        existing.update(SearchTerm.objects.filter(term__in=[term.term for term in missing]).values_list('term', 'pk'))
+    return existing
+
+
+def index_objects(model, instances):
+    """
+    Индексирует пачку объектов одной модели.
+
+    Старые вхождения объектов удаляются, новые добавляются через bulk_create,
+    поэтому число запросов не зависит от количества объектов в пачке.
+
+    Args:
+        model (type): Класс модели.
+        instances (list): Объекты модели.
+    """
+    fields = get_search_fields(model)
+    if not fields or not instances:
+        return
+
+    content_type = ContentType.objects.get_for_model(model)
+    object_terms = {instance.pk: _object_terms(instance, fields) for instance in instances}
+    terms = {term for terms in object_terms.values() for term in terms}
+
+    for attempt in range(2):
+        term_ids = _get_term_ids(terms)
+        try:
+            with transaction.atomic():
+                SearchPosting.objects.filter(content_type=content_type, object_id__in=object_terms).delete()
+                SearchPosting.objects.bulk_create([
+                    SearchPosting(term_id=term_ids[term], content_type=content_type, object_id=pk, weight=weight)
+                    for pk, terms in object_terms.items()
+                    for term, weight in terms.items()
+                ])
+            return
+        except IntegrityError:
+            if attempt:
+                raise  # Слово удалено prune_terms() между выбором ID и вставкой - повторяем один раз
+
+
+def unindex_object(model, pk):
+    """Удаляет объект из поискового индекса."""
+    if get_search_fields(model):
+        content_type = ContentType.objects.get_for_model(model)
+        SearchPosting.objects.filter(content_type=content_type, object_id=pk).delete()
+
+
+def rebuild_index(batch_size=1000):
+    """
+    Перестраивает поисковый индекс для всех индексируемых моделей.
+
+    Args:
+        batch_size (int): Количество объектов, индексируемых за раз.
+
+    Returns:
+        dict: Количество проиндексированных объектов по моделям.
+    """
+    result = {}
+    for label, fields in SEARCH_FIELDS.items():
+        model = apps.get_model(label)
+        SearchPosting.objects.filter(content_type=ContentType.objects.get_for_model(model)).delete()
+        batch, count = [], 0
+        for instance in model.objects.only('pk', *fields).iterator(chunk_size=batch_size):
+            batch.append(instance)
+            if len(batch) == batch_size:
+                index_objects(model, batch)
+                count += len(batch)
+                batch = []
+        index_objects(model, batch)
+        result[label] = count + len(batch)
+    prune_terms()
+    return result
+
+
+def prune_terms():
+    """
+    Удаляет из словаря слова, не встречающиеся ни в одном объекте.
+
+    Вхождения удаляются при изменении и удалении объектов, а слова словаря остаются, поэтому
+    словарь чистится при перестройке индекса и командой rebuild_search_index --prune.
+
+    Returns:
+        int: Количество удаленных слов.
+    """
+    orphans = SearchTerm.objects.filter(~Exists(SearchPosting.objects.filter(term=OuterRef('pk'))))
+    return orphans.delete()[0]
+
+
+def _match_terms(token):
+    """
+    Находит слова словаря, подходящие к слову запроса.
+
+    Точное совпадение и совпадения по префиксу ищутся по индексу на term. Для опечаток
+    кандидаты ограничиваются словами с той же первой буквой и близкой длиной (не больше
+    FUZZY_TERMS_LIMIT слов, в порядке индекса на term), после чего расстояние Левенштейна
+    (1, а для слов от 7 букв - 2) проверяется в Python.
+
+    Args:
+        token (str): Нормализованное слово запроса.
+
+    Returns:
+        dict: ID слова словаря -> множитель веса совпадения.
+    """
+    matches = {}
+    for pk, term in SearchTerm.objects.filter(term__startswith=token).order_by('length')[:PREFIX_TERMS_LIMIT] \
+            .values_list('pk', 'term'):
+        matches[pk] = EXACT_MATCH if term == token else PREFIX_MATCH
+
+    if len(token) >= FUZZY_MIN_LENGTH:
+        limit = 2 if len(token) >= 7 else 1
+        candidates = SearchTerm.objects.filter(
+            term__startswith=token[0], length__range=(len(token) - limit, len(token) + limit),
+        ).exclude(pk__in=matches).order_by('term').values_list('pk', 'term')[:FUZZY_TERMS_LIMIT]
+        for pk, term in candidates:
+            if levenshtein(token, term, limit) <= limit:
+                matches[pk] = FUZZY_MATCH
+
+    return matches
+
+
+def search(query, model, limit=100, queryset=None):
+    """
+    Ищет объекты модели по поисковому индексу.
+
+    Каждое слово запроса должно найтись в объекте (точно, по префиксу или с опечаткой).
+    Объекты ранжируются по сумме весов вхождений, умноженных на качество совпадения.
+    С queryset вхождения выбираются только для его объектов (подзапрос), поэтому
+    скрытые объекты не занимают места среди первых limit результатов.
+
+    Args:
+        query (str): Поисковый запрос.
+        model (type): Класс индексируемой модели.
+        limit (int): Максимальное количество результатов.
+        queryset (QuerySet | None): Объекты, среди которых ведется поиск (например, только активные).
+
+    Returns:
+        list: ID найденных объектов, от наиболее к наименее релевантным.
+    """
+    tokens = tokenize(query)
+    if not tokens or not get_search_fields(model):
+        return []
+
+    content_type = ContentType.objects.get_for_model(model)
+    scores = None
+    for token in dict.fromkeys(tokens):
+        matches = _match_terms(token)
+        token_scores = defaultdict(float)
+        postings = SearchPosting.objects.filter(content_type=content_type, term_id__in=matches)
+        if queryset is not None:
+            postings = postings.filter(object_id__in=queryset.values('pk'))
+        postings = postings.values_list('object_id', 'term_id', 'weight')
+        for object_id, term_id, weight in postings:
+            token_scores[object_id] = max(token_scores[object_id], weight * matches[term_id])
+
+        if scores is None:
+            scores = token_scores
+        else:
+            scores = {pk: score + token_scores[pk] for pk, score in scores.items() if pk in token_scores}
+        if not scores:
+            return []
+
+    return sorted(scores, key=lambda pk: (-scores[pk], pk))[:limit]
+
+
+def search_queryset(query, queryset, limit=100):
+    """
+    Возвращает объекты queryset, найденные поиском, в порядке релевантности.
+
+    Args:
+        query (str): Поисковый запрос.
+        queryset (QuerySet): Набор объектов, среди которых ведется поиск (фильтры, select_related).
+        limit (int): Максимальное количество результатов.
+
+    Returns:
+        list: Найденные объекты.
+    """
+    ranked = search(query, queryset.model, limit, queryset)
+    objects = queryset.in_bulk(ranked)
+    return [objects[pk] for pk in ranked if pk in objects]
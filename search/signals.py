@@ -0,0 +1,27 @@
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import receiver
+
+from search.services import get_search_fields, index_objects, unindex_object
+
+
+@receiver(post_save)
+def update_search_index(sender, instance, raw=False, update_fields=None, **kwargs):
+    """
+    Обновляет поисковый индекс после сохранения индексируемого объекта.
+
+    Сохранения, не затрагивающие индексируемые поля (например, last_login при входе),
+    индекс не трогают.
+    """
+    fields = get_search_fields(sender)
+    if not fields or raw:
+        return
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return
+    index_objects(sender, [instance])
+
+
+@receiver(post_delete)
+def remove_from_search_index(sender, instance, **kwargs):
+    """Удаляет объект из поискового индекса после его удаления."""
+    if get_search_fields(sender):
+        unindex_object(sender, instance.pk)
@@ -0,0 +1,63 @@
+from django.test import TestCase
+from django.urls import reverse
+
+from dogs.models import Category, Dog
+from search.models import SearchPosting, SearchTerm
+from search.services import prune_terms, rebuild_index, search, search_queryset
+from users.models import User
+
+
+class SearchTest(TestCase):
+    """Поиск по индексу находит объекты точно, по префиксу и с опечаткой и ранжирует их."""
+
+    def setUp(self):
+        self.shepherd = Category.objects.create(name='Немецкая овчарка', description='Служебная порода')
+        self.spaniel = Category.objects.create(name='Спаниель', description='Охотничья порода, похожа на овчарку')
+        self.rex = Dog.objects.create(name='Рекс', category=self.shepherd)
+        self.rexona = Dog.objects.create(name='Рексона', category=self.shepherd)
+
+    def test_exact_match_ranks_first(self):
+        self.assertEqual(search('рекс', Dog), [self.rex.pk, self.rexona.pk])
+
+    def test_name_outranks_description(self):
+        self.assertEqual(search('овчарка', Category), [self.shepherd.pk, self.spaniel.pk])
+
+    def test_typo(self):
+        self.assertEqual(search('Спаниэль', Category), [self.spaniel.pk])
+
+    def test_all_words_required(self):
+        self.assertEqual(search('немецкая спаниель', Category), [])
+
+    def test_index_follows_changes(self):
+        self.rex.name = 'Бобик'
+        self.rex.save()
+        self.assertEqual(search('бобик', Dog), [self.rex.pk])
+        self.rexona.delete()
+        self.assertEqual(search('рексона', Dog), [])
+
+    def test_rebuild(self):
+        SearchPosting.objects.all().delete()
+        rebuild_index()
+        self.assertEqual(search('рекс', Dog), [self.rex.pk, self.rexona.pk])
+
+    def test_hidden_objects_do_not_crowd_out_results(self):
+        hidden = Dog.objects.bulk_create(Dog(name='Рекс Рекс', category=self.shepherd, is_active=False)
+                                         for _ in range(2))
+        rebuild_index()
+        self.assertEqual(search('рекс', Dog, limit=2), [dog.pk for dog in hidden])  # Без фильтра - только скрытые
+        self.assertEqual(search_queryset('рекс', Dog.active.all(), limit=2), [self.rex, self.rexona])
+
+    def test_orphan_terms_pruned(self):
+        self.rexona.name = 'Бобик'
+        self.rexona.save()
+        self.assertTrue(SearchTerm.objects.filter(term='рексона').exists())
+        self.assertEqual(prune_terms(), 1)
+        self.assertFalse(SearchTerm.objects.filter(term='рексона').exists())
+        self.assertEqual(search('рекс', Dog), [self.rex.pk])
+
+    def test_views_without_query(self):
+        self.client.force_login(User.objects.create(email='user@test.ru'))
+        for name in ('dogs:search_categories', 'dogs:search_dogs', 'reviews:search_reviews', 'users:search_users'):
+            response = self.client.get(reverse(name))
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(list(response.context['object_list']), [])
@@ -1,10 +1,26 @@
 from django.contrib import admin
-from users.models import User
+from dogs.admin import ScalableAdminMixin
+from dogs.exports import make_export_action
+from users.models import User, OutgoingEmail
 
 
 @admin.register(User)
-class UserAdmin(admin.ModelAdmin):
+class UserAdmin(ScalableAdminMixin, admin.ModelAdmin):
     list_display = ('email', 'last_name', 'first_name', 'role', 'pk', 'is_active')
-    list_filter = ('last_name', 'is_active')  # Добавлено поле is_active для фильтрации
+    list_filter = ('role', 'is_active')  # Фильтр по фамилии выводил каждую фамилию, поэтому фильтр по роли
     search_fields = ('email', 'last_name', 'first_name')  # Добавлена возможность поиска
     ordering = ('last_name', 'first_name')  # Установлена сортировка по умолчанию
+    actions = (make_export_action('breeders', 'csv'), make_export_action('breeders', 'jsonl'))  # Выгрузка заводчиков
+
+
+@admin.register(OutgoingEmail)
+class OutgoingEmailAdmin(ScalableAdminMixin, admin.ModelAdmin):
+    list_display = ('subject', 'recipients', 'status', 'attempts', 'next_attempt_at', 'sent_at')
+    list_filter = ('status',)  # Фильтрация по статусу отправки
+    search_fields = ('recipients', 'subject')  # Поиск по получателям и теме
+    ordering = ('-created',)  # Сначала новые письма
+
+    def get_exclude(self, request, obj=None):
+        """Не показывает текст секретного письма (например, с новым паролем)."""
+        exclude = super().get_exclude(request, obj) or ()
+        return (*exclude, 'message') if obj is not None and obj.is_sensitive else exclude
@@ -0,0 +1,65 @@
+from django.contrib.auth.backends import ModelBackend
+from django.core.cache import cache
+
+from dogs.caching import get_object_version
+
+USER_CACHE_KEY = 'auth:user:{pk}:{version}'
+PERMISSIONS_CACHE_KEY = 'auth:permissions:{pk}:{version}'
+AUTH_CACHE_TIMEOUT = 60 * 60
+# Любое изменение групп или прав (users.signals) меняет версию этой метки у всех пользователей
+PERMISSIONS_VERSION_LABEL = 'auth.Permission'
+
+
+class CachedModelBackend(ModelBackend):
+    """
+    ModelBackend, берущий пользователя сессии и его права из кеша.
+
+    Пользователь и вычисленные права хранятся под ключами с версией пользователя
+    (сбрасывается сигналом сохранения User, в том числе при смене пароля) и общей версией
+    прав (сбрасывается при изменении групп и прав, users.signals). Поэтому в установившемся
+    режиме страница авторизованного пользователя не выполняет запросов для аутентификации:
+    сессия читается из кеша (SESSION_ENGINE cached_db), пользователь и права - отсюда.
+
+    queryset.update() не отправляет сигналы, поэтому после массового изменения пользователей
+    (пароль, is_active) нужно вызвать dogs.caching.forget_object_versions(User, pks): иначе
+    до AUTH_CACHE_TIMEOUT сессии будут получать из кеша пользователя со старым хешем пароля.
+    """
+
+    def get_user(self, user_id):
+        """
+        Возвращает активного пользователя сессии из кеша или из базы данных.
+
+        Args:
+            user_id (str | int): pk пользователя из сессии.
+
+        Returns:
+            User | None: Пользователь или None, если он не найден или неактивен.
+        """
+        version = get_object_version('users.User', user_id, (PERMISSIONS_VERSION_LABEL,))
+        user_key = USER_CACHE_KEY.format(pk=user_id, version=version)
+        permissions_key = PERMISSIONS_CACHE_KEY.format(pk=user_id, version=version)
+        cached = cache.get_many([user_key, permissions_key])
+
+        user = cached.get(user_key)
+        if user is None:
+            user = super().get_user(user_id)
+            if user is None:
+                return None
+            cache.set(user_key, user, AUTH_CACHE_TIMEOUT)  # До вычисления прав: в кеш попадает только строка
+        user._permissions_key = permissions_key
+        user._cached_permissions = cached.get(permissions_key, {})
+        return user
+
+    def _get_permissions(self, user_obj, obj, from_name):
+        """Возвращает права пользователя ('user' или 'group'), вычисляя их один раз на версию."""
+        if obj is not None or not hasattr(user_obj, '_permissions_key') \
+                or hasattr(user_obj, f'_{from_name}_perm_cache'):
+            return super()._get_permissions(user_obj, obj, from_name)
+
+        permissions = user_obj._cached_permissions
+        if from_name not in permissions:
+            permissions = {**permissions, from_name: super()._get_permissions(user_obj, obj, from_name)}
+            cache.set(user_obj._permissions_key, permissions, AUTH_CACHE_TIMEOUT)
+            user_obj._cached_permissions = permissions
+        setattr(user_obj, f'_{from_name}_perm_cache', permissions[from_name])
+        return permissions[from_name]
@@ -1,26 +1,29 @@
-from django.core.management import BaseCommand
-import pyodbc
-from config.settings import DATABASE, USER, PASSWORD, HOST
+from django.conf import settings
+from django.core.management import BaseCommand, CommandError
+
+from config.db import create_database
 
 
 class Command(BaseCommand):
+    """
+    Создает базу данных текущего профиля (settings.DB_PROFILE, config.db).
+
+    Для SQL Server выполняет CREATE DATABASE через базу master, для SQLite создает файл базы.
+    После создания базы нужно применить миграции: python manage.py migrate.
+    """
+
+    help = 'Создает базу данных текущего профиля (DB_PROFILE)'
 
     def handle(self, *args, **options):
-        global conn
-        ConnectionString = f'''DRIVER={{ODBC Driver 17 for SQL Server}};
-                                        SERVER={HOST};
-                                        DATABASE=master;
-                                        UID={USER};
-                                        PWD={PASSWORD}'''
+        database = settings.DATABASES['default']
         try:
-            conn = pyodbc.connect(ConnectionString)
-        except pyodbc.ProgrammingError as ex:
-            print(ex)
+            created = create_database(database)
+        except ValueError as ex:
+            raise CommandError(ex)
+        except Exception as ex:  # Ошибка подключения или прав драйвера базы данных
+            raise CommandError(f'Не удалось создать базу данных {database["NAME"]}: {ex}')
+
+        if created:
+            print(f'База данных {database["NAME"]} успешно создана (профиль {settings.DB_PROFILE})')
         else:
-            conn.autocommit = True
-            try:
-                conn.execute(fr"CREATE DATABASE {DATABASE};")
-            except pyodbc.ProgrammingError as ex:
-                print(ex)
-            else:
-                print(f"База данных {DATABASE} успешно создана;")
+            print(f'База данных {database["NAME"]} уже существует (профиль {settings.DB_PROFILE})')
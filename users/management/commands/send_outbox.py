@@ -0,0 +1,33 @@
+import time
+
+from django.core.management import BaseCommand
+
+from users.services import deliver_outbox
+
+
+class Command(BaseCommand):
+    """
+    Отправляет письма из очереди (outbox) пачками.
+
+    Без флага --loop обрабатывает очередь до конца и завершается, с флагом --loop
+    работает постоянно и опрашивает очередь каждые --interval секунд.
+    """
+
+    help = 'Отправляет письма из очереди пачками через одно SMTP-соединение'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None, help='Количество писем в пачке')
+        parser.add_argument('--max-attempts', type=int, default=None, help='Допустимое число попыток отправки')
+        parser.add_argument('--loop', action='store_true', help='Работать постоянно')
+        parser.add_argument('--interval', type=float, default=5, help='Пауза между опросами очереди, сек.')
+
+    def handle(self, *args, **options):
+        while True:
+            sent, failed = deliver_outbox(options['batch_size'], options['max_attempts'])
+            if sent or failed:
+                print(f'Отправлено: {sent}, ошибок: {failed}')
+
+            if not (sent or failed):
+                if not options['loop']:
+                    break
+                time.sleep(options['interval'])  # Очередь пуста - ждем новых писем
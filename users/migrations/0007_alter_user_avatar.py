@@ -0,0 +1,19 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:11
+
+import dogs.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0006_outgoingemail'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='avatar',
+            field=models.ImageField(blank=True, null=True, storage=dogs.storage.get_media_storage, upload_to='users/', verbose_name='Avatar'),
+        ),
+    ]
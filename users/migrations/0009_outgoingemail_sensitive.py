@@ -0,0 +1,39 @@
+# Generated by Django 5.2.18 on 2026-10-17 21:03
+
+from django.db import migrations, models
+
+PASSWORD_SUBJECT = 'Вы успешно изменили пароль!'  # Тема писем users.services.send_new_password
+
+
+def hide_passwords(apps, schema_editor):
+    """Отмечает письма с новым паролем как секретные и стирает текст уже отправленных и отброшенных."""
+    OutgoingEmail = apps.get_model('users', 'OutgoingEmail')
+    emails = OutgoingEmail.objects.filter(subject=PASSWORD_SUBJECT)
+    emails.update(is_sensitive=True)
+    emails.filter(status__in=['sent', 'failed']).update(message='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0008_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='outgoingemail',
+            name='is_sensitive',
+            field=models.BooleanField(default=False, verbose_name='Sensitive'),
+        ),
+        migrations.AlterField(
+            model_name='outgoingemail',
+            name='message',
+            field=models.TextField(blank=True, verbose_name='Message'),
+        ),
+        migrations.AlterField(
+            model_name='outgoingemail',
+            name='status',
+            field=models.CharField(choices=[('pending', 'pending'), ('sending', 'sending'), ('sent', 'sent'), ('failed', 'failed')], default='pending', max_length=7, verbose_name='Status'),
+        ),
+        migrations.RunPython(hide_passwords, migrations.RunPython.noop),
+    ]
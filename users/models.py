@@ -1,7 +1,10 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
+from dogs.storage import get_media_storage
+
 # Определяет настройки для полей, которые могут быть пустыми или нулевыми
 NULLABLE = {'blank': True, 'null': True}
 
@@ -45,6 +48,7 @@ class User(AbstractUser):
         verbose_name: Человекочитаемое имя модели в единственном числе.
         verbose_name_plural: Человекочитаемое имя модели во множественном числе.
         ordering: Определяет порядок сортировки объектов по id.
+        indexes: Частичный индекс активных пользователей для списка заводчиков.
     """
 
     username = None  # Удаление поля username
@@ -54,7 +58,8 @@ class User(AbstractUser):
     last_name = models.CharField(max_length=150, verbose_name='Last Name', default="Anonymous")  # Фамилия
     phone = models.CharField(max_length=35, verbose_name='Phone Number', **NULLABLE)  # Номер телефона
     telegram = models.CharField(max_length=150, verbose_name='Telegram Username', **NULLABLE)  # Имя в Telegram
-    avatar = models.ImageField(upload_to='users/', verbose_name='Avatar', **NULLABLE)  # Аватар
+    avatar = models.ImageField(upload_to='users/', storage=get_media_storage, verbose_name='Avatar',
+                               **NULLABLE)  # Аватар, хранится под хешем содержимого
     is_active = models.BooleanField(default=True, verbose_name='active')  # Статус активности
 
     USERNAME_FIELD = "email"  # Установка поля для аутентификации
@@ -68,3 +73,87 @@ class User(AbstractUser):
         verbose_name = 'User'  # Человекочитаемое имя модели в единственном числе
         verbose_name_plural = 'Users'  # Человекочитаемое имя модели во множественном числе
         ordering = ['id']  # Порядок сортировки объектов по id
+        indexes = [
+            # Список активных заводчиков (UserListView): WHERE is_active ORDER BY id, COUNT(*) для пагинации
+            # читает узкий индекс вместо всей таблицы
+            models.Index(fields=['id'], condition=models.Q(is_active=True), name='user_active_idx'),
+        ]
+
+
+class EmailStatus(models.TextChoices):
+    """
+    Класс для определения статусов письма в очереди отправки.
+
+    Атрибуты:
+        PENDING (str): Письмо ожидает отправки.
+        SENDING (str): Письмо забрал обработчик send_outbox до истечения аренды (next_attempt_at).
+        SENT (str): Письмо отправлено.
+        FAILED (str): Письмо не удалось отправить за допустимое число попыток.
+    """
+    PENDING = 'pending', _('pending')
+    SENDING = 'sending', _('sending')
+    SENT = 'sent', _('sent')
+    FAILED = 'failed', _('failed')
+
+
+class OutgoingEmail(models.Model):
+    """
+    Модель письма в очереди отправки (outbox).
+
+    Представления не отправляют письма сами, а записывают их в эту таблицу в той же
+    транзакции, что и основные изменения. Команда send_outbox отправляет письма пачками
+    через одно SMTP-соединение и повторяет неудачные попытки с нарастающей задержкой.
+    Текст письма с секретом (is_sensitive, например новый пароль) не показывается в админке
+    и стирается, как только письмо отправлено или отброшено.
+
+    Атрибуты:
+        subject (CharField): Тема письма.
+        message (TextField): Текст письма.
+        is_sensitive (BooleanField): Текст содержит секрет и не хранится после отправки.
+        from_email (CharField): Адрес отправителя.
+        recipients (TextField): Адреса получателей через запятую.
+        status (CharField): Статус письма, выбираемый из EmailStatus.
+        attempts (PositiveIntegerField): Количество сделанных попыток отправки.
+        next_attempt_at (DateTimeField): Время, не раньше которого письмо можно отправлять
+            (для SENDING - окончание аренды, после которого письмо забирает другой обработчик).
+        last_error (TextField): Текст последней ошибки отправки.
+        created (DateTimeField): Дата и время постановки письма в очередь.
+        sent_at (DateTimeField): Дата и время успешной отправки.
+
+    Методы:
+        __str__(): Возвращает строковое представление письма по теме и получателям.
+        get_recipient_list(): Возвращает список адресов получателей.
+
+    Метаданные:
+        verbose_name: Человекочитаемое имя модели в единственном числе.
+        verbose_name_plural: Человекочитаемое имя модели во множественном числе.
+        indexes: Индекс для выборки писем, готовых к отправке.
+    """
+
+    subject = models.CharField(max_length=255, verbose_name='Subject')  # Тема письма
+    message = models.TextField(blank=True, verbose_name='Message')  # Текст письма
+    is_sensitive = models.BooleanField(default=False, verbose_name='Sensitive')  # Текст с секретом
+    from_email = models.CharField(max_length=254, verbose_name='From')  # Адрес отправителя
+    recipients = models.TextField(verbose_name='Recipients')  # Адреса получателей через запятую
+    status = models.CharField(max_length=7, choices=EmailStatus.choices, default=EmailStatus.PENDING,
+                              verbose_name='Status')  # Статус письма
+    attempts = models.PositiveIntegerField(default=0, verbose_name='Attempts')  # Количество попыток
+    next_attempt_at = models.DateTimeField(default=timezone.now, verbose_name='Next attempt')  # Время следующей попытки
+    last_error = models.TextField(blank=True, default='', verbose_name='Last error')  # Последняя ошибка
+    created = models.DateTimeField(auto_now_add=True, verbose_name='Created')  # Дата постановки в очередь
+    sent_at = models.DateTimeField(**NULLABLE, verbose_name='Sent at')  # Дата отправки
+
+    def __str__(self):
+        """Возвращает строковое представление письма по теме и получателям."""
+        return f'{self.subject} -> {self.recipients}'
+
+    def get_recipient_list(self):
+        """Возвращает список адресов получателей."""
+        return [email for email in self.recipients.split(',') if email]
+
+    class Meta:
+        verbose_name = 'Outgoing email'  # Человекочитаемое имя модели в единственном числе
+        verbose_name_plural = 'Outgoing emails'  # Человекочитаемое имя модели во множественном числе
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='users_email_status_next_idx'),
+        ]
@@ -1,10 +1,42 @@
+from datetime import timedelta
+
 from django.conf import settings
-from django.core.mail import send_mail
+from django.core.mail import EmailMessage, get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from users.models import OutgoingEmail, EmailStatus
+
+
+def queue_email(subject, message, recipient_list, from_email=None, sensitive=False):
+    """
+    Ставит письмо в очередь отправки (outbox).
+
+    Письмо записывается в базу данных в текущей транзакции и отправляется позже
+    командой send_outbox, поэтому запрос не ждет SMTP-сервер.
+
+    Args:
+        subject (str): Тема письма.
+        message (str): Текст письма.
+        recipient_list (list): Список адресов получателей.
+        from_email (str | None): Адрес отправителя, по умолчанию EMAIL_HOST_USER.
+        sensitive (bool): Текст содержит секрет: не показывается в админке и стирается после отправки.
+
+    Returns:
+        OutgoingEmail: Созданная запись очереди.
+    """
+    return OutgoingEmail.objects.create(
+        subject=subject,
+        message=message,
+        from_email=from_email or settings.EMAIL_HOST_USER,
+        recipients=','.join(recipient_list),
+        is_sensitive=sensitive,
+    )
 
 
 def send_register_email(email):
     """
-    Отправляет электронное письмо с подтверждением регистрации.
+    Ставит в очередь электронное письмо с подтверждением регистрации.
 
     Эта функция отправляет пользователю письмо с поздравлением о успешной регистрации на платформе.
 
@@ -14,17 +46,16 @@ def send_register_email(email):
     Returns:
         None
     """
-    send_mail(
+    queue_email(
         subject='Поздравляем с регистрацией',  # Тема письма
         message='Вы успешно зарегистрировались на нашей платформе Dog-kennel, добро пожаловать!',  # Сообщение письма
-        from_email=settings.EMAIL_HOST_USER,  # Адрес отправителя
         recipient_list=[email]  # Список получателей
     )
 
 
 def send_new_password(email, new_password):
     """
-    Отправляет электронное письмо с новым паролем.
+    Ставит в очередь электронное письмо с новым паролем.
 
     Эта функция отправляет пользователю письмо с новым паролем после его изменения.
 
@@ -35,9 +66,121 @@ def send_new_password(email, new_password):
     Returns:
         None
     """
-    send_mail(
+    queue_email(
         subject='Вы успешно изменили пароль!',  # Тема письма
         message=f'Ваш новый пароль: {new_password}',  # Сообщение письма с новым паролем
-        from_email=settings.EMAIL_HOST_USER,  # Адрес отправителя
-        recipient_list=[email]  # Список получателей
+        recipient_list=[email],  # Список получателей
+        sensitive=True,  # Пароль не остается в очереди после отправки
     )
+
+
+def _forget_secret(email):
+    """Стирает текст секретного письма (is_sensitive), которое больше не будет отправляться."""
+    if email.is_sensitive:
+        email.message = ''
+
+
+def _claim_outbox_batch(batch_size, max_attempts):
+    """
+    Забирает пачку писем, готовых к отправке, в короткой транзакции.
+
+    Строки блокируются с пропуском уже заблокированных (skip_locked) и сразу переводятся
+    в статус SENDING с арендой до now + EMAIL_OUTBOX_LEASE секунд, после чего транзакция
+    завершается: блокировки не держатся, пока идет обмен с SMTP-сервером. Письма, аренда
+    которых истекла (обработчик упал во время отправки), забираются снова, а исчерпавшие
+    max_attempts помечаются как FAILED.
+
+    Args:
+        batch_size (int): Максимальное количество писем в пачке.
+        max_attempts (int): Допустимое число попыток отправки.
+
+    Returns:
+        list: Список объектов OutgoingEmail со статусом SENDING и уже увеличенным attempts.
+    """
+    now = timezone.now()
+    with transaction.atomic():
+        batch = list(
+            OutgoingEmail.objects.select_for_update(skip_locked=True)
+            .filter(status__in=[EmailStatus.PENDING, EmailStatus.SENDING], next_attempt_at__lte=now)
+            .order_by('next_attempt_at', 'pk')[:batch_size]
+        )
+        expired = [email for email in batch if email.attempts >= max_attempts]  # Аренда истекла на последней попытке
+        for email in expired:
+            email.status = EmailStatus.FAILED
+            email.last_error = email.last_error or 'Истек срок аренды отправки'
+            _forget_secret(email)
+        batch = [email for email in batch if email.attempts < max_attempts]
+        for email in batch:
+            email.status = EmailStatus.SENDING
+            email.attempts += 1
+            email.next_attempt_at = now + timedelta(seconds=settings.EMAIL_OUTBOX_LEASE)
+        OutgoingEmail.objects.bulk_update(expired + batch, ['status', 'attempts', 'next_attempt_at', 'last_error',
+                                                            'message'])
+    return batch
+
+
+def deliver_outbox(batch_size=None, max_attempts=None):
+    """
+    Отправляет одну пачку писем из очереди через одно переиспользуемое соединение.
+
+    Письма забираются короткой транзакцией (_claim_outbox_batch), отправляются вне транзакции,
+    после чего их статусы сохраняются одним запросом. Успешно отправленные письма помечаются
+    как SENT. При ошибке попытка откладывается с экспоненциальной задержкой
+    EMAIL_OUTBOX_RETRY_DELAY * 2 ** (attempts - 1) секунд, а после max_attempts неудачных
+    попыток письмо помечается как FAILED. Текст секретных писем стирается после SENT и FAILED.
+
+    Args:
+        batch_size (int | None): Размер пачки, по умолчанию EMAIL_OUTBOX_BATCH_SIZE.
+        max_attempts (int | None): Допустимое число попыток, по умолчанию EMAIL_OUTBOX_MAX_ATTEMPTS.
+
+    Returns:
+        tuple: Количество отправленных и количество неудачных писем.
+    """
+    batch_size = batch_size or settings.EMAIL_OUTBOX_BATCH_SIZE
+    max_attempts = max_attempts or settings.EMAIL_OUTBOX_MAX_ATTEMPTS
+    sent = failed = 0
+
+    batch = _claim_outbox_batch(batch_size, max_attempts)
+    if not batch:
+        return sent, failed
+
+    connection = get_connection(fail_silently=False)  # Одно соединение на всю пачку
+    try:
+        connection.open()
+    except Exception as ex:
+        connection = None  # Сервер недоступен - все письма пачки уходят на повтор
+        connection_error = ex
+
+    for email in batch:
+        try:
+            if connection is None:
+                raise connection_error
+            connection.send_messages([
+                EmailMessage(email.subject, email.message, email.from_email, email.get_recipient_list(),
+                             connection=connection)
+            ])
+        except Exception as ex:
+            email.last_error = repr(ex)
+            if email.attempts >= max_attempts:
+                email.status = EmailStatus.FAILED
+                _forget_secret(email)
+            else:
+                email.status = EmailStatus.PENDING
+                delay = settings.EMAIL_OUTBOX_RETRY_DELAY * 2 ** (email.attempts - 1)
+                email.next_attempt_at = timezone.now() + timedelta(seconds=delay)  # Откладываем следующую попытку
+            failed += 1
+        else:
+            email.status = EmailStatus.SENT
+            email.sent_at = timezone.now()
+            email.last_error = ''
+            _forget_secret(email)
+            sent += 1
+
+    if connection is not None:
+        connection.close()
+
+    OutgoingEmail.objects.bulk_update(
+        batch, ['status', 'next_attempt_at', 'last_error', 'sent_at', 'message']
+    )  # Сохранение статусов всей пачки одним запросом
+
+    return sent, failed
@@ -0,0 +1,32 @@
+from django.contrib.auth.models import Group, Permission
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from dogs.caching import bump_model_version
+from users.backends import PERMISSIONS_VERSION_LABEL
+from users.models import User
+
+
+def _bump_permissions():
+    """После фиксации сбрасывает закешированные права всех пользователей (users.backends)."""
+    transaction.on_commit(lambda: bump_model_version(PERMISSIONS_VERSION_LABEL))
+
+
+@receiver(m2m_changed, sender=User.groups.through)
+@receiver(m2m_changed, sender=User.user_permissions.through)
+@receiver(m2m_changed, sender=Group.permissions.through)
+def permissions_changed(sender, action, **kwargs):
+    """Группы пользователя, его права или права группы изменились."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        _bump_permissions()
+
+
+@receiver(post_save, sender=Group)
+@receiver(post_delete, sender=Group)
+@receiver(post_save, sender=Permission)
+@receiver(post_delete, sender=Permission)
+def group_or_permission_changed(sender, raw=False, **kwargs):
+    """Группа или право созданы, изменены или удалены."""
+    if not raw:
+        _bump_permissions()
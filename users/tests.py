@@ -1,3 +1,187 @@
-from django.test import TestCase
+import os
+import tempfile
+from datetime import timedelta
+from functools import partial
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import Group, Permission
+from django.core import mail
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from config.db import create_database, get_databases
+from dogs.caching import forget_object_versions
+from dogs.models import Category, Dog, MediaFile
+from dogs.testing import QueryCountTestMixin
+from users.models import EmailStatus, OutgoingEmail, User
+from users.services import _claim_outbox_batch, deliver_outbox, queue_email
+
+
+class UserListQueryCountTest(QueryCountTestMixin, TestCase):
+    """Список заводчиков выполняет одинаковое число запросов при любом количестве пользователей."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create(email='user@test.ru')
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def add_breeders(self, count, avatar=False):
+        start = User.objects.count()
+        User.objects.bulk_create(User(email=f'breeder{start + i}@test.ru',
+                                      avatar=f'users/{start + i}.jpg' if avatar else None) for i in range(count))
+        if avatar:  # Копии созданы у каждого второго аватара
+            MediaFile.objects.bulk_create(MediaFile(name=f'users/{start + i}.jpg', has_variants=i % 2 == 0)
+                                          for i in range(count))
+
+    def test_users_list(self):
+        self.assertConstantQueries(reverse('users:users_list'), self.add_breeders)
+
+    def test_users_list_with_avatars(self):
+        self.assertConstantQueries(reverse('users:users_list'), partial(self.add_breeders, avatar=True))
+
+
+class CachedAuthTest(TestCase):
+    """Сессия, пользователь и его права берутся из кеша и сбрасываются при их изменении."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(email='breeder@test.ru')
+        self.client.force_login(self.user)
+        category = Category.objects.create(name='Лайка', description='-')
+        self.url = reverse('dogs:delete_dog', args=[Dog.objects.create(name='Шарик', category=category).pk])
+        self.group = Group.objects.create(name='Модераторы')
+        self.group.permissions.add(Permission.objects.get(codename='delete_dog'))
+
+    def auth_queries(self):
+        with CaptureQueriesContext(connection) as queries:
+            status = self.client.get(self.url).status_code
+        tables = ('django_session', 'users_user', 'auth_')
+        return status, [query['sql'] for query in queries.captured_queries if any(t in query['sql'] for t in tables)]
+
+    def test_steady_state_makes_no_auth_queries(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(self.group)
+        self.assertEqual(self.auth_queries()[0], 200)  # Первый запрос загружает пользователя и права
+        self.assertEqual(self.auth_queries(), (200, []))
+
+    def test_permission_and_user_changes_invalidate_cache(self):
+        self.assertEqual(self.auth_queries()[0], 403)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.groups.add(self.group)
+        self.assertEqual(self.auth_queries()[0], 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            self.group.permissions.clear()
+        self.assertEqual(self.auth_queries()[0], 403)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.get(reverse('users:user_generate_new_password'))
+        self.assertEqual(self.auth_queries()[0], 302)  # Хеш пароля в сессии устарел - вход заново
+
+    def test_queryset_update_needs_forget_object_versions(self):
+        self.assertEqual(self.auth_queries()[0], 403)
+        User.objects.filter(pk=self.user.pk).update(password=make_password('new password'))
+        self.assertEqual(self.auth_queries()[0], 403)  # Сигналов нет - в кеше пользователь со старым паролем
+        forget_object_versions(User, [self.user.pk])
+        self.assertEqual(self.auth_queries()[0], 302)
+
+    def test_sessions_of_model_backend_survive(self):
+        self.client.force_login(self.user, backend='django.contrib.auth.backends.ModelBackend')
+        self.assertEqual(self.auth_queries()[0], 403)  # Пользователь остался в системе, прав нет
+
+
+class OutboxTest(TestCase):
+    """Письма ставятся в очередь в транзакции и отправляются вне ее с повторами и арендой."""
+
+    def setUp(self):
+        self.user = User.objects.create(email='breeder@test.ru')
+
+    def queue(self):
+        return queue_email('Тема', 'Текст', [self.user.email])
+
+    def test_queued_with_transaction(self):
+        with self.assertRaises(ValueError), transaction.atomic():
+            self.queue()
+            raise ValueError  # Откат транзакции отменяет и письмо
+        self.assertFalse(OutgoingEmail.objects.exists())
+
+    def test_password_sent_outside_transaction_and_forgotten(self):
+        self.client.force_login(self.user)
+        self.client.get(reverse('users:user_generate_new_password'))
+        email = OutgoingEmail.objects.get()
+        self.assertTrue(email.is_sensitive)
+
+        blocks = len(connection.atomic_blocks)
+        send = mock.Mock(side_effect=lambda messages: self.assertEqual(len(connection.atomic_blocks), blocks))
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.send_messages', send):
+            self.assertEqual(deliver_outbox(), (1, 0))  # Во время отправки строки не заблокированы
+        self.assertIn('Ваш новый пароль', send.call_args.args[0][0].body)
+
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.message), (EmailStatus.SENT, ''))
+
+    def test_locmem_backend(self):
+        self.queue()
+        self.assertEqual(deliver_outbox(), (1, 0))
+        self.assertEqual([(m.subject, m.to) for m in mail.outbox], [('Тема', [self.user.email])])
+        self.assertEqual(deliver_outbox(), (0, 0))
+
+    @override_settings(EMAIL_OUTBOX_RETRY_DELAY=60)
+    def test_retry_backoff_and_max_attempts(self):
+        email = self.queue()
+        with mock.patch('django.core.mail.backends.locmem.EmailBackend.open', side_effect=OSError('SMTP')):
+            for attempt in (1, 2):
+                started = timezone.now()
+                self.assertEqual(deliver_outbox(max_attempts=3), (0, 1))
+                email.refresh_from_db()
+                self.assertEqual((email.status, email.attempts), (EmailStatus.PENDING, attempt))
+                self.assertGreaterEqual(email.next_attempt_at, started + timedelta(seconds=60 * 2 ** (attempt - 1)))
+                self.assertEqual(deliver_outbox(max_attempts=3), (0, 0))  # Повтор еще не наступил
+                OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+
+            self.assertEqual(deliver_outbox(max_attempts=3), (0, 1))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (EmailStatus.FAILED, 3))
+        self.assertIn('SMTP', email.last_error)
+
+    def test_lease(self):
+        email = self.queue()
+        claimed = _claim_outbox_batch(10, 3)  # Обработчик забрал письмо и упал
+        self.assertEqual([e.status for e in claimed], [EmailStatus.SENDING])
+        self.assertEqual(deliver_outbox(), (0, 0))  # Аренда еще не истекла
+
+        OutgoingEmail.objects.update(next_attempt_at=timezone.now())
+        self.assertEqual(deliver_outbox(), (1, 0))
+        email.refresh_from_db()
+        self.assertEqual((email.status, email.attempts), (EmailStatus.SENT, 2))
+
+
+class DatabaseProfileTest(TestCase):
+    """Профиль базы выбирается переменной DB_PROFILE, ccdb создает базу профиля."""
+
+    def test_profiles(self):
+        with mock.patch.dict(os.environ, {'DB_PROFILE': 'mssql', 'DB_CONN_MAX_AGE': ''}):
+            database = get_databases('/app')['default']
+        self.assertEqual(database['ENGINE'], 'mssql')
+        self.assertEqual(database['CONN_MAX_AGE'], 300)
+        self.assertTrue(database['CONN_HEALTH_CHECKS'])
+
+        with mock.patch.dict(os.environ, {'DB_PROFILE': 'local', 'DB_SQLITE_PATH': ''}):
+            database = get_databases('/app')['default']
+        self.assertEqual((database['ENGINE'], database['NAME']), ('django.db.backends.sqlite3', '/app/db.sqlite3'))
+
+        with mock.patch.dict(os.environ, {'DB_PROFILE': 'oracle'}), self.assertRaises(ValueError):
+            get_databases('/app')
+
+    def test_create_sqlite_database(self):
+        with tempfile.TemporaryDirectory() as directory:
+            database = {'ENGINE': 'django.db.backends.sqlite3', 'NAME': os.path.join(directory, 'new', 'db.sqlite3')}
+            self.assertTrue(create_database(database))
+            self.assertTrue(os.path.exists(database['NAME']))
+            self.assertFalse(create_database(database))  # Повторный запуск не пересоздает базу
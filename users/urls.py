@@ -1,12 +1,17 @@
+from django.conf import settings
 from django.urls import path
 
 from users.apps import UsersConfig
 from users.views import user_generate_new_password, UserRegisterView, UserLoginView, UserProfileView, \
-    UserUpdateView, UserPasswordChangeView, UserLogoutView, UserListView, UserViewProfileView
+    UserUpdateView, UserPasswordChangeView, UserLogoutView, UserListView, UserViewProfileView, UserSearchListView, \
+    user_view_profile_async
 
 # Устанавливаем имя пространства имен для маршрутов приложения 'users'
 app_name = UsersConfig.name
 
+# Профиль пользователя: асинхронное представление под ASGI (settings.ASYNC_VIEWS), синхронное под WSGI
+profile_view = user_view_profile_async if settings.ASYNC_VIEWS else UserViewProfileView.as_view()
+
 urlpatterns = [
     # Работа с аккаунтом
     path('', UserLoginView.as_view(), name='login_user'),  # Страница входа пользователя
@@ -21,6 +26,7 @@ urlpatterns = [
 
     # Просмотр других пользователей
     path('all_users/', UserListView.as_view(), name='users_list'),  # Список всех пользователей
-    path('profile/<int:pk>/', UserViewProfileView.as_view(), name="profile_user_view"),
+    path('search/', UserSearchListView.as_view(), name='search_users'),  # Поиск заводчиков по имени
+    path('profile/<int:pk>/', profile_view, name="profile_user_view"),
     # Просмотр профиля другого пользователя по ID
 ]
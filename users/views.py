@@ -4,13 +4,19 @@ import string
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.auth.views import LoginView, PasswordChangeView, LogoutView
 from django.views.generic import CreateView, UpdateView, ListView, DetailView
+from django.http import Http404
 from django.shortcuts import reverse, redirect
+from django.template.response import TemplateResponse
 from django.contrib.auth.decorators import login_required
 from django.urls import reverse_lazy
+from django.db import transaction
 
 from users.models import User
 from users.forms import UserRegisterForm, UserLoginForm, UserUpdateForm, UserPasswordChangeForm, UserForm
 from users.services import send_register_email, send_new_password
+from dogs.utils import QueryBudgetMixin
+from dogs.pagination import KeysetPaginationMixin
+from search.services import search_queryset
 
 
 class UserRegisterView(CreateView):
@@ -41,8 +47,9 @@ class UserRegisterView(CreateView):
         Returns:
             HttpResponseRedirect: Перенаправление на страницу входа после успешной регистрации.
         """
-        self.object = form.save()  # Сохранение нового пользователя
-        send_register_email(self.object.email)  # Отправка письма с подтверждением регистрации
+        with transaction.atomic():
+            self.object = form.save()  # Сохранение нового пользователя
+            send_register_email(self.object.email)  # Письмо в очередь в той же транзакции
         return super().form_valid(form)  # Перенаправление на success_url
 
 
@@ -144,7 +151,7 @@ class UserLogoutView(LogoutView):
     template_name = 'user/logout_user.html'  # Шаблон для страницы выхода
 
 
-class UserListView(LoginRequiredMixin, ListView):
+class UserListView(QueryBudgetMixin, LoginRequiredMixin, KeysetPaginationMixin, ListView):
     """
     Представление для отображения списка всех активных пользователей.
 
@@ -164,6 +171,7 @@ class UserListView(LoginRequiredMixin, ListView):
         'title': 'Питомник все наши заводчики'  # Заголовок страницы
     }
     template_name = 'user/users.html'
+    query_budget = 5
 
     def get_queryset(self):
         """Получает список активных пользователей."""
@@ -172,6 +180,34 @@ class UserListView(LoginRequiredMixin, ListView):
         return queryset
 
 
+class UserSearchListView(QueryBudgetMixin, LoginRequiredMixin, ListView):
+    """
+    Представление для поиска заводчиков по имени и фамилии.
+
+    Ограничивает доступ только для авторизованных пользователей.
+
+    Атрибуты:
+         model: Модель пользователя (User).
+         extra_context: Дополнительный контекст с заголовком страницы.
+         template_name: Шаблон для отображения списка пользователей.
+
+     Returns:
+         list: Список активных пользователей, соответствующих запросу, в порядке релевантности.
+     """
+
+    model = User
+    extra_context = {
+        'title': 'Результаты поискового запроса'  # Заголовок страницы
+    }
+    template_name = 'user/users.html'
+    query_budget = 7
+
+    def get_queryset(self):
+        """Получает список активных пользователей из поискового индекса."""
+        query = self.request.GET.get('q', '')
+        return search_queryset(query, User.objects.filter(is_active=True))
+
+
 class UserViewProfileView(DetailView):
     """
     Представление для просмотра профиля другого пользователя.
@@ -202,7 +238,29 @@ def user_generate_new_password(request):
 
     new_password = ''.join(
         random.sample((string.ascii_letters + string.digits), 12))  # Генерация нового пароля длиной 12 символов
-    request.user.set_password(new_password)  # Установка нового пароля пользователю
-    request.user.save()  # Сохранение изменений в базе данных
-    send_new_password(request.user.email, new_password)  # Отправка нового пароля на электронную почту пользователя
+    with transaction.atomic():
+        request.user.set_password(new_password)  # Установка нового пароля пользователю
+        request.user.save()  # Сохранение изменений в базе данных
+        send_new_password(request.user.email, new_password)  # Письмо с новым паролем в очередь в той же транзакции
     return redirect(reverse('dogs:index'))  # Перенаправление на главную страницу питомника
+
+
+async def user_view_profile_async(request, pk):
+    """
+    Асинхронный вариант UserViewProfileView (settings.ASYNC_VIEWS, запуск через ASGI).
+
+    Args:
+        request: HTTP запрос.
+        pk (int): ID пользователя.
+
+    Returns:
+        TemplateResponse: Страница профиля пользователя.
+
+    Raises:
+        Http404: Пользователь не найден.
+    """
+    try:
+        profile = await User.objects.aget(pk=pk)
+    except User.DoesNotExist:
+        raise Http404('Пользователь не найден')
+    return TemplateResponse(request, 'user/user_view_profile.html', {'object': profile})